@@ -81,10 +81,12 @@ resource "aws_dynamodb_table" "eventhub_checkpoints" {
 //=============================================================================
 
 resource "aws_dynamodb_table" "meetings" {
-  name         = "${var.meetings_table_name}-${var.resource_suffix}"
-  billing_mode = "PAY_PER_REQUEST"
-  hash_key     = "meeting_id"
-  range_key    = "created_at"
+  name             = "${var.meetings_table_name}-${var.resource_suffix}"
+  billing_mode     = "PAY_PER_REQUEST"
+  hash_key         = "meeting_id"
+  range_key        = "created_at"
+  stream_enabled   = true
+  stream_view_type = "NEW_AND_OLD_IMAGES"
 
   attribute {
     name = "meeting_id"
@@ -124,6 +126,15 @@ resource "aws_dynamodb_table" "meetings" {
     projection_type = "KEYS_ONLY"
   }
 
+  // Meetings by status (e.g. notification_received backlog for enrichment)
+  // without scanning the table; keys only, callers need meeting_id
+  global_secondary_index {
+    name            = "status-index"
+    hash_key        = "status"
+    range_key       = "created_at"
+    projection_type = "KEYS_ONLY"
+  }
+
   point_in_time_recovery {
     enabled = true
   }
@@ -131,6 +142,38 @@ resource "aws_dynamodb_table" "meetings" {
   tags = var.tags
 }
 
+//=============================================================================
+// DYNAMODB TABLE - Meeting counters (materialized from the meetings stream)
+//=============================================================================
+// Counts by status / changeType / organizer and createdAt/updatedAt bounds,
+// kept current by scripts/status_counters.py from the meetings table stream.
+// kind = "status" | "changeType" | "organizer" | "bounds" | "checkpoint" |
+// "record" (per stream record idempotency markers, expired via TTL)
+
+resource "aws_dynamodb_table" "meeting_counters" {
+  name         = "${var.meeting_counters_table_name}-${var.resource_suffix}"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "kind"
+  range_key    = "name"
+
+  attribute {
+    name = "kind"
+    type = "S"
+  }
+
+  attribute {
+    name = "name"
+    type = "S"
+  }
+
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+
+  tags = var.tags
+}
+
 //=============================================================================
 // DYNAMODB TABLE - Transcripts (admin app)
 //=============================================================================
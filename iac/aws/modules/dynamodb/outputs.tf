@@ -33,6 +33,21 @@ output "meetings_table_arn" {
   value       = aws_dynamodb_table.meetings.arn
 }
 
+output "meetings_table_stream_arn" {
+  description = "Stream ARN of the meetings DynamoDB table"
+  value       = aws_dynamodb_table.meetings.stream_arn
+}
+
+output "meeting_counters_table_name" {
+  description = "Name of the meeting counters DynamoDB table"
+  value       = aws_dynamodb_table.meeting_counters.name
+}
+
+output "meeting_counters_table_arn" {
+  description = "ARN of the meeting counters DynamoDB table"
+  value       = aws_dynamodb_table.meeting_counters.arn
+}
+
 output "transcripts_table_name" {
   description = "Name of the transcripts DynamoDB table"
   value       = aws_dynamodb_table.transcripts.name
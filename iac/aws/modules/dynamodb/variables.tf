@@ -22,6 +22,12 @@ variable "meetings_table_name" {
   default     = "tmf-meetings"
 }
 
+variable "meeting_counters_table_name" {
+  description = "Name of the DynamoDB table for materialized meeting counters"
+  type        = string
+  default     = "tmf-meeting-counters"
+}
+
 variable "transcripts_table_name" {
   description = "Name of the DynamoDB table for transcripts"
   type        = string
@@ -2,11 +2,22 @@
 """
 Batch fetch meeting details for all notification_received meetings.
 
-Scans DynamoDB for meetings with status='notification_received', then calls the
-admin app's batch-fetch-details endpoint in batches to enrich them with Graph API data.
+Finds meetings with status='notification_received', then calls the admin app's
+batch-fetch-details endpoint in batches to enrich them with Graph API data.
+
+Meetings are read from the status-index GSI (keys only) when it is ACTIVE,
+otherwise with a parallel segmented scan; status counts are concurrent
+Select=COUNT queries on the index (or one projected scan without it).
+
+With --direct-graph the admin app is not involved: meeting_enrichment fetches
+the events itself with Graph $batch (20 per call, $select) and writes the
+enriched records back with DynamoDB batch writes, so backfills run at Graph's
+limit rather than the admin app's capacity. Needs the Graph app credentials
+(.env.local.azure) and DynamoDB write access.
 
 Usage:
-    python scripts/batch-fetch-meeting-details.py [--batch-size 50] [--dry-run]
+    python scripts/batch-fetch-meeting-details.py [--batch-size 50] [--dry-run] [--scan] [--segments 8]
+    python scripts/batch-fetch-meeting-details.py --direct-graph --batch-size 100 --workers 8
 """
 
 import argparse
@@ -14,10 +25,18 @@ import json
 import subprocess
 import sys
 import time
+from collections import Counter
 from datetime import datetime, timezone
 
+import boto3
 import requests
 import urllib3
+from botocore.exceptions import BotoCoreError, ClientError
+
+from batch_dispatcher import AdaptiveBatchSize, BatchDispatcher
+from dynamo_scan import (
+    DEFAULT_SEGMENTS, attr, index_active, iter_query, parallel_scan, parallel_scan_pages, query_counts,
+)
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -25,6 +44,10 @@ DYNAMODB_TABLE = "tmf-meetings-8akfpg"
 SECRETS_ID = "tmf/admin-app-8akfpg"
 ECS_CLUSTER = "tmf-admin-app-8akfpg"
 ECS_SERVICE = "tmf-admin-app-8akfpg"
+STATUS_INDEX = "status-index"
+REQUEST_TIMEOUT = 120  # seconds per batch request; slow batches shrink the batch size instead
+TARGET_STATUS = "notification_received"
+COUNT_STATUSES = ["notification_received", "scheduled", "cancelled"]
 
 
 def get_admin_app_url():
@@ -80,48 +103,57 @@ def get_api_key():
     return api_key
 
 
-def scan_notification_received_meetings():
-    """Scan DynamoDB for all meetings with status='notification_received'."""
-    meeting_ids = []
-    last_evaluated_key = None
-    page = 0
-
-    while True:
-        page += 1
-        cmd = [
-            "aws", "dynamodb", "scan",
-            "--table-name", DYNAMODB_TABLE,
-            "--filter-expression", "#s = :s",
-            "--expression-attribute-names", json.dumps({"#s": "status"}),
-            "--expression-attribute-values", json.dumps({":s": {"S": "notification_received"}}),
-            "--projection-expression", "meeting_id",
-        ]
-        if last_evaluated_key:
-            cmd.extend(["--exclusive-start-key", json.dumps(last_evaluated_key)])
-
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode != 0:
-            print(f"ERROR: DynamoDB scan failed: {result.stderr}")
-            sys.exit(1)
-
-        data = json.loads(result.stdout)
-        items = data.get("Items", [])
-        for item in items:
-            mid = item["meeting_id"]["S"]
-            if mid not in meeting_ids:
-                meeting_ids.append(mid)
-
-        print(f"  Scan page {page}: {len(items)} items (total so far: {len(meeting_ids)})")
-
-        last_evaluated_key = data.get("LastEvaluatedKey")
-        if not last_evaluated_key:
-            break
-
-    return meeting_ids
-
-
-def fetch_batch(session, admin_url, api_key, meeting_ids, batch_num, total_batches):
-    """Call the batch-fetch-details endpoint for a batch of meeting IDs."""
+def use_status_index(client, force_scan=False):
+    """Whether the status GSI can serve this run (exists and has finished backfilling)."""
+    if force_scan:
+        return False
+    try:
+        return index_active(client, DYNAMODB_TABLE, STATUS_INDEX)
+    except (BotoCoreError, ClientError) as e:
+        print(f"  WARNING: could not describe {DYNAMODB_TABLE} ({e}); falling back to a scan")
+        return False
+
+
+def iter_status_pages(client, status, use_index, segments=DEFAULT_SEGMENTS):
+    """Yield lists of (meeting_id, created_at) keys for meetings with the given status, page by page."""
+    projection = ["meeting_id", "created_at"]
+    if use_index:
+        pages = iter_query(client, DYNAMODB_TABLE, STATUS_INDEX, "status", status, projection=projection)
+    else:
+        pages = parallel_scan_pages(
+            client, DYNAMODB_TABLE, segments=segments, projection=projection,
+            filter_expression="#s = :s", names={"#s": "status"}, values={":s": {"S": status}},
+        )
+    for items in pages:
+        yield [(item["meeting_id"]["S"], attr(item, "created_at")) for item in items]
+
+
+def iter_new_meeting_ids(client, use_index, segments=DEFAULT_SEGMENTS, keys=None):
+    """
+    Yield pages of notification_received meeting IDs not seen before (set-based
+    dedupe). keys, if given, collects meeting_id -> created_at for later key lookups.
+    """
+    seen = set()
+    for page, page_keys in enumerate(iter_status_pages(client, TARGET_STATUS, use_index, segments), 1):
+        new = []
+        for mid, created_at in page_keys:
+            if mid not in seen:
+                seen.add(mid)
+                new.append(mid)
+                if keys is not None:
+                    keys[mid] = created_at
+        if page % 10 == 0:
+            print(f"  Page {page}: total so far {len(seen)}")
+        yield new
+
+
+def scan_notification_received_meetings(client, use_index, segments=DEFAULT_SEGMENTS):
+    """Collect all meeting IDs with status='notification_received' (deduplicated, first-seen order)."""
+    return [mid for ids in iter_new_meeting_ids(client, use_index, segments) for mid in ids]
+
+
+def fetch_batch(session, admin_url, api_key, meeting_ids, timeout=REQUEST_TIMEOUT):
+    """Call the batch-fetch-details endpoint for a batch of meeting IDs. Returns (success count, failures)."""
     url = f"{admin_url}/api/meetings/batch-fetch-details"
     headers = {
         "X-API-Key": api_key,
@@ -130,88 +162,132 @@ def fetch_batch(session, admin_url, api_key, meeting_ids, batch_num, total_batch
     payload = {"meetingIds": meeting_ids}
 
     try:
-        resp = session.post(url, json=payload, headers=headers, verify=False, timeout=600)
+        resp = session.post(url, json=payload, headers=headers, verify=False, timeout=timeout)
         resp.raise_for_status()
         result = resp.json()
-        success_count = len(result.get("success", []))
-        failed_items = result.get("failed", [])
-        failed_count = len(failed_items)
-        return success_count, failed_count, failed_items
+        return len(result.get("success", [])), result.get("failed", [])
     except requests.exceptions.Timeout:
-        print(f"  TIMEOUT on batch {batch_num}/{total_batches} ({len(meeting_ids)} meetings)")
-        return 0, len(meeting_ids), [{"id": mid, "error": "timeout"} for mid in meeting_ids]
+        print(f"  TIMEOUT on batch of {len(meeting_ids)} meetings")
+        return 0, [{"id": mid, "error": "timeout", "retry": True} for mid in meeting_ids]
     except requests.exceptions.RequestException as e:
-        print(f"  ERROR on batch {batch_num}/{total_batches}: {e}")
-        return 0, len(meeting_ids), [{"id": mid, "error": str(e)} for mid in meeting_ids]
-
-
-def get_status_counts():
+        print(f"  ERROR on batch of {len(meeting_ids)} meetings: {e}")
+        # Connection errors, throttling and 5xx are worth another try; other HTTP errors are not
+        status = e.response.status_code if e.response is not None else None
+        retry = status is None or status == 429 or status >= 500
+        return 0, [{"id": mid, "error": str(e), "retry": retry} for mid in meeting_ids]
+
+
+def dispatch_meetings(pages, send, args):
+    """
+    Stream meeting ID pages into concurrent workers that post adaptive batches
+    while the scan is still running. Returns (dispatcher totals, failures, meetings queued).
+    """
+    sizer = AdaptiveBatchSize(initial=args.batch_size, minimum=args.min_batch, maximum=args.max_batch,
+                              target_seconds=args.target_latency)
+
+    def report(batch):
+        retrying = f", {batch['retrying']} to retry" if batch['retrying'] else ""
+        print(f"  Batch {batch['batch']}: {batch['success']}/{batch['size']} success, {batch['failed']} failed{retrying} "
+              f"({batch['seconds']:.1f}s) → next size {batch['next_size']}, {batch['queued']} queued")
+
+    dispatcher = BatchDispatcher(send, workers=args.workers, sizer=sizer, retries=args.retries,
+                                 on_batch=report).start()
+    queued = 0
+    scan_start = time.time()
+    for ids in pages:
+        dispatcher.add(ids)
+        queued += len(ids)
+    print(f"  Scan complete: {queued} meetings queued in {time.time() - scan_start:.1f}s; "
+          f"{dispatcher.totals['batches']} batch(es) already done")
+    totals = dispatcher.finish()
+    return totals, dispatcher.failures, queued
+
+
+def get_status_counts(client, use_index, segments=DEFAULT_SEGMENTS):
     """Get counts of meetings by status from DynamoDB."""
-    counts = {}
-    for status in ["notification_received", "scheduled", "cancelled"]:
-        cmd = [
-            "aws", "dynamodb", "scan",
-            "--table-name", DYNAMODB_TABLE,
-            "--filter-expression", "#s = :s",
-            "--expression-attribute-names", json.dumps({"#s": "status"}),
-            "--expression-attribute-values", json.dumps({":s": {"S": status}}),
-            "--select", "COUNT",
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode == 0:
-            data = json.loads(result.stdout)
-            counts[status] = data.get("Count", 0)
-        else:
-            counts[status] = "error"
-    return counts
+    try:
+        if use_index:
+            # One Select=COUNT query per status against the index, concurrently
+            return query_counts(client, DYNAMODB_TABLE, STATUS_INDEX, "status", COUNT_STATUSES)
+        # No index: one parallel scan projecting only status counts every status at once
+        counter = Counter(
+            attr(item, "status")
+            for item in parallel_scan(client, DYNAMODB_TABLE, segments=segments, projection=["status"])
+        )
+        return {status: counter.get(status, 0) for status in COUNT_STATUSES}
+    except (BotoCoreError, ClientError) as e:
+        print(f"  ERROR: status count failed: {e}")
+        return {status: "error" for status in COUNT_STATUSES}
 
 
 def main():
     parser = argparse.ArgumentParser(description="Batch fetch meeting details")
-    parser.add_argument("--batch-size", type=int, default=50, help="Meetings per batch (default: 50)")
+    parser.add_argument("--batch-size", type=int, default=50, help="Initial meetings per batch (default: 50)")
+    parser.add_argument("--min-batch", type=int, default=5, help="Smallest adaptive batch (default: 5)")
+    parser.add_argument("--max-batch", type=int, default=200, help="Largest adaptive batch (default: 200)")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent batch requests (default: 4)")
+    parser.add_argument("--target-latency", type=float, default=30.0,
+                        help="Batch latency (s) above which the batch size is halved (default: 30)")
+    parser.add_argument("--retries", type=int, default=2,
+                        help="Re-sends per meeting after a timeout, throttling or server error (default: 2)")
+    parser.add_argument("--timeout", type=float, default=REQUEST_TIMEOUT,
+                        help=f"Per-batch request timeout in seconds (default: {REQUEST_TIMEOUT})")
     parser.add_argument("--url", type=str, default=None, help="Admin app URL (auto-detected from ECS if omitted)")
     parser.add_argument("--dry-run", action="store_true", help="Scan only, don't fetch")
+    parser.add_argument("--segments", type=int, default=DEFAULT_SEGMENTS,
+                        help=f"Parallel scan segments when the status index is unavailable (default: {DEFAULT_SEGMENTS})")
+    parser.add_argument("--scan", action="store_true", help="Ignore the status index and use a parallel scan")
+    parser.add_argument("--direct-graph", action="store_true",
+                        help="Enrich directly via Graph $batch and DynamoDB batch writes instead of the admin app")
     args = parser.parse_args()
 
     start_time = time.time()
     print(f"=== Batch Fetch Meeting Details ===")
     print(f"Started: {datetime.now(timezone.utc).isoformat()}")
-    print(f"Batch size: {args.batch_size}")
+    print(f"Batch size: {args.batch_size} (adaptive {args.min_batch}-{args.max_batch}), workers: {args.workers}")
+    print(f"Mode: {'direct Graph $batch + DynamoDB batch writes' if args.direct_graph else 'admin app endpoint'}")
     print()
 
-    # Step 0: Resolve admin app URL
-    if args.url:
-        admin_url = args.url.rstrip("/")
+    if args.direct_graph:
+        print("[0-1/4] Direct Graph mode: no admin app URL or API key needed")
+        print()
     else:
-        print("[0/4] Auto-detecting admin app URL from ECS...")
-        admin_url = get_admin_app_url()
-    print(f"  Admin app: {admin_url}")
-    print()
-
-    # Step 1: Get API key
-    print("[1/4] Retrieving API key from Secrets Manager...")
-    api_key = get_api_key()
-    print(f"  API key retrieved (length={len(api_key)})")
-    print()
+        # Step 0: Resolve admin app URL
+        if args.url:
+            admin_url = args.url.rstrip("/")
+        else:
+            print("[0/4] Auto-detecting admin app URL from ECS...")
+            admin_url = get_admin_app_url()
+        print(f"  Admin app: {admin_url}")
+        print()
+
+        # Step 1: Get API key
+        print("[1/4] Retrieving API key from Secrets Manager...")
+        api_key = get_api_key()
+        print(f"  API key retrieved (length={len(api_key)})")
+        print()
+
+    dynamodb = boto3.client("dynamodb")
+    use_index = use_status_index(dynamodb, args.scan)
+    segments = max(1, args.segments)
+    source = f"{STATUS_INDEX} query" if use_index else f"parallel scan ({segments} segments)"
 
     # Step 2: Pre-flight check
-    print("[2/4] Status counts BEFORE fetch:")
-    before_counts = get_status_counts()
+    print(f"[2/4] Status counts BEFORE fetch ({source}):")
+    phase_start = time.time()
+    before_counts = get_status_counts(dynamodb, use_index, segments)
     for status, count in before_counts.items():
         print(f"  {status}: {count}")
+    print(f"  ({time.time() - phase_start:.1f}s)")
     print()
 
-    # Step 3: Scan for notification_received meetings
-    print("[3/4] Scanning DynamoDB for notification_received meetings...")
-    meeting_ids = scan_notification_received_meetings()
-    print(f"  Found {len(meeting_ids)} meetings to fetch")
-    print()
-
-    if not meeting_ids:
-        print("No meetings to fetch. Done.")
-        return
-
     if args.dry_run:
+        # Step 3: Find notification_received meetings
+        print(f"[3/4] Reading notification_received meetings ({source})...")
+        phase_start = time.time()
+        meeting_ids = scan_notification_received_meetings(dynamodb, use_index, segments)
+        print(f"  Found {len(meeting_ids)} meetings to fetch ({time.time() - phase_start:.1f}s)")
+        print()
         print("DRY RUN - skipping fetch. Would process these meeting IDs:")
         for mid in meeting_ids[:10]:
             print(f"  {mid}")
@@ -219,37 +295,44 @@ def main():
             print(f"  ... and {len(meeting_ids) - 10} more")
         return
 
-    # Step 4: Batch fetch
-    print(f"[4/4] Fetching details in batches of {args.batch_size}...")
-    total_success = 0
-    total_failed = 0
-    all_failures = []
-    session = requests.Session()
+    # Steps 3+4: stream meeting IDs into concurrent, adaptive batch requests
+    print(f"[3/4] Reading notification_received meetings ({source})...")
+    print(f"[4/4] Fetching details with {args.workers} workers while reading...")
+    keys = {}
+    if args.direct_graph:
+        from meeting_enrichment import DirectEnricher
+        from auth_helper import get_graph_session
 
-    batches = [meeting_ids[i:i + args.batch_size] for i in range(0, len(meeting_ids), args.batch_size)]
-    total_batches = len(batches)
+        enricher = DirectEnricher(DYNAMODB_TABLE, get_graph_session(pool_size=args.workers), keys)
+        send = enricher.enrich
+    else:
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=args.workers)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
 
-    for i, batch in enumerate(batches, 1):
-        batch_start = time.time()
-        success, failed, failures = fetch_batch(session, admin_url, api_key, batch, i, total_batches)
-        batch_elapsed = time.time() - batch_start
-        total_success += success
-        total_failed += failed
-        all_failures.extend(failures)
+        def send(batch):
+            return fetch_batch(session, admin_url, api_key, batch, timeout=args.timeout)
 
-        print(f"  Batch {i}/{total_batches}: {success} success, {failed} failed ({batch_elapsed:.1f}s)")
+    pages = iter_new_meeting_ids(dynamodb, use_index, segments, keys=keys)
+    try:
+        totals, all_failures, queued = dispatch_meetings(pages, send, args)
+    except (BotoCoreError, ClientError) as e:
+        print(f"ERROR: DynamoDB read failed: {e}")
+        sys.exit(1)
 
-        # Brief pause between batches to avoid overwhelming the server
-        if i < total_batches:
-            time.sleep(1)
+    if not queued:
+        print("No meetings to fetch. Done.")
+        return
 
     elapsed = time.time() - start_time
     print()
     print(f"=== Results ===")
-    print(f"Total: {total_success} success, {total_failed} failed out of {len(meeting_ids)}")
-    print(f"Duration: {elapsed:.1f}s ({elapsed/60:.1f}m)")
-    if total_success > 0:
-        print(f"Average: {elapsed/total_success:.2f}s per meeting")
+    print(f"Total: {totals['success']} success, {totals['failed']} failed out of {queued}")
+    print(f"Duration: {elapsed:.1f}s ({elapsed/60:.1f}m), {totals['batches']} batches, "
+          f"{totals['retried']} retries, final batch size {totals['final_size']}")
+    if totals['success'] > 0:
+        print(f"Throughput: {totals['success'] / elapsed:.1f} meetings/s")
 
     if all_failures:
         print(f"\nFailed meetings ({len(all_failures)}):")
@@ -260,7 +343,7 @@ def main():
 
     # Step 5: Verify
     print(f"\nStatus counts AFTER fetch:")
-    after_counts = get_status_counts()
+    after_counts = get_status_counts(dynamodb, use_index, segments)
     for status, count in after_counts.items():
         print(f"  {status}: {count}")
 
@@ -0,0 +1,162 @@
+"""
+Pipelined, adaptive batch dispatcher.
+
+Producers add IDs to a queue as they are discovered (e.g. scan pages) and
+several worker threads take batches from it and send them concurrently,
+so dispatch starts with the first page instead of after the whole scan.
+
+The batch size follows AIMD (additive increase, multiplicative decrease):
+each full batch that finishes under the target latency with an acceptable
+error rate grows the size by ``step``; a slow or failing batch halves it.
+Only one decrease is applied per "generation" of in-flight batches, so a
+burst of concurrent failures from the same overload halves the size once
+rather than once per worker.
+
+    dispatcher = BatchDispatcher(send, workers=4, sizer=AdaptiveBatchSize(50, 5, 200))
+    dispatcher.start()
+    for page in pages:
+        dispatcher.add(page)
+    totals = dispatcher.finish()
+
+``send(batch)`` returns (succeeded, failures) where failures is a list of
+{"id", "error"} dicts; an exception fails the whole batch. Failures marked
+``"retry": True`` (timeouts, throttling, server overload) are sent again in
+a later batch, up to ``retries`` times per ID, ahead of new input.
+"""
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+_END = object()
+
+
+class AdaptiveBatchSize:
+    """Batch size controlled by observed latency and error rate (AIMD)."""
+
+    def __init__(self, initial: int = 50, minimum: int = 5, maximum: int = 200,
+                 target_seconds: float = 30.0, max_error_rate: float = 0.1, step: Optional[int] = None):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.size = min(max(initial, self.minimum), self.maximum)
+        self.target_seconds = target_seconds
+        self.max_error_rate = max_error_rate
+        self.step = step or max(1, self.size // 10)
+        self.generation = 0
+        self._lock = threading.Lock()
+
+    def take(self) -> Tuple[int, int]:
+        """(current size, generation) for a batch about to be dispatched."""
+        with self._lock:
+            return self.size, self.generation
+
+    def record(self, size: int, generation: int, seconds: float, failed: int) -> int:
+        """Feed back one finished batch; returns the new size."""
+        with self._lock:
+            error_rate = failed / size if size else 0.0
+            if seconds > self.target_seconds or error_rate > self.max_error_rate:
+                if generation == self.generation:
+                    self.size = max(self.minimum, self.size // 2)
+                    self.generation += 1
+            elif size >= self.size:
+                # Grow only on full batches; partial ones say little about capacity
+                self.size = min(self.maximum, self.size + self.step)
+            return self.size
+
+
+class BatchDispatcher:
+    """Feed IDs from any thread; worker threads send adaptive batches concurrently."""
+
+    def __init__(self, send: Callable[[List[Any]], Tuple[int, List[Dict[str, Any]]]], workers: int = 4,
+                 sizer: Optional[AdaptiveBatchSize] = None, linger: float = 0.5, retries: int = 2,
+                 on_batch: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.send = send
+        self.workers = max(1, workers)
+        self.sizer = sizer or AdaptiveBatchSize()
+        self.linger = linger
+        self.retries = retries
+        self.on_batch = on_batch
+        self.queue: "queue.Queue" = queue.Queue()
+        self.totals = {"batches": 0, "sent": 0, "success": 0, "failed": 0, "retried": 0, "seconds": 0.0}
+        self.failures: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._retry: deque = deque()
+        self._attempts: Dict[Any, int] = {}
+
+    def start(self) -> "BatchDispatcher":
+        for n in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"dispatch-{n}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def add(self, items: Iterable[Any]) -> None:
+        for item in items:
+            self.queue.put(item)
+
+    def finish(self) -> Dict[str, Any]:
+        """Signal the end of input, wait for every batch and return the totals."""
+        self.queue.put(_END)
+        for thread in self._threads:
+            thread.join()
+        self.totals["final_size"] = self.sizer.size
+        return self.totals
+
+    def _next_batch(self, size: int) -> List[Any]:
+        """
+        Up to size items, retries first: block for the first item, then wait
+        at most ``linger`` to fill the batch.
+        """
+        with self._lock:
+            batch = [self._retry.popleft() for _ in range(min(size, len(self._retry)))]
+        deadline = time.monotonic() + self.linger if batch else None
+        while len(batch) < size:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is _END:
+                self.queue.put(_END)  # leave it for the other workers
+                break
+            batch.append(item)
+            if deadline is None:
+                deadline = time.monotonic() + self.linger
+        return batch
+
+    def _worker(self) -> None:
+        while True:
+            size, generation = self.sizer.take()
+            batch = self._next_batch(size)
+            if not batch:
+                return
+            started = time.perf_counter()
+            try:
+                success, failures = self.send(batch)
+            except Exception as e:  # the whole batch failed
+                success, failures = 0, [{"id": item, "error": str(e)} for item in batch]
+            seconds = time.perf_counter() - started
+            next_size = self.sizer.record(len(batch), generation, seconds, len(failures))
+            with self._lock:
+                final = []
+                for failure in failures:
+                    attempts = self._attempts.get(failure["id"], 0)
+                    if failure.get("retry") and attempts < self.retries:
+                        # Re-sent by this worker's next batch at the latest, so never lost at shutdown
+                        self._attempts[failure["id"]] = attempts + 1
+                        self._retry.append(failure["id"])
+                        self.totals["retried"] += 1
+                    else:
+                        final.append(failure)
+                self.totals["batches"] += 1
+                self.totals["sent"] += len(batch)
+                self.totals["success"] += success
+                self.totals["failed"] += len(final)
+                self.totals["seconds"] += seconds
+                self.failures.extend(final)
+                if self.on_batch:
+                    self.on_batch({"batch": self.totals["batches"], "size": len(batch), "success": success,
+                                   "failed": len(final), "retrying": len(failures) - len(final),
+                                   "seconds": seconds, "next_size": next_size, "queued": self.queue.qsize()})
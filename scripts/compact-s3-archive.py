@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Compact the EventHub notification archive into hourly NDJSON objects.
+
+The EventHub Lambda writes one small JSON object per poll under eventhub/.
+Every verification or replay then has to list and GET thousands of them.
+This job rewrites each completed hour into a single compressed NDJSON object
+(one Graph notification and its enqueue time per line, zstd when available,
+otherwise gzip) and a manifest holding time bounds, counts by changeType and
+per-block byte offsets. Replays can then read a handful of large sequential
+objects instead.
+
+Steps:
+1. Lists archive objects and groups them by LastModified hour (--start and
+   --end are widened to whole hours, so every hour is compacted complete)
+2. Skips hours whose manifest already covers every source object
+3. Downloads an hour's objects concurrently and extracts notifications; an
+   hour whose earlier sources were already deleted is merged into its
+   existing compacted object instead of rebuilt from what is left
+4. Writes <dest>/YYYY/MM/DD/HH.ndjson.{zst,gz} and HH.manifest.json
+5. Updates <dest>/_index.json (and optionally deletes the source objects)
+
+Usage:
+    python scripts/compact-s3-archive.py --start 2026-02-26T00:00 --end 2026-02-27T00:00
+    python scripts/compact-s3-archive.py --dry-run
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import boto3
+
+from s3_archive import (
+    BUCKET, PREFIX, COMPACT_PREFIX, INDEX_NAME,
+    BlockWriter, build_manifest, compacted_keys, get_json, hour_of,
+    iter_archive_notifications, iter_manifest_notifications, parse_timestamp, resolve_codec,
+)
+
+
+def hour_window(start: Optional[datetime], end: Optional[datetime]) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """
+    Widen [start, end) to whole hours. Compacting part of an hour (and then
+    deleting those sources) would lose the rest when the hour is redone.
+    """
+    if start:
+        start = hour_of(start)
+    if end and end != hour_of(end):
+        end = hour_of(end) + timedelta(hours=1)
+    return start, end
+
+
+def list_archive_by_hour(s3, bucket: str, prefix: str, start, end) -> Dict[datetime, List[Tuple[str, datetime]]]:
+    """Group archive keys by the UTC hour of their LastModified (start/end on hour boundaries)."""
+    current_hour = hour_of(datetime.now(timezone.utc))
+    by_hour = defaultdict(list)
+    paginator = s3.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+        for obj in page.get("Contents", []):
+            last_modified = obj["LastModified"]
+            if start and last_modified < start:
+                continue
+            if end and last_modified >= end:
+                continue
+            hour = hour_of(last_modified)
+            # The current hour is still being written to
+            if hour >= current_hour:
+                continue
+            by_hour[hour].append((obj["Key"], last_modified))
+    for objects in by_hour.values():
+        objects.sort(key=lambda entry: (entry[1], entry[0]))
+    return dict(sorted(by_hour.items()))
+
+
+def fetch_archive_object(s3, bucket: str, key: str) -> Tuple[str, Any]:
+    try:
+        body = s3.get_object(Bucket=bucket, Key=key)["Body"].read()
+        return key, json.loads(body)
+    except Exception as e:
+        return key, e
+
+
+def compact_hour(s3, args, hour: datetime, objects: List[Tuple[str, datetime]], codec: str,
+                 previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Compact one hour of archive objects. Returns the written manifest.
+
+    With ``previous`` (the hour's existing manifest), its compacted
+    notifications are carried over and only sources it does not list are
+    fetched, so sources deleted after the earlier run are not lost.
+    """
+    writer = BlockWriter(codec, block_lines=args.block_lines, level=args.level)
+    counts = defaultdict(int)
+    source_keys = []
+    failed = []
+    if previous:
+        for enqueued, notification in iter_manifest_notifications(s3, args.bucket, previous):
+            writer.add(enqueued, notification)
+            counts[notification.get("changeType", "unknown")] += 1
+        source_keys = list(previous["source_keys"])
+        carried = set(source_keys)
+        objects = [o for o in objects if o[0] not in carried]
+    last_modified_by_key = dict(objects)
+
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        results = pool.map(lambda o: fetch_archive_object(s3, args.bucket, o[0]), objects)
+        for key, data in results:
+            if isinstance(data, Exception):
+                failed.append((key, data))
+                continue
+            source_keys.append(key)
+            for enqueued, notification in iter_archive_notifications(data, last_modified_by_key[key]):
+                writer.add(enqueued, notification)
+                counts[notification.get("changeType", "unknown")] += 1
+
+    if failed:
+        for key, error in failed[:5]:
+            print(f"  Failed to read s3://{args.bucket}/{key}: {error}", file=sys.stderr)
+        raise RuntimeError(f"{len(failed)} source objects could not be read for hour {hour.isoformat()}")
+
+    data_key, manifest_key = compacted_keys(hour, codec, args.dest_prefix)
+    body = writer.getvalue()
+    manifest = build_manifest(hour, codec, data_key, writer, counts, source_keys)
+    manifest["manifest_key"] = manifest_key
+
+    content_type = "application/zstd" if codec == "zstd" else "application/gzip"
+    s3.put_object(Bucket=args.bucket, Key=data_key, Body=body, ContentType=content_type)
+    s3.put_object(
+        Bucket=args.bucket, Key=manifest_key,
+        Body=json.dumps(manifest, indent=2).encode("utf-8"),
+        ContentType="application/json",
+    )
+    return manifest
+
+
+def delete_sources(s3, bucket: str, keys: List[str]) -> None:
+    for i in range(0, len(keys), 1000):
+        chunk = keys[i:i + 1000]
+        s3.delete_objects(Bucket=bucket, Delete={"Objects": [{"Key": k} for k in chunk], "Quiet": True})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact EventHub S3 archive into hourly NDJSON")
+    parser.add_argument("--bucket", default=BUCKET, help=f"Archive bucket (default: {BUCKET})")
+    parser.add_argument("--prefix", default=PREFIX, help=f"Source prefix (default: {PREFIX})")
+    parser.add_argument("--dest-prefix", default=COMPACT_PREFIX, help=f"Compacted prefix (default: {COMPACT_PREFIX})")
+    parser.add_argument("--start", help="Only objects modified at/after this UTC time (ISO-8601, rounded down to the hour)")
+    parser.add_argument("--end", help="Only objects modified before this UTC time (ISO-8601, rounded up to the hour)")
+    parser.add_argument("--codec", choices=["auto", "zstd", "gzip"], default="auto",
+                        help="Compression codec (default: zstd if installed, else gzip)")
+    parser.add_argument("--level", type=int, default=6, help="Compression level (default: 6)")
+    parser.add_argument("--block-lines", type=int, default=5000,
+                        help="Notifications per independently compressed block (default: 5000)")
+    parser.add_argument("--workers", type=int, default=16, help="Concurrent GETs per hour (default: 16)")
+    parser.add_argument("--force", action="store_true", help="Recompact hours that are already up to date")
+    parser.add_argument("--delete-sources", action="store_true",
+                        help="Delete source objects after their hour is compacted")
+    parser.add_argument("--dry-run", action="store_true", help="List what would be compacted and exit")
+    parser.add_argument("--profile", default=None, help="AWS profile name")
+    parser.add_argument("--region", default=None, help="AWS region")
+    args = parser.parse_args()
+
+    start = parse_timestamp(args.start) if args.start else None
+    end = parse_timestamp(args.end) if args.end else None
+    start, end = hour_window(start, end)
+    codec = resolve_codec(args.codec)
+
+    s3 = boto3.Session(profile_name=args.profile, region_name=args.region).client("s3")
+
+    print(f"=== S3 Archive Compaction ({codec}) ===\n")
+    print(f"Listing s3://{args.bucket}/{args.prefix} "
+          f"({start.isoformat() if start else 'beginning'} -> {end.isoformat() if end else 'now'}, whole hours) ...")
+    by_hour = list_archive_by_hour(s3, args.bucket, args.prefix, start, end)
+    total_objects = sum(len(v) for v in by_hour.values())
+    print(f"Found {total_objects} objects across {len(by_hour)} completed hours\n")
+
+    if args.dry_run:
+        for hour, objects in by_hour.items():
+            print(f"  {hour.isoformat()}: {len(objects)} objects")
+        return 0
+
+    index_key = args.dest_prefix + INDEX_NAME
+    index = get_json(s3, args.bucket, index_key) or {"hours": {}}
+
+    started = time.time()
+    compacted_hours = 0
+    skipped_hours = 0
+    total_notifications = 0
+    total_raw = 0
+    total_compressed = 0
+
+    for hour, objects in by_hour.items():
+        keys = [key for key, _ in objects]
+        existing = index["hours"].get(hour.isoformat())
+        previous = get_json(s3, args.bucket, existing["manifest_key"]) if existing else None
+        already_compacted = set(previous.get("source_keys", [])) if previous else set()
+        if previous and not args.force and set(keys) <= already_compacted:
+            skipped_hours += 1
+            continue
+        # Sources the existing object holds but that are gone now (deleted after
+        # an earlier run): merge into it rather than rebuild from what is left
+        merge = previous if already_compacted - set(keys) else None
+
+        hour_started = time.time()
+        manifest = compact_hour(s3, args, hour, objects, codec, merge)
+        compacted_hours += 1
+        total_notifications += manifest["notification_count"]
+        total_raw += manifest["raw_bytes"]
+        total_compressed += manifest["compressed_bytes"]
+
+        index["hours"][hour.isoformat()] = {
+            "manifest_key": manifest["manifest_key"],
+            "data_key": manifest["data_key"],
+            "start": manifest["start"],
+            "end": manifest["end"],
+            "notification_count": manifest["notification_count"],
+            "counts_by_change_type": manifest["counts_by_change_type"],
+        }
+        # Persist the index after every hour so an interrupted run resumes cleanly
+        index["updated_at"] = datetime.now(timezone.utc).isoformat()
+        s3.put_object(Bucket=args.bucket, Key=index_key,
+                      Body=json.dumps(index, indent=2, sort_keys=True).encode("utf-8"),
+                      ContentType="application/json")
+
+        merged = f" (merged into {len(already_compacted)} compacted)" if merge else ""
+        print(f"  {hour.isoformat()}: {len(objects)} objects{merged} -> {manifest['notification_count']} notifications, "
+              f"{manifest['compressed_bytes'] / 1024:.1f} KiB ({time.time() - hour_started:.1f}s)")
+
+        if args.delete_sources:
+            delete_sources(s3, args.bucket, keys)
+
+    elapsed = time.time() - started
+    ratio = (total_raw / total_compressed) if total_compressed else 0
+    print(f"\n=== Compaction Complete ===")
+    print(f"Hours compacted: {compacted_hours} (skipped {skipped_hours} up to date)")
+    print(f"Notifications: {total_notifications}")
+    print(f"Bytes: {total_raw / 1024 / 1024:.1f} MiB raw -> {total_compressed / 1024 / 1024:.1f} MiB ({ratio:.1f}x)")
+    print(f"Duration: {elapsed:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
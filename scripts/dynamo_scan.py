@@ -0,0 +1,175 @@
+"""
+Parallel segmented DynamoDB scans (and index queries) for the meetings table tooling.
+
+A plain Scan reads the table one 1 MB page at a time on one connection.
+parallel_scan splits it with Segment/TotalSegments, runs one paginated scan
+per segment on a thread pool and hands the items to the caller as a single
+stream, so a full-table pass costs roughly (table size / segments) of
+round-trips and every page is followed to the end of its segment.
+
+Where a GSI exists, iter_query and query_count read just one key's items
+instead; index_active tells the caller whether to use them or fall back to
+a scan.
+
+Items are returned in the low-level client format ({"S": ...}); use
+attr() to read a scalar.
+
+    client = boto3.client("dynamodb")
+    for item in parallel_scan(client, "tmf-meetings-8akfpg", segments=8,
+                              projection=["meeting_id", "status"]):
+        print(attr(item, "meeting_id"), attr(item, "status"))
+"""
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+DEFAULT_SEGMENTS = 8
+PAGE_SIZE = 1000
+
+_DONE = object()
+
+
+def projection_expression(attributes: Iterable[str]) -> Tuple[str, Dict[str, str]]:
+    """ProjectionExpression plus ExpressionAttributeNames, aliasing every name (several are reserved words)."""
+    names = {f"#p{i}": name for i, name in enumerate(attributes)}
+    return ", ".join(names), names
+
+
+def attr(item: Dict[str, Any], name: str, default: Any = None) -> Any:
+    """Scalar value of a low-level attribute: S and N as str, BOOL as bool, NULL as default."""
+    value = item.get(name)
+    if not isinstance(value, dict):
+        return default
+    for kind in ("S", "N", "BOOL"):
+        if kind in value:
+            return value[kind]
+    return default
+
+
+def parallel_scan_pages(client, table: str, segments: int = DEFAULT_SEGMENTS, projection: Optional[Iterable[str]] = None,
+                        filter_expression: Optional[str] = None, values: Optional[Dict[str, Any]] = None,
+                        names: Optional[Dict[str, str]] = None, index: Optional[str] = None,
+                        page_size: int = PAGE_SIZE, stats: Optional[Dict[str, int]] = None) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yield every page of items of a table (or index) from ``segments`` concurrent scans.
+
+    Pages from all segments are merged as they arrive, so order is arbitrary.
+    A bounded queue keeps memory at a few pages per segment when the caller
+    consumes slower than DynamoDB returns. stats, if given, receives pages,
+    items and scanned counts. The first error from any segment is re-raised.
+    """
+    base: Dict[str, Any] = {"TableName": table, "PaginationConfig": {"PageSize": page_size}}
+    expression_names = dict(names or {})
+    if projection is not None:
+        expr, projection_names = projection_expression(projection)
+        base["ProjectionExpression"] = expr
+        expression_names.update(projection_names)
+    if filter_expression:
+        base["FilterExpression"] = filter_expression
+    if values:
+        base["ExpressionAttributeValues"] = values
+    if expression_names:
+        base["ExpressionAttributeNames"] = expression_names
+    if index:
+        base["IndexName"] = index
+    if stats is not None:
+        for key in ("pages", "items", "scanned"):
+            stats.setdefault(key, 0)
+
+    pages: "queue.Queue" = queue.Queue(maxsize=segments * 4)
+    stop = threading.Event()
+
+    def scan_segment(segment: int) -> None:
+        try:
+            params = dict(base, Segment=segment, TotalSegments=segments) if segments > 1 else base
+            for page in client.get_paginator("scan").paginate(**params):
+                if stop.is_set():
+                    return
+                pages.put((page.get("Items", []), page.get("ScannedCount", 0)))
+        except Exception as e:  # surfaced to the consumer below
+            pages.put(e)
+        finally:
+            pages.put(_DONE)
+
+    with ThreadPoolExecutor(max_workers=segments) as pool:
+        for segment in range(segments):
+            pool.submit(scan_segment, segment)
+        running = segments
+        try:
+            while running:
+                entry = pages.get()
+                if entry is _DONE:
+                    running -= 1
+                    continue
+                if isinstance(entry, Exception):
+                    raise entry
+                items, scanned = entry
+                if stats is not None:
+                    stats["pages"] += 1
+                    stats["items"] += len(items)
+                    stats["scanned"] += scanned
+                yield items
+        finally:
+            # Early exit or error: let the other segments finish their current page and stop
+            stop.set()
+            while running:
+                if pages.get() is _DONE:
+                    running -= 1
+
+
+def parallel_scan(client, table: str, segments: int = DEFAULT_SEGMENTS, **kwargs) -> Iterator[Dict[str, Any]]:
+    """Like parallel_scan_pages, one item at a time."""
+    for items in parallel_scan_pages(client, table, segments, **kwargs):
+        yield from items
+
+
+def index_active(client, table: str, index: str) -> bool:
+    """True when the table has the GSI and it has finished backfilling."""
+    description = client.describe_table(TableName=table)["Table"]
+    for gsi in description.get("GlobalSecondaryIndexes", []):
+        if gsi["IndexName"] == index:
+            return gsi.get("IndexStatus") == "ACTIVE" and not gsi.get("Backfilling", False)
+    return False
+
+
+def _key_query(table: str, index: Optional[str], key: str, value: str) -> Dict[str, Any]:
+    params: Dict[str, Any] = {
+        "TableName": table,
+        "KeyConditionExpression": "#k = :k",
+        "ExpressionAttributeNames": {"#k": key},
+        "ExpressionAttributeValues": {":k": {"S": value}},
+    }
+    if index:
+        params["IndexName"] = index
+    return params
+
+
+def iter_query(client, table: str, index: Optional[str], key: str, value: str,
+               projection: Optional[Iterable[str]] = None, page_size: int = PAGE_SIZE) -> Iterator[List[Dict[str, Any]]]:
+    """Yield pages of items whose partition key ``key`` equals ``value``, following every page."""
+    params = _key_query(table, index, key, value)
+    params["PaginationConfig"] = {"PageSize": page_size}
+    if projection is not None:
+        expr, names = projection_expression(projection)
+        params["ProjectionExpression"] = expr
+        params["ExpressionAttributeNames"].update(names)
+    for page in client.get_paginator("query").paginate(**params):
+        yield page.get("Items", [])
+
+
+def query_count(client, table: str, index: Optional[str], key: str, value: str) -> int:
+    """Number of items with partition key ``key`` = ``value`` (Select=COUNT, all pages)."""
+    params = _key_query(table, index, key, value)
+    params["Select"] = "COUNT"
+    return sum(page.get("Count", 0) for page in client.get_paginator("query").paginate(**params))
+
+
+def query_counts(client, table: str, index: Optional[str], key: str, values: Iterable[str]) -> Dict[str, int]:
+    """query_count for several key values, run concurrently."""
+    values = list(values)
+    if not values:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(values)) as pool:
+        counts = pool.map(lambda v: query_count(client, table, index, key, v), values)
+        return dict(zip(values, counts))
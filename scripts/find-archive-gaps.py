@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Find meetings present in the S3 notification archive but missing from DynamoDB,
+then replay only the notifications needed to recover them.
+
+Context: after the 2026-02-26 admin app outage, finding the missing "created"
+records meant correlating S3 and DynamoDB by hand. This script:
+1. Streams meeting_id values from the meetings table into a hash set
+2. Streams calendar-event notifications from the archive for the time range
+3. Keeps, per meeting_id absent from the table, the best notification to
+   replay ("created" preferred, otherwise the latest "updated") plus any
+   archived "deleted"
+4. Reports the gap and replays only those notifications
+
+Memory is the table's id set plus the gap itself, so recovery cost is
+proportional to what is missing rather than the whole window.
+
+Usage:
+    python scripts/find-archive-gaps.py --start 2026-02-26T18:25 --end 2026-02-26T19:00
+    python scripts/find-archive-gaps.py --start ... --end ... --dry-run --output gaps.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional, Set
+
+import boto3
+
+from s3_archive import (
+    BUCKET, PREFIX, iter_compacted_notifications, iter_s3_notifications,
+    list_archive_objects, parse_timestamp,
+)
+from webhook_helper import LAMBDA_FUNCTION, get_lambda_env, post_webhook
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "graph"))
+from graph_resources import EVENT, parse_resource
+
+DYNAMODB_TABLE = "tmf-meetings-8akfpg"
+PACE_MS = 200  # milliseconds between replayed requests
+
+# Replay preference when several notifications exist for a missing meeting
+CHANGE_TYPE_RANK = {"created": 2, "updated": 1}
+
+
+def meeting_id_from_resource(resource: str) -> Optional[str]:
+    """Return the event id for calendar-event resources (Users/{id}/Events/{id})."""
+    parsed = parse_resource(resource)
+    return parsed.id if parsed.kind == EVENT else None
+
+
+def scan_meeting_ids(dynamodb, table: str) -> Set[str]:
+    """Stream meeting_id values from the meetings table into a set."""
+    ids = set()
+    paginator = dynamodb.get_paginator("scan")
+    pages = paginator.paginate(
+        TableName=table,
+        ProjectionExpression="meeting_id",
+        PaginationConfig={"PageSize": 1000},
+    )
+    for page_num, page in enumerate(pages, 1):
+        for item in page.get("Items", []):
+            ids.add(item["meeting_id"]["S"])
+        if page_num % 25 == 0:
+            print(f"  ... {len(ids)} meeting ids so far")
+    return ids
+
+
+def find_gaps(notifications, table_ids: Set[str], stats: Dict[str, int]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Return meeting_id -> notifications to replay for meetings not in the table.
+
+    Each missing meeting replays its best upsert ("created" preferred,
+    otherwise the latest "updated"), followed by its "deleted" notification
+    if one was archived, so cancelled meetings come back cancelled.
+    """
+    upserts: Dict[str, Dict[str, Any]] = {}
+    deletes: Dict[str, Dict[str, Any]] = {}
+
+    for _, notification in notifications:
+        stats["notifications"] += 1
+        meeting_id = meeting_id_from_resource(notification.get("resource", ""))
+        if not meeting_id:
+            continue
+        stats["event_notifications"] += 1
+        if meeting_id in table_ids:
+            continue
+
+        change_type = notification.get("changeType", "")
+        if change_type == "deleted":
+            deletes[meeting_id] = notification
+            continue
+        rank = CHANGE_TYPE_RANK.get(change_type, 0)
+        current = upserts.get(meeting_id)
+        # ">=" keeps the latest "updated" when no "created" is archived
+        if current is None or rank >= CHANGE_TYPE_RANK.get(current.get("changeType", ""), 0):
+            upserts[meeting_id] = notification
+
+    # A delete for a meeting the table never saw has nothing to recover
+    stats["deleted_only"] = len(deletes.keys() - upserts.keys())
+    return {
+        meeting_id: [notification] + ([deletes[meeting_id]] if meeting_id in deletes else [])
+        for meeting_id, notification in upserts.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find and replay archive notifications missing from DynamoDB")
+    parser.add_argument("--start", required=True, help="Start of the time range (UTC, ISO-8601)")
+    parser.add_argument("--end", required=True, help="End of the time range (UTC, ISO-8601)")
+    parser.add_argument("--table", default=DYNAMODB_TABLE, help=f"Meetings table (default: {DYNAMODB_TABLE})")
+    parser.add_argument("--bucket", default=BUCKET, help=f"Archive bucket (default: {BUCKET})")
+    parser.add_argument("--prefix", default=PREFIX, help=f"Archive prefix (default: {PREFIX})")
+    parser.add_argument("--compacted", action="store_true", help="Read the hourly compacted archive")
+    parser.add_argument("--workers", type=int, default=16, help="Concurrent S3 GETs (default: 16)")
+    parser.add_argument("--lambda-function", default=LAMBDA_FUNCTION,
+                        help=f"Lambda holding the webhook config (default: {LAMBDA_FUNCTION})")
+    parser.add_argument("--output", help="Write missing meetings and their notifications to this JSON file")
+    parser.add_argument("--dry-run", action="store_true", help="Report the gap without replaying")
+    args = parser.parse_args()
+
+    start = parse_timestamp(args.start)
+    end = parse_timestamp(args.end)
+    if not start or not end or start >= end:
+        print("ERROR: --start and --end must be ISO-8601 timestamps with start < end", file=sys.stderr)
+        return 1
+
+    started = time.time()
+    s3 = boto3.client("s3")
+    dynamodb = boto3.client("dynamodb")
+
+    print(f"=== Archive vs Table Gap Finder ===")
+    print(f"Window: {start.isoformat()} -> {end.isoformat()}\n")
+
+    # Step 1: Table side
+    print(f"[1/4] Scanning meeting ids from {args.table}...")
+    table_ids = scan_meeting_ids(dynamodb, args.table)
+    print(f"  {len(table_ids)} meetings in table\n")
+
+    # Step 2-3: Archive side, diffed as it streams
+    errors = []
+    if args.compacted:
+        print(f"[2/4] Streaming compacted archive...")
+        notifications = iter_compacted_notifications(s3, args.bucket, start, end)
+    else:
+        print(f"[2/4] Listing s3://{args.bucket}/{args.prefix} ...")
+        objects = list_archive_objects(s3, args.bucket, start, end, args.prefix)
+        print(f"  {len(objects)} archive objects in window")
+        notifications = iter_s3_notifications(s3, args.bucket, objects, args.workers, errors)
+
+    print(f"[3/4] Computing set difference...")
+    stats = {"notifications": 0, "event_notifications": 0}
+    gaps = find_gaps(notifications, table_ids, stats)
+    for key, error in errors[:10]:
+        print(f"  Failed to read s3://{args.bucket}/{key}: {error}", file=sys.stderr)
+
+    by_type: Dict[str, int] = {}
+    for replay in gaps.values():
+        ct = replay[0].get("changeType", "unknown")
+        by_type[ct] = by_type.get(ct, 0) + 1
+    total_replays = sum(len(replay) for replay in gaps.values())
+
+    print(f"  Archive notifications: {stats['notifications']} ({stats['event_notifications']} calendar events)")
+    print(f"  Missing meetings: {len(gaps)}")
+    for ct, count in sorted(by_type.items()):
+        print(f"    - recover via {ct}: {count}")
+    if stats["deleted_only"]:
+        print(f"  Skipped (deleted, not missing): {stats['deleted_only']}")
+    if errors:
+        print(f"  WARNING: {len(errors)} archive objects could not be read; the gap may be understated")
+    for meeting_id in list(gaps)[:10]:
+        print(f"    {meeting_id}")
+    if len(gaps) > 10:
+        print(f"    ... and {len(gaps) - 10} more")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "start": start.isoformat(),
+                "end": end.isoformat(),
+                "table": args.table,
+                "missing": [{"meeting_id": mid, "notifications": n} for mid, n in gaps.items()],
+            }, f, indent=2)
+        print(f"  Written to {args.output}")
+
+    if not gaps or args.dry_run:
+        print(f"\n{'DRY RUN - no replay.' if gaps else 'No gap found.'} ({time.time() - started:.1f}s)")
+        return 0
+
+    # Step 4: Targeted replay
+    print(f"\n[4/4] Replaying {total_replays} notifications for {len(gaps)} meetings...")
+    webhook_url, auth_secret = get_lambda_env(args.lambda_function)
+    success = failed = 0
+    sent = 0
+    for meeting_id, replay in gaps.items():
+        for notification in replay:
+            if sent:
+                time.sleep(PACE_MS / 1000.0)
+            sent += 1
+            ok = post_webhook(webhook_url, auth_secret, notification)
+            success += ok
+            failed += not ok
+            print(f"  [{sent}/{total_replays}] [{notification.get('changeType', '?')}] {meeting_id[-40:]}... "
+                  f"{'OK' if ok else 'FAIL'}")
+
+    print(f"\n=== Gap Replay Complete ===")
+    print(f"Missing meetings: {len(gaps)} ({total_replays} notifications)")
+    print(f"  - success: {success}")
+    print(f"  - failed: {failed}")
+    print(f"Duration: {time.time() - started:.1f}s")
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
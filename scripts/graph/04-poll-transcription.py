@@ -1,12 +1,27 @@
 """
 Step 4: Poll for Transcription
 Polls for meeting recording transcriptions
+
+Run without arguments for the interactive single-meeting poller, or pass
+--meetings to poll many meetings from one scheduler:
+
+    python 04-poll-transcription.py --meetings meetings.json --output ./transcripts
+
+meetings.json is a JSON array (or NDJSON) of objects with the organizer
+("organizer" / "organizerEmail"), "meeting_id" (or "onlineMeetingId") and
+optionally the meeting "end" time (ISO-8601). Missing end times are looked up.
 """
+import argparse
+import json
+import os
 import sys
 import time
 import requests
-from datetime import datetime
-from auth_helper import get_graph_headers
+from datetime import datetime, timezone
+from auth_helper import get_config, get_graph_headers, get_graph_session
+from poll_scheduler import ExponentialBackoff, PollScheduler, to_epoch
+from transcript_cache import open_cache
+from transcript_readiness import ReadinessModel
 
 
 def get_online_meeting(meeting_id):
@@ -39,13 +54,13 @@ def get_meeting_recordings(user_email, meeting_id):
         return []
 
 
-def get_call_transcripts(user_email, meeting_id):
+def get_call_transcripts(user_email, meeting_id, session=requests):
     """Get transcripts for a meeting"""
     headers = get_graph_headers()
     url = f"https://graph.microsoft.com/v1.0/users/{user_email}/onlineMeetings/{meeting_id}/transcripts"
     
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = session.get(url, headers=headers, timeout=10)
         if response.status_code == 200:
             return response.json().get('value', [])
         return []
@@ -54,19 +69,28 @@ def get_call_transcripts(user_email, meeting_id):
         return []
 
 
-def download_transcript_content(user_email, meeting_id, transcript_id):
-    """Download transcript content"""
+def download_transcript_content(user_email, meeting_id, transcript_id, session=requests, cache=None):
+    """Download transcript content, reusing a TranscriptCache entry when there is one"""
+    if cache is not None:
+        content = cache.get(user_email, meeting_id, transcript_id)
+        if content is not None:
+            return content
     headers = get_graph_headers()
     url = f"https://graph.microsoft.com/v1.0/users/{user_email}/onlineMeetings/{meeting_id}/transcripts/{transcript_id}/content"
     
     try:
-        response = requests.get(url, headers=headers, timeout=30)
-        if response.status_code == 200:
-            return response.text
-        return None
+        response = session.get(url, headers=headers, timeout=30)
+        if response.status_code != 200:
+            return None
     except Exception as e:
         print(f"Error: {e}")
         return None
+    if cache is not None:
+        try:
+            cache.put(user_email, meeting_id, transcript_id, response.content)
+        except Exception as e:
+            print(f"⚠️  Failed to cache transcript {transcript_id[:30]}...: {e}")
+    return response.text
 
 
 def poll_for_transcript(user_email, meeting_id, max_attempts=20, delay_seconds=30):
@@ -113,8 +137,170 @@ def poll_for_transcript(user_email, meeting_id, max_attempts=20, delay_seconds=3
     return None
 
 
+def get_meeting_end(user_email, meeting_id, session=requests):
+    """Look up a meeting's endDateTime (ISO-8601) via the organizer's onlineMeetings"""
+    headers = get_graph_headers()
+    url = f"https://graph.microsoft.com/v1.0/users/{user_email}/onlineMeetings/{meeting_id}"
+    
+    try:
+        response = session.get(url, headers=headers, timeout=10)
+        if response.status_code == 200:
+            return response.json().get('endDateTime')
+        return None
+    except Exception as e:
+        print(f"Error: {e}")
+        return None
+
+
+def load_meetings(path):
+    """Load meetings from a JSON array or NDJSON file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read().strip()
+    if text.startswith('['):
+        records = json.loads(text)
+    else:
+        records = [json.loads(line) for line in text.splitlines() if line.strip()]
+    
+    meetings = []
+    for record in records:
+        user = record.get('organizer') or record.get('organizerEmail') or record.get('user')
+        meeting_id = record.get('meeting_id') or record.get('onlineMeetingId')
+        if not user or not meeting_id:
+            print(f"⚠️  Skipping record without organizer/meeting_id: {record}")
+            continue
+        meetings.append((user, meeting_id, record.get('end') or record.get('endDateTime')))
+    return meetings
+
+
+def record_readiness(model, tenant, meeting, transcripts):
+    """
+    Record how long after the meeting end the transcript appeared: exactly
+    from createdDateTime when Graph returns it, otherwise bracketed by the
+    previous unsuccessful check.
+    """
+    created = [t['createdDateTime'] for t in transcripts if t.get('createdDateTime')]
+    if created:
+        return model.record(tenant, meeting.meeting_id, meeting.end_time, min(map(to_epoch, created)), exact=True)
+    if meeting.last_check is not None:
+        return model.record(tenant, meeting.meeting_id, meeting.end_time, time.time(),
+                            earliest=meeting.last_check)
+    return None
+
+
+def poll_many(meetings, output_dir='.', workers=8, first_check=120, max_interval=900, give_up_after=4 * 3600,
+              readiness=None, tenant=None, cache=None):
+    """
+    Poll many meetings from one scheduler, downloading transcripts as soon as
+    they appear. Returns the scheduler stats.
+    
+    With a ReadinessModel, checks are timed at the tenant's observed delay
+    quantiles and every transcript found adds an observation. With a
+    TranscriptCache, transcripts fetched in earlier runs are not downloaded again.
+    """
+    session = get_graph_session(pool_size=workers)
+    os.makedirs(output_dir, exist_ok=True)
+    
+    def check(meeting):
+        return get_call_transcripts(meeting.user, meeting.meeting_id, session=session)
+    
+    def on_ready(meeting, transcripts):
+        delay = (time.time() - meeting.end_time) / 60
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] ✅ {meeting.user} {meeting.meeting_id[:30]}...: "
+              f"{len(transcripts)} transcript(s), {delay:.1f} min after end, check #{meeting.attempt + 1}")
+        for idx, transcript in enumerate(transcripts, 1):
+            content = download_transcript_content(meeting.user, meeting.meeting_id, transcript['id'],
+                                                  session=session, cache=cache)
+            if content is None:
+                raise RuntimeError(f"download failed for transcript {transcript['id']}")
+            filename = os.path.join(output_dir, f"transcript_{meeting.meeting_id}_{idx}.vtt")
+            with open(filename, 'w', encoding='utf-8') as f:
+                f.write(content)
+            print(f"   💾 Saved to: {filename}")
+        if readiness is not None:
+            record_readiness(readiness, tenant, meeting, transcripts)
+    
+    def on_give_up(meeting):
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] ⚠️  Giving up on {meeting.user} "
+              f"{meeting.meeting_id[:30]}... after {meeting.attempt} check(s)")
+    
+    if readiness is not None:
+        policy = readiness.policy(tenant, give_up_after=give_up_after)
+    else:
+        policy = ExponentialBackoff(first=first_check, max_interval=max_interval, give_up_after=give_up_after)
+    scheduler = PollScheduler(check, on_ready=on_ready, on_give_up=on_give_up, policy=policy, workers=workers)
+    
+    for user, meeting_id, end in meetings:
+        if not end:
+            end = get_meeting_end(user, meeting_id, session=session)
+        if not end:
+            print(f"⚠️  No end time for {meeting_id[:30]}..., assuming it just ended")
+            end = datetime.now(timezone.utc)
+        scheduler.add(user, meeting_id, end)
+    
+    print(f"\n🔄 Polling {len(scheduler)} meeting(s) with {workers} worker(s)...")
+    if readiness is not None:
+        samples = len(readiness.delays(tenant))
+        checks = ', '.join(f"{o / 60:.0f}m" for o in policy.offsets()[:6])
+        print(f"   Readiness schedule for tenant {tenant} ({samples} observations): {checks}, ...\n")
+    else:
+        print(f"   First check {first_check}s after end, gaps doubling up to {max_interval}s, "
+              f"giving up {give_up_after / 3600:.1f}h after end\n")
+    
+    started = time.time()
+    try:
+        stats = scheduler.run()
+    except KeyboardInterrupt:
+        print("\n⏹️  Interrupted")
+        stats = scheduler.stats
+    
+    print(f"\n📊 Summary ({(time.time() - started) / 60:.1f} min):")
+    print(f"   Meetings: {stats['added']}")
+    print(f"   ✅ Transcripts found: {stats['ready']}")
+    print(f"   ⚠️  Gave up: {stats['gave_up']}")
+    print(f"   Still pending: {len(scheduler)}")
+    print(f"   Graph list calls: {stats['checks']} ({stats['errors']} errors)")
+    return stats
+
+
 def main():
-    """Interactive transcript polling"""
+    """Interactive transcript polling, or --meetings for many meetings"""
+    if len(sys.argv) > 1:
+        parser = argparse.ArgumentParser(description='Poll many meetings for transcripts from one scheduler')
+        parser.add_argument('--meetings', required=True, help='JSON array / NDJSON file of meetings to poll')
+        parser.add_argument('--output', '-o', default='.', help='Directory for downloaded transcripts')
+        parser.add_argument('--workers', '-w', type=int, default=8, help='Concurrent Graph calls (default: 8)')
+        parser.add_argument('--first-check', type=int, default=120,
+                            help='Seconds after meeting end for the first check (default: 120)')
+        parser.add_argument('--max-interval', type=int, default=900,
+                            help='Maximum seconds between checks (default: 900)')
+        parser.add_argument('--give-up-after', type=float, default=4,
+                            help='Hours after meeting end to stop polling (default: 4)')
+        parser.add_argument('--readiness-db', metavar='PATH',
+                            help='Time checks from observed transcript delays stored here (and record new ones)')
+        parser.add_argument('--tenant', help='Tenant key for --readiness-db (default: GRAPH_TENANT_ID)')
+        parser.add_argument('--cache', metavar='DIR',
+                            help='Reuse transcripts fetched before from this cache (default: $TRANSCRIPT_CACHE_DIR)')
+        parser.add_argument('--cache-max-mb', type=float, default=None,
+                            help='Evict least recently used cached transcripts beyond this size (default: 1024)')
+        args = parser.parse_args()
+        
+        meetings = load_meetings(args.meetings)
+        if not meetings:
+            print("❌ No meetings to poll")
+            return 1
+        readiness = ReadinessModel(args.readiness_db) if args.readiness_db else None
+        tenant = args.tenant or get_config()['tenant_id'] or 'default'
+        cache = open_cache(args.cache, args.cache_max_mb)
+        try:
+            stats = poll_many(meetings, args.output, args.workers, args.first_check,
+                              args.max_interval, args.give_up_after * 3600, readiness, tenant, cache)
+        finally:
+            if readiness is not None:
+                readiness.close()
+            if cache is not None:
+                cache.close()
+        return 0 if stats['gave_up'] == 0 else 1
+    
     print("=" * 60)
     print("Poll for Meeting Transcription")
     print("=" * 60)
@@ -17,6 +17,9 @@ import json
 import argparse
 import requests
 from auth_helper import get_graph_headers
+from transcript_cache import open_cache
+from transcript_redaction import open_redactor, redact_text
+from vtt_parser import cue_to_dict, iter_cues
 
 
 def fetch_transcript_metadata(user_email: str, meeting_id: str, transcript_id: str) -> dict:
@@ -73,46 +76,15 @@ def fetch_transcript_content(user_email: str, meeting_id: str, transcript_id: st
         return None
 
 
-def parse_transcript_vtt(vtt_content: str) -> list:
-    """Parse VTT format into structured transcript entries."""
-    lines = vtt_content.split('\n')
-    entries = []
-    current_entry = {}
+def parse_transcript_vtt(vtt_content) -> list:
+    """
+    Parse VTT format into structured transcript entries.
     
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
-        
-        # Skip WEBVTT header and empty lines
-        if line.startswith('WEBVTT') or not line:
-            i += 1
-            continue
-        
-        # Timestamp line (e.g., "00:00:01.234 --> 00:00:05.678")
-        if '-->' in line:
-            parts = line.split(' --> ')
-            if len(parts) == 2:
-                current_entry = {
-                    'start': parts[0].strip(),
-                    'end': parts[1].strip(),
-                    'text': ''
-                }
-                
-                # Next line(s) contain the text
-                i += 1
-                text_lines = []
-                while i < len(lines) and lines[i].strip() and '-->' not in lines[i]:
-                    text_lines.append(lines[i].strip())
-                    i += 1
-                
-                current_entry['text'] = ' '.join(text_lines)
-                if current_entry['text']:
-                    entries.append(current_entry)
-                continue
-        
-        i += 1
-    
-    return entries
+    Thin wrapper over vtt_parser.iter_cues; accepts the same sources (str,
+    bytes, file object or byte chunks). Use iter_cues directly to stream
+    long transcripts without building the list.
+    """
+    return [cue_to_dict(cue) for cue in iter_cues(vtt_content)]
 
 
 def display_transcript(entries: list, max_entries: int = None):
@@ -125,7 +97,10 @@ def display_transcript(entries: list, max_entries: int = None):
     
     for idx, entry in enumerate(entries[:display_count], 1):
         print(f"\n[{entry['start']} --> {entry['end']}]")
-        print(f"{entry['text']}")
+        if entry.get('speaker'):
+            print(f"{entry['speaker']}: {entry['text']}")
+        else:
+            print(f"{entry['text']}")
     
     if max_entries and len(entries) > max_entries:
         print(f"\n... ({len(entries) - max_entries} more entries)")
@@ -154,6 +129,12 @@ Examples:
   
   # Show only first 10 entries
   python 05-fetch-transcript.py user@domain.com meeting_id transcript_id --limit 10
+  
+  # Redact emails, phone numbers and names from a terms file before saving
+  python 05-fetch-transcript.py user@domain.com meeting_id transcript_id -o t.vtt --redact-terms pii-terms.txt
+  
+  # Re-runs are served from a local cache instead of Graph
+  python 05-fetch-transcript.py user@domain.com meeting_id transcript_id --cache ~/.cache/tmf-transcripts
         """
     )
     
@@ -163,6 +144,14 @@ Examples:
     parser.add_argument('--output', '-o', help='Save transcript to file')
     parser.add_argument('--limit', '-l', type=int, help='Limit number of entries displayed')
     parser.add_argument('--metadata-only', action='store_true', help='Fetch metadata only, not content')
+    parser.add_argument('--redact', action='store_true',
+                        help='Redact PII (emails, phone/card numbers, ...) before saving and display')
+    parser.add_argument('--redact-terms', metavar='PATH',
+                        help='Also redact the dictionary terms in PATH (implies --redact)')
+    parser.add_argument('--cache', metavar='DIR',
+                        help='Reuse transcripts fetched before from this cache (default: $TRANSCRIPT_CACHE_DIR)')
+    parser.add_argument('--cache-max-mb', type=float, default=None,
+                        help='Evict least recently used cached transcripts beyond this size (default: 1024)')
     
     args = parser.parse_args()
     
@@ -173,21 +162,40 @@ Examples:
     print(f"Transcript ID: {args.transcript_id}")
     print("=" * 80)
     
-    # Fetch metadata
-    metadata = fetch_transcript_metadata(args.user_email, args.meeting_id, args.transcript_id)
-    
-    if not metadata:
-        sys.exit(1)
+    cache = None if args.metadata_only else open_cache(args.cache, args.cache_max_mb)
+    key = (args.user_email, args.meeting_id, args.transcript_id)
+    content = cache.get(*key) if cache is not None else None
     
-    if args.metadata_only:
-        print("\n✅ Metadata fetched (use without --metadata-only to fetch content)")
-        sys.exit(0)
+    if content is not None:
+        print(f"\n📦 Served from cache {cache.root} ({len(content)} characters)")
+    else:
+        # Fetch metadata
+        metadata = fetch_transcript_metadata(args.user_email, args.meeting_id, args.transcript_id)
+        
+        if not metadata:
+            sys.exit(1)
+        
+        if args.metadata_only:
+            print("\n✅ Metadata fetched (use without --metadata-only to fetch content)")
+            sys.exit(0)
+        
+        # Fetch content
+        content = fetch_transcript_content(args.user_email, args.meeting_id, args.transcript_id)
+        
+        if not content:
+            sys.exit(1)
+        
+        if cache is not None:
+            cache.put(*key, content)
     
-    # Fetch content
-    content = fetch_transcript_content(args.user_email, args.meeting_id, args.transcript_id)
+    if cache is not None:
+        cache.close()
     
-    if not content:
-        sys.exit(1)
+    if args.redact or args.redact_terms:
+        redactor = open_redactor(args.redact_terms)
+        content = redact_text(content, redactor)
+        found = ', '.join(f"{label} {count}" for label, count in redactor.counts.most_common()) or 'nothing found'
+        print(f"\n🕶️  Redacted: {found}")
     
     # Save to file if requested
     if args.output:
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Per-meeting conversation analytics over many transcripts.
+
+Computes talk time per speaker, speech/silence, silence gaps, overlap, turns
+and words per minute with vectorized NumPy operations (transcript_analytics),
+writing one summary row per meeting.
+
+Inputs can be any mix of:
+    .vtt / .vtt.gz   parsed on the fly
+    .tct             CompactTranscript files (memory-mapped, no parsing)
+    .parquet/.arrow  parts written by convert-vtt-columnar.py (needs pyarrow)
+
+For a month of meetings, convert once with convert-vtt-columnar.py and
+analyze the .tct or Parquet output: the metrics themselves take
+microseconds per meeting, parsing VTT is what costs time.
+
+Usage:
+    python analyze-transcripts.py ./transcripts --csv meetings.csv
+    python analyze-transcripts.py ./columnar --ndjson meetings.ndjson --silence 3
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+try:
+    from transcript_analytics import DEFAULT_SILENCE_MS, analyze_compact, flatten_row, iter_table_meetings, meeting_metrics
+except ImportError as e:
+    print(f"❌ transcript analytics needs numpy (pip install numpy): {e}")
+    sys.exit(1)
+from compact_transcript import CompactTranscript
+from transcript_index import TRANSCRIPT_SUFFIXES
+
+TABLE_SUFFIXES = (".parquet", ".arrow")
+SUFFIXES = TRANSCRIPT_SUFFIXES + (".tct",) + TABLE_SUFFIXES
+
+
+def iter_inputs(inputs):
+    for item in inputs:
+        if os.path.isfile(item):
+            yield item
+            continue
+        for root, _, files in os.walk(item):
+            for filename in sorted(files):
+                if filename.endswith(SUFFIXES):
+                    yield os.path.join(root, filename)
+
+
+def read_table(path: str):
+    import pyarrow as pa
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        return pq.read_table(path)
+    with pa.memory_map(path) as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def iter_rows(paths, silence_ms: int, stats: dict):
+    """Yield one summary row per meeting found in paths."""
+    for path in paths:
+        name = os.path.basename(path)
+        try:
+            if path.endswith(TABLE_SUFFIXES):
+                for transcript_id, cols in iter_table_meetings(read_table(path)):
+                    row = meeting_metrics(cols["starts"], cols["ends"], cols["speaker_ids"], cols["speakers"],
+                                          cols["words"], cols["meeting_id"], silence_ms)
+                    stats["cues"] += row["cues"]
+                    yield {"transcript": transcript_id, **row}
+                continue
+            if path.endswith(".tct"):
+                transcript = CompactTranscript.open(path)
+            else:
+                transcript = CompactTranscript.from_vtt(path)
+            with transcript:
+                row = analyze_compact(transcript, silence_ms=silence_ms)
+        except (OSError, ValueError, UnicodeDecodeError, EOFError, ImportError) as e:
+            stats["failed"] += 1
+            print(f"   ❌ {path}: {e}")
+            continue
+        stats["cues"] += row["cues"]
+        for suffix in SUFFIXES:
+            if name.endswith(suffix):
+                name = name[:-len(suffix)]
+                break
+        yield {"transcript": name, **row}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Per-meeting talk time, overlap, silence and words-per-minute',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python analyze-transcripts.py ./transcripts --csv meetings.csv
+  python analyze-transcripts.py ./compact --ndjson meetings.ndjson
+  python analyze-transcripts.py ./columnar --silence 5 --top 20
+        """
+    )
+    parser.add_argument('inputs', nargs='+', help='Files or directories (.vtt, .vtt.gz, .tct, .parquet, .arrow)')
+    parser.add_argument('--csv', metavar='PATH', help='Write summary rows as CSV')
+    parser.add_argument('--ndjson', metavar='PATH', help='Write summary rows as NDJSON')
+    parser.add_argument('--silence', type=float, default=DEFAULT_SILENCE_MS / 1000,
+                        help=f'Minimum gap (seconds) counted as a silence gap (default: {DEFAULT_SILENCE_MS / 1000:g})')
+    parser.add_argument('--top', type=int, default=10, help='Meetings to print, longest first (default: 10)')
+    args = parser.parse_args()
+
+    print("📈 Transcript Analytics")
+    print("=" * 80)
+    stats = {"cues": 0, "failed": 0}
+    started = time.perf_counter()
+    rows = [row for row in iter_rows(iter_inputs(args.inputs), int(args.silence * 1000), stats) if row["cues"]]
+    elapsed = time.perf_counter() - started
+
+    if not rows:
+        print("❌ No transcripts analyzed")
+        return 1
+
+    if args.csv:
+        columns = list(dict.fromkeys(key for row in rows for key in row))
+        with open(args.csv, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(flatten_row(row) for row in rows)
+        print(f"💾 CSV: {args.csv}")
+    if args.ndjson:
+        with open(args.ndjson, 'w', encoding='utf-8') as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        print(f"💾 NDJSON: {args.ndjson}")
+
+    print(f"\n{'transcript':<32} {'min':>6} {'spk':>4} {'silence%':>9} {'overlap%':>9} {'wpm':>6}  top speaker")
+    for row in sorted(rows, key=lambda r: -r["duration_s"])[:args.top]:
+        silence_pct = 100 * row["silence_s"] / row["duration_s"] if row["duration_s"] else 0
+        print(f"{row['transcript'][:32]:<32} {row['duration_s'] / 60:>6.1f} {row['speakers']:>4} "
+              f"{silence_pct:>8.1f}% {row['overlap_pct']:>8.1f}% {row['wpm']:>6.0f}  "
+              f"{row['top_speaker']} ({row['top_speaker_share']:.0%})")
+
+    hours = sum(row["duration_s"] for row in rows) / 3600
+    print(f"\n📊 {len(rows):,} meeting(s), {hours:,.1f} hours, {stats['cues']:,} cues in {elapsed:.2f}s "
+          f"({len(rows) / elapsed:,.0f} meetings/s, {stats['cues'] / elapsed:,.0f} cues/s)")
+    if stats["failed"]:
+        print(f"   ❌ Failed: {stats['failed']}")
+    return 0 if stats["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
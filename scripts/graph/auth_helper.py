@@ -3,14 +3,20 @@ Authentication Helper for Microsoft Graph API
 Shared authentication logic for all Graph scripts
 """
 import os
+import time
 from msal import ConfidentialClientApplication
 from dotenv import load_dotenv
 
+# MSAL apps keyed by (tenant, client). Reusing the app reuses its in-memory
+# token cache, so repeated calls only hit Entra ID when the token expires.
+_msal_apps = {}
+
 
 def get_graph_token(scopes=None):
     """
     Acquire access token for Microsoft Graph API
     Uses client credentials flow (application permissions)
+    Tokens are cached per process and refreshed shortly before expiry.
     """
     load_dotenv('.env.local.azure')
     
@@ -31,12 +37,15 @@ def get_graph_token(scopes=None):
     if scopes is None:
         scopes = ["https://graph.microsoft.com/.default"]
     
-    # Create MSAL app
-    app = ConfidentialClientApplication(
-        client_id=client_id,
-        client_credential=client_secret,
-        authority=f"https://login.microsoftonline.com/{tenant_id}"
-    )
+    # Create (or reuse) MSAL app
+    app = _msal_apps.get((tenant_id, client_id))
+    if app is None:
+        app = ConfidentialClientApplication(
+            client_id=client_id,
+            client_credential=client_secret,
+            authority=f"https://login.microsoftonline.com/{tenant_id}"
+        )
+        _msal_apps[(tenant_id, client_id)] = app
     
     # Acquire token
     result = app.acquire_token_for_client(scopes=scopes)
@@ -57,6 +66,98 @@ def get_graph_headers():
     }
 
 
+def get_graph_session(pool_size=10):
+    """
+    Get a requests Session with a connection pool sized for concurrent use.
+    Auth headers are not attached; pass get_graph_headers() per request so
+    long-running callers pick up refreshed tokens.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    return session
+
+
+def graph_get(session, url, params=None, retries=5, timeout=30):
+    """
+    GET a Graph URL, retrying throttled (429) and transient 5xx responses
+    with Retry-After / exponential backoff. Returns the final response.
+    """
+    for attempt in range(retries + 1):
+        response = session.get(url, headers=get_graph_headers(), params=params, timeout=timeout)
+        if response.status_code not in (429, 500, 502, 503, 504) or attempt == retries:
+            return response
+        retry_after = response.headers.get("Retry-After")
+        delay = float(retry_after) if retry_after and retry_after.isdigit() else min(2 ** attempt, 30)
+        time.sleep(delay)
+    return response
+
+
+def iter_graph_pages(session, url, params=None):
+    """
+    Yield every item of a Graph collection, following @odata.nextLink.
+    Raises RuntimeError on a non-200 page.
+    """
+    while url:
+        response = graph_get(session, url, params=params)
+        if response.status_code != 200:
+            raise RuntimeError(f"Graph GET {url} failed: {response.status_code} {response.text[:300]}")
+        data = response.json()
+        yield from data.get("value", [])
+        # nextLink already carries the query string
+        url = data.get("@odata.nextLink")
+        params = None
+
+
+GRAPH_BATCH_LIMIT = 20  # requests per JSON $batch
+
+
+def graph_batch(session, urls, retries=5, timeout=60, parse_float=float):
+    """
+    GET up to GRAPH_BATCH_LIMIT relative Graph URLs (e.g. "/users/{id}/events/{id}")
+    in one $batch request. Throttled (429) and transient 5xx sub-responses are
+    retried after the longest Retry-After. Returns a list of (status, body)
+    in the order of urls; a failed $batch POST yields its status for every URL.
+    """
+    if len(urls) > GRAPH_BATCH_LIMIT:
+        raise ValueError(f"$batch takes at most {GRAPH_BATCH_LIMIT} requests, got {len(urls)}")
+    results = [None] * len(urls)
+    pending = list(range(len(urls)))
+    for attempt in range(retries + 1):
+        payload = {"requests": [{"id": str(i), "method": "GET", "url": urls[i]} for i in pending]}
+        response = session.post("https://graph.microsoft.com/v1.0/$batch", headers=get_graph_headers(),
+                                json=payload, timeout=timeout)
+        delays = []
+        if response.status_code == 200:
+            retry = []
+            for sub in response.json(parse_float=parse_float).get("responses", []):
+                i = int(sub["id"])
+                results[i] = (sub.get("status", 0), sub.get("body"))
+                if sub.get("status") in (429, 500, 502, 503, 504):
+                    retry.append(i)
+                    retry_after = (sub.get("headers") or {}).get("Retry-After")
+                    if retry_after and str(retry_after).isdigit():
+                        delays.append(float(retry_after))
+            pending = retry
+        elif response.status_code in (429, 500, 502, 503, 504):
+            for i in pending:
+                results[i] = (response.status_code, None)
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                delays.append(float(retry_after))
+        else:
+            for i in pending:
+                results[i] = (response.status_code, None)
+            pending = []
+        if not pending or attempt == retries:
+            break
+        time.sleep(max(delays) if delays else min(2 ** attempt, 30))
+    return [result or (0, None) for result in results]
+
+
 def get_config():
     """Load configuration from environment"""
     load_dotenv('.env.local.azure')
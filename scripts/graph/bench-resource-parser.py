@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for graph_resources against the old split()/index() parser.
+
+Generates a realistic mix of event, transcript (plain, OData-key and
+getAllTranscripts forms), recording and callRecord resource paths, checks
+that every one is recognized, then times parse_resource against the legacy
+parser on all paths, and parse_resource and the transcript_path_ids fast
+path against it on the plain transcript paths the legacy parser handles.
+
+Usage:
+    python bench-resource-parser.py                 # 1,000,000 paths
+    python bench-resource-parser.py --count 5000000 --repeat 3
+"""
+
+import argparse
+import random
+import sys
+import time
+import uuid
+
+from graph_resources import UNKNOWN, parse_resource, transcript_path_ids
+
+
+def legacy_parse(resource: str):
+    """The split()/list.index() approach previously used in process_transcript_notification."""
+    parts = resource.split('/')
+    if 'users' in parts and 'transcripts' in parts:
+        user_idx = parts.index('users')
+        transcript_idx = parts.index('transcripts')
+        user_id = parts[user_idx + 1] if user_idx + 1 < len(parts) else None
+        transcript_id = parts[transcript_idx + 1] if transcript_idx + 1 < len(parts) else None
+        meeting_id = None
+        if 'onlineMeetings' in parts:
+            meeting_idx = parts.index('onlineMeetings')
+            meeting_id = parts[meeting_idx + 1] if meeting_idx + 1 < len(parts) else None
+        elif 'adhocCalls' in parts:
+            call_idx = parts.index('adhocCalls')
+            meeting_id = parts[call_idx + 1] if call_idx + 1 < len(parts) else None
+        return user_id, meeting_id, transcript_id
+    return None
+
+
+def generate_paths(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    users = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(200)]
+    templates = [
+        "Users/{u}/Events/AAMkA{a}=",
+        "users/{u}/onlineMeetings/MSo{a}/transcripts/MSM{b}",
+        "users/{u}/adhocCalls/{a}/transcripts/{b}",
+        "communications/onlineMeetings('MSo{a}')/transcripts('MSM{b}')",
+        "users/{u}/onlineMeetings/getAllTranscripts(meetingOrganizerUserId='{u}')/MSM{b}",
+        "communications/onlineMeetings/getAllRecordings(meetingOrganizerUserId='{u}')('{b}')",
+        "users/{u}/onlineMeetings/MSo{a}/recordings/{b}",
+        "communications/callRecords/{a}",
+    ]
+    # Calendar events dominate real traffic
+    weights = [60, 10, 2, 8, 8, 4, 4, 4]
+    chosen = rng.choices(templates, weights=weights, k=count)
+    return [
+        t.format(u=rng.choice(users), a=rng.getrandbits(64), b=rng.getrandbits(64))
+        for t in chosen
+    ]
+
+
+def bench(label, fn, paths, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(paths)
+        best = min(best, time.perf_counter() - started)
+    rate = len(paths) / best
+    print(f"  {label:32s} {best:7.3f}s  {rate / 1e6:6.2f} M paths/s  {best / len(paths) * 1e9:7.0f} ns/path")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Graph resource-path parsing")
+    parser.add_argument("--count", type=int, default=1_000_000, help="Number of paths (default: 1,000,000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of repeats (default: 3)")
+    args = parser.parse_args()
+
+    print(f"Generating {args.count:,} resource paths...")
+    paths = generate_paths(args.count)
+
+    unknown = sum(1 for p in paths[:10000] if parse_resource(p).kind == UNKNOWN)
+    if unknown:
+        print(f"❌ {unknown} generated paths were not recognized")
+        return 1
+    for p in paths[:10000]:
+        fast = transcript_path_ids(p)
+        parsed = parse_resource(p)
+        if fast is not None and fast != (parsed.user_id, parsed.container, parsed.meeting_id, parsed.id):
+            print(f"❌ transcript_path_ids disagrees with parse_resource on {p}")
+            return 1
+
+    # The legacy parser only understands plain users/.../transcripts/... paths
+    # and bails out early on everything else, so compare on that subset too.
+    plain = [p for p in paths if p.startswith("users/") and "/transcripts/" in p]
+
+    print(f"\nAll kinds, {len(paths):,} paths (best of {args.repeat}):")
+    bench("legacy split/index", lambda ps: [legacy_parse(p) for p in ps], paths, args.repeat)
+    bench("parse_resource", lambda ps: [parse_resource(p) for p in ps], paths, args.repeat)
+
+    print(f"\nPlain transcript paths only, {len(plain):,} paths:")
+    legacy_plain = bench("legacy split/index", lambda ps: [legacy_parse(p) for p in ps], plain, args.repeat)
+    new_plain = bench("parse_resource", lambda ps: [parse_resource(p) for p in ps], plain, args.repeat)
+    fast_plain = bench("transcript_path_ids", lambda ps: [transcript_path_ids(p) for p in ps], plain, args.repeat)
+
+    recognized_legacy = sum(1 for p in paths[:100000] if legacy_parse(p))
+    recognized_new = sum(1 for p in paths[:100000] if parse_resource(p).kind != UNKNOWN)
+    print(f"\nRecognized (first 100k): legacy {recognized_legacy:,}, graph_resources {recognized_new:,}")
+    print(f"Transcript subset: parse_resource is {legacy_plain / new_plain:.2f}x, "
+          f"transcript_path_ids {legacy_plain / fast_plain:.2f}x the legacy speed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
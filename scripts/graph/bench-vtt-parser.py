@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Benchmark vtt_parser against the old split()-based parse_transcript_vtt.
+
+Generates Teams-style multi-hour transcripts (cue identifiers, <v Speaker>
+voice tags, some multi-line cues) at several sizes, then measures:
+- parse time per size, to show time grows linearly with cue count
+- peak Python memory while streaming the file from disk vs loading it
+  into a string and building the legacy list of dicts
+- retained memory of the parsed result: legacy list of dicts vs
+  CompactTranscript columns
+
+Usage:
+    python bench-vtt-parser.py                      # up to 100,000 cues
+    python bench-vtt-parser.py --cues 400000 --repeat 3
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+
+from compact_transcript import CompactTranscript
+from vtt_parser import format_timestamp, iter_cues, iter_cues_from_path
+
+SPEAKERS = ["Alice Smith", "Bob Jones", "Carol Nguyen", "Dave O'Brien", "Eve Martínez", "Frank Li"]
+WORDS = ("the we should ship next sprint budget review customer latency dashboard "
+         "action item follow up agreed blocker deploy rollback metrics team").split()
+
+# Malformed input the parser must skip rather than raise on: (content, expected cue texts)
+EDGE_CASES = [
+    ("WEBVTT\n\n1\n00:00:01.000 -->\nhello\n\n2\n00:00:02.000 --> 00:00:03.000\nok\n", ["ok"]),
+    ("WEBVTT\n\n00:00:01.000 --> 00:00:0\nhello\n\n00:00:02.000 --> 00:00:03.000\nok\n", ["ok"]),
+    ("WEBVTT\n\n-->\nhello\n\n00:00:02.000 --> 00:00:03.000\nok", ["ok"]),
+]
+
+
+def legacy_parse(vtt_content: str) -> list:
+    """The split()/index-walking parser previously in 05-fetch-transcript."""
+    lines = vtt_content.split('\n')
+    entries = []
+    i = 0
+    while i < len(lines):
+        line = lines[i].strip()
+        if line.startswith('WEBVTT') or not line:
+            i += 1
+            continue
+        if '-->' in line:
+            parts = line.split(' --> ')
+            if len(parts) == 2:
+                entry = {'start': parts[0].strip(), 'end': parts[1].strip(), 'text': ''}
+                i += 1
+                text_lines = []
+                while i < len(lines) and lines[i].strip() and '-->' not in lines[i]:
+                    text_lines.append(lines[i].strip())
+                    i += 1
+                entry['text'] = ' '.join(text_lines)
+                if entry['text']:
+                    entries.append(entry)
+                continue
+        i += 1
+    return entries
+
+
+def write_transcript(path: str, cues: int, seed: int = 7) -> int:
+    """Write a synthetic Teams transcript; returns its size in bytes."""
+    rng = random.Random(seed)
+    session = uuid.UUID(int=rng.getrandbits(128))
+    t = 0
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        f.write("WEBVTT\n\n")
+        for n in range(cues):
+            start = t + rng.randint(0, 400)
+            end = start + rng.randint(800, 6000)
+            t = end
+            speaker = rng.choice(SPEAKERS)
+            f.write(f"{session}/{n}-0\n{format_timestamp(start)} --> {format_timestamp(end)}\n")
+            lines = 2 if rng.random() < 0.2 else 1
+            for _ in range(lines):
+                words = " ".join(rng.choices(WORDS, k=rng.randint(4, 14)))
+                f.write(f"<v {speaker}>{words}</v>\n")
+            f.write("\n")
+    return os.path.getsize(path)
+
+
+def time_best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def peak_memory(fn) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def retained_memory(fn) -> int:
+    """Bytes still allocated after fn() returns, while its result is alive."""
+    tracemalloc.start()
+    try:
+        result = fn()
+        current = tracemalloc.get_traced_memory()[0]
+        del result
+        return current
+    finally:
+        tracemalloc.stop()
+
+
+def consume(iterator) -> int:
+    count = 0
+    for _ in iterator:
+        count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the streaming WebVTT parser")
+    parser.add_argument("--cues", type=int, default=100_000, help="Largest transcript size (default: 100,000)")
+    parser.add_argument("--steps", type=int, default=4, help="Number of sizes up to --cues (default: 4)")
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of repeats (default: 3)")
+    args = parser.parse_args()
+
+    for content, expected in EDGE_CASES:
+        texts = [cue.text for cue in iter_cues(content)]
+        if texts != expected:
+            print(f"❌ Edge case {content!r}: parsed {texts}, expected {expected}")
+            return 1
+
+    sizes = [args.cues * (i + 1) // args.steps for i in range(args.steps)]
+    workdir = tempfile.mkdtemp(prefix="vtt-bench-")
+    results = []
+
+    print(f"{'cues':>9} {'MiB':>7} {'hours':>6} {'stream s':>9} {'ns/cue':>7} {'legacy s':>9} "
+          f"{'stream peak':>12} {'legacy peak':>12}")
+    for cues in sizes:
+        path = os.path.join(workdir, f"{cues}.vtt")
+        size = write_transcript(path, cues)
+
+        parsed = consume(iter_cues_from_path(path))
+        with open(path, encoding="utf-8") as f:
+            legacy_count = len(legacy_parse(f.read()))
+        if parsed != cues or legacy_count != cues:
+            print(f"❌ Parsed {parsed} (legacy {legacy_count}) cues, expected {cues}")
+            return 1
+
+        def run_legacy():
+            with open(path, encoding="utf-8") as f:
+                return legacy_parse(f.read())
+
+        stream_s = time_best(lambda: consume(iter_cues_from_path(path)), args.repeat)
+        legacy_s = time_best(run_legacy, args.repeat)
+        stream_peak = peak_memory(lambda: consume(iter_cues_from_path(path)))
+        legacy_peak = peak_memory(run_legacy)
+        last = None
+        for last in iter_cues_from_path(path):
+            pass
+        hours = last.end_ms / 3_600_000
+
+        results.append((cues, stream_s))
+        print(f"{cues:>9,} {size / 1048576:>7.1f} {hours:>6.1f} {stream_s:>9.3f} {stream_s / cues * 1e9:>7.0f} "
+              f"{legacy_s:>9.3f} {stream_peak / 1024:>10.0f}Ki {legacy_peak / 1048576:>10.1f}Mi")
+        if cues == sizes[-1]:
+            legacy_kept = retained_memory(run_legacy)
+            compact_kept = retained_memory(lambda: CompactTranscript.from_vtt(path))
+        os.remove(path)
+
+    os.rmdir(workdir)
+
+    # Linear time: ns/cue should stay flat as the transcript grows
+    small_cues, small_s = results[0]
+    large_cues, large_s = results[-1]
+    scaling = (large_s / large_cues) / (small_s / small_cues)
+    print(f"\nPer-cue cost, largest vs smallest: {scaling:.2f}x (1.00 = perfectly linear)")
+    print("Streaming peak memory is bounded by one read chunk plus one cue; "
+          "legacy peak grows with the whole transcript.")
+    print(f"Parsed result for {sizes[-1]:,} cues: list of dicts {legacy_kept / 1048576:.1f} MiB "
+          f"({legacy_kept / sizes[-1]:.0f} B/cue), CompactTranscript {compact_kept / 1048576:.1f} MiB "
+          f"({compact_kept / sizes[-1]:.0f} B/cue)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
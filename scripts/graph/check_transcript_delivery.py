@@ -1,6 +1,18 @@
 #!/usr/bin/env python3
+import argparse
 import boto3
 import json
+import os
+
+from transcript_readiness import ReadinessModel
+
+parser = argparse.ArgumentParser(description='Check whether transcript notifications are reaching S3')
+parser.add_argument('--readiness-db', metavar='PATH', default=os.getenv('TRANSCRIPT_READINESS_DB'),
+                    help='Report the delays 04-poll-transcription.py --readiness-db recorded here '
+                         '(default: $TRANSCRIPT_READINESS_DB)')
+parser.add_argument('--tenant', default=os.getenv('GRAPH_TENANT_ID', 'default'),
+                    help='Tenant key for --readiness-db (default: GRAPH_TENANT_ID)')
+args = parser.parse_args()
 
 s3 = boto3.client('s3', region_name='us-east-1', profile_name='tmf-dev')
 
@@ -48,7 +60,18 @@ if transcript_count == 0:
     print(f"   Last calendar event was at: 2026-02-13T02:18:51")
     print(f"   Meeting ended at: 2026-02-13T00:19:46")
     print(f"   Time elapsed: ~1h 59m")
-    print(f"\n   Expected behavior: Transcript should arrive within 5-30 minutes after meeting ends")
+    summary = None
+    if args.readiness_db and os.path.exists(args.readiness_db):
+        with ReadinessModel(args.readiness_db) as readiness:
+            summary = readiness.summary(args.tenant)
+    if summary:
+        print(f"\n   Expected behavior: Transcript should arrive within {summary['p50'] / 60:.0f} min (median) - "
+              f"{summary['p90'] / 60:.0f} min (p90) after meeting ends "
+              f"(observed over {summary['samples']} meetings, max {summary['max'] / 60:.0f} min)")
+    else:
+        print(f"\n   Expected behavior: Transcript should arrive within 5-30 minutes after meeting ends "
+              f"(no observed delays; collect them with 04-poll-transcription.py --readiness-db "
+              f"and pass the same --readiness-db here)")
     print(f"   Possible issues:")
     print(f"   1. Meeting recording may not have completed successfully")
     print(f"   2. Transcript subscription may not be active")
@@ -0,0 +1,296 @@
+"""
+Compact Transcript
+Array-backed, mmap-able in-memory representation of a parsed transcript
+
+A list of cue dicts costs several hundred bytes of Python objects per cue.
+CompactTranscript stores the same data column-wise:
+
+    starts, ends     array('I')  cue start/end in milliseconds
+    speaker_ids      array('h')  index into ``speakers`` (-1 = no speaker)
+    offsets          array('I')  n+1 byte offsets into ``text``
+    text             bytes       every cue's UTF-8 text, concatenated
+
+so a cue costs 14 bytes plus its text. Cues are kept sorted by start time and
+time-range queries use bisect. ``save()`` writes a little-endian binary file
+whose columns ``open()`` maps straight back from disk without copying.
+
+File layout (all integers little-endian):
+
+    header      <8sHHIIII  magic, version, reserved, cue count,
+                           speaker block bytes, text bytes, max cue duration
+    meeting id  <H length + UTF-8
+    speakers    <H count, then <H length + UTF-8 per speaker
+    padding     to a 4-byte boundary
+    starts, ends, offsets (n+1), speaker_ids, padding, text
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Iterator, List, Optional
+
+from vtt_parser import Cue, iter_cues, iter_cues_from_path
+
+MAGIC = b"TMFCT\x00\x00\x01"
+VERSION = 1
+_HEADER = struct.Struct("<8sHHIIII")
+_U16 = struct.Struct("<H")
+NO_SPEAKER = -1
+
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+assert array("I").itemsize == 4 and array("h").itemsize == 2
+
+
+def _align4(n: int) -> int:
+    return (n + 3) & ~3
+
+
+class CompactTranscript:
+    """Column-oriented transcript. Build with from_cues/from_vtt, or load/open a saved file."""
+
+    __slots__ = ("meeting_id", "starts", "ends", "speaker_ids", "speakers",
+                 "offsets", "text", "max_duration_ms", "_mmap", "_file")
+
+    def __init__(self, meeting_id: Optional[str], starts, ends, speaker_ids, speakers: List[str],
+                 offsets, text, max_duration_ms: int = 0, _mmap=None, _file=None):
+        self.meeting_id = meeting_id
+        self.starts = starts
+        self.ends = ends
+        self.speaker_ids = speaker_ids
+        self.speakers = speakers
+        self.offsets = offsets
+        self.text = text
+        self.max_duration_ms = max_duration_ms
+        self._mmap = _mmap
+        self._file = _file
+
+    # ---- construction ----------------------------------------------------
+
+    @classmethod
+    def from_cues(cls, cues: Iterable[Cue], meeting_id: Optional[str] = None) -> "CompactTranscript":
+        """Build from Cue records (e.g. vtt_parser.iter_cues) in a single pass."""
+        starts, ends = array("I"), array("I")
+        speaker_ids = array("h")
+        offsets = array("I", [0])
+        text = bytearray()
+        speakers: List[str] = []
+        speaker_index = {}
+        ordered = True
+        last_start = 0
+        max_duration = 0
+
+        for cue in cues:
+            start, end = cue.start_ms, max(cue.end_ms, cue.start_ms)
+            if start < last_start:
+                ordered = False
+            last_start = start
+            if end - start > max_duration:
+                max_duration = end - start
+
+            sid = NO_SPEAKER
+            if cue.speaker is not None:
+                sid = speaker_index.get(cue.speaker)
+                if sid is None:
+                    sid = speaker_index[cue.speaker] = len(speakers)
+                    speakers.append(cue.speaker)
+
+            starts.append(start)
+            ends.append(end)
+            speaker_ids.append(sid)
+            text += cue.text.encode("utf-8")
+            offsets.append(len(text))
+
+        transcript = cls(meeting_id, starts, ends, speaker_ids, speakers, offsets, bytes(text), max_duration)
+        return transcript if ordered else transcript._sorted()
+
+    @classmethod
+    def from_vtt(cls, source, meeting_id: Optional[str] = None) -> "CompactTranscript":
+        """Parse WebVTT from a path (.vtt / .vtt.gz) or any vtt_parser source."""
+        if isinstance(source, (str, os.PathLike)) and os.path.exists(source):
+            return cls.from_cues(iter_cues_from_path(os.fspath(source)), meeting_id)
+        return cls.from_cues(iter_cues(source), meeting_id)
+
+    def _sorted(self) -> "CompactTranscript":
+        order = sorted(range(len(self)), key=self.starts.__getitem__)
+        return CompactTranscript.from_cues((self[i] for i in order), self.meeting_id)
+
+    # ---- access ----------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, i: int) -> Cue:
+        if i < 0:
+            i += len(self)
+        sid = self.speaker_ids[i]
+        text = bytes(self.text[self.offsets[i]:self.offsets[i + 1]]).decode("utf-8")
+        return Cue(self.starts[i], self.ends[i], self.speakers[sid] if sid >= 0 else None, text)
+
+    def __iter__(self) -> Iterator[Cue]:
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def duration_ms(self) -> int:
+        return max(self.ends) if len(self) else 0
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate payload size (columns + text), excluding fixed object overhead."""
+        columns = (self.starts, self.ends, self.offsets, self.speaker_ids)
+        return sum(len(c) * c.itemsize for c in columns) + len(self.text)
+
+    # ---- time-range queries -------------------------------------------------
+
+    def index_range(self, start_ms: int, end_ms: int) -> range:
+        """
+        Indices of cues that may overlap [start_ms, end_ms).
+
+        Cues are sorted by start, so the upper bound is one bisect. Cues can
+        overlap, so the lower bound bisects start_ms - max_duration_ms; use
+        cues_between() for the exact filtered result.
+        """
+        lo = bisect_left(self.starts, max(0, start_ms - self.max_duration_ms))
+        hi = bisect_left(self.starts, end_ms)
+        return range(lo, hi)
+
+    def cues_between(self, start_ms: int, end_ms: int) -> Iterator[Cue]:
+        """Yield cues overlapping [start_ms, end_ms)."""
+        ends = self.ends
+        for i in self.index_range(start_ms, end_ms):
+            if ends[i] > start_ms:
+                yield self[i]
+
+    def index_at(self, ms: int) -> int:
+        """Index of the last cue starting at or before ms (-1 if none)."""
+        return bisect_left(self.starts, ms + 1) - 1
+
+    def slice(self, start_ms: int, end_ms: int) -> "CompactTranscript":
+        """A new (copied) CompactTranscript holding the cues overlapping [start_ms, end_ms)."""
+        return CompactTranscript.from_cues(self.cues_between(start_ms, end_ms), self.meeting_id)
+
+    def to_numpy(self) -> dict:
+        """Zero-copy NumPy views of the columns (requires numpy)."""
+        import numpy as np
+        return {
+            "starts": np.frombuffer(self.starts, dtype=np.uint32),
+            "ends": np.frombuffer(self.ends, dtype=np.uint32),
+            "speaker_ids": np.frombuffer(self.speaker_ids, dtype=np.int16),
+            "offsets": np.frombuffer(self.offsets, dtype=np.uint32),
+        }
+
+    # ---- serialization --------------------------------------------------
+
+    def _speaker_block(self) -> bytes:
+        parts = [_U16.pack(len(self.speakers))]
+        for speaker in self.speakers:
+            encoded = speaker.encode("utf-8")
+            parts.append(_U16.pack(len(encoded)))
+            parts.append(encoded)
+        return b"".join(parts)
+
+    def save(self, path: str) -> int:
+        """Write the binary file atomically. Returns its size in bytes."""
+        meeting = (self.meeting_id or "").encode("utf-8")
+        speaker_block = self._speaker_block()
+        header = _HEADER.pack(MAGIC, VERSION, 0, len(self), len(speaker_block),
+                              len(self.text), self.max_duration_ms)
+        preamble = header + _U16.pack(len(meeting)) + meeting + speaker_block
+        preamble += b"\x00" * (_align4(len(preamble)) - len(preamble))
+
+        partial = path + ".part"
+        with open(partial, "wb") as f:
+            f.write(preamble)
+            for column in (self.starts, self.ends, self.offsets, self.speaker_ids):
+                if not _LITTLE_ENDIAN:
+                    column = array(column.typecode if isinstance(column, array) else column.format, column)
+                    column.byteswap()
+                f.write(column.tobytes())
+            if len(self.speaker_ids) % 2:
+                f.write(b"\x00\x00")
+            f.write(self.text)
+        os.replace(partial, path)
+        return os.path.getsize(path)
+
+    @classmethod
+    def _from_buffer(cls, buf, copy: bool, _mmap=None, _file=None) -> "CompactTranscript":
+        magic, version, _, n, speaker_bytes, text_bytes, max_duration = _HEADER.unpack_from(buf, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a compact transcript file (bad magic or version)")
+        pos = _HEADER.size
+        (meeting_len,) = _U16.unpack_from(buf, pos)
+        pos += 2
+        meeting_id = bytes(buf[pos:pos + meeting_len]).decode("utf-8") or None
+        pos += meeting_len
+
+        (speaker_count,) = _U16.unpack_from(buf, pos)
+        speakers, p = [], pos + 2
+        for _ in range(speaker_count):
+            (length,) = _U16.unpack_from(buf, p)
+            speakers.append(sys.intern(bytes(buf[p + 2:p + 2 + length]).decode("utf-8")))
+            p += 2 + length
+        pos = _align4(pos + speaker_bytes)
+
+        view = memoryview(buf)
+        columns = []
+        for typecode, count in (("I", n), ("I", n), ("I", n + 1), ("h", n)):
+            size = count * (4 if typecode == "I" else 2)
+            raw = view[pos:pos + size]
+            if copy or not _LITTLE_ENDIAN:
+                column = array(typecode)
+                column.frombytes(raw)
+                if not _LITTLE_ENDIAN:
+                    column.byteswap()
+            else:
+                column = raw.cast(typecode)
+            columns.append(column)
+            pos += size
+        pos = _align4(pos)
+        text = bytes(view[pos:pos + text_bytes]) if copy else view[pos:pos + text_bytes]
+
+        starts, ends, offsets, speaker_ids = columns
+        return cls(meeting_id, starts, ends, speaker_ids, speakers, offsets, text, max_duration, _mmap, _file)
+
+    @classmethod
+    def load(cls, path: str) -> "CompactTranscript":
+        """Read a saved file fully into memory."""
+        with open(path, "rb") as f:
+            return cls._from_buffer(f.read(), copy=True)
+
+    @classmethod
+    def open(cls, path: str) -> "CompactTranscript":
+        """
+        Memory-map a saved file. Columns are zero-copy views; only pages that
+        are touched are read. Call close() (or use as a context manager) when done.
+        """
+        f = open(path, "rb")
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            f.close()
+            raise
+        return cls._from_buffer(mapped, copy=False, _mmap=mapped, _file=f)
+
+    def close(self):
+        if self._mmap is not None:
+            # Views must be released before the map can be closed
+            for name in ("starts", "ends", "offsets", "speaker_ids", "text"):
+                value = getattr(self, name)
+                if isinstance(value, memoryview):
+                    value.release()
+            self._mmap.close()
+            self._file.close()
+            self._mmap = self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self) -> str:
+        return (f"CompactTranscript(meeting_id={self.meeting_id!r}, cues={len(self)}, "
+                f"speakers={len(self.speakers)}, nbytes={self.nbytes})")
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Convert fetched .vtt transcripts to columnar files on all cores.
+
+Input files (.vtt / .vtt.gz, found recursively) are split into parts of
+--files-per-part files. Each part is parsed and written by its own worker
+process, so throughput scales with cores and the parent only collects
+statistics. One row per cue:
+
+    transcript_id, meeting_id, organizer, created, cue_index,
+    start_ms, end_ms, speaker, text
+
+Meeting metadata comes from the manifest.ndjson that export-transcripts.py
+writes next to the files, when there is one.
+
+Formats:
+    parquet  part-00000.parquet, ... (requires pyarrow)
+    arrow    part-00000.arrow Arrow IPC files (requires pyarrow)
+    tct      one CompactTranscript file per transcript (no dependencies)
+
+Usage:
+    python convert-vtt-columnar.py ./export -o ./columnar
+    python convert-vtt-columnar.py ./transcripts -o ./columnar --format arrow -j 8
+
+    # Files/s and MB/s at 1, 2, 4, ... workers
+    python convert-vtt-columnar.py ./export --bench
+"""
+
+import argparse
+import glob
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from compact_transcript import CompactTranscript
+from transcript_index import TRANSCRIPT_SUFFIXES
+from vtt_parser import iter_cues_from_path
+
+DEFAULT_FILES_PER_PART = 100
+FORMATS = ("parquet", "arrow", "tct")
+# Unreadable transcript: missing, undecodable, or a truncated/corrupt .vtt.gz
+READ_ERRORS = (OSError, UnicodeDecodeError, EOFError, zlib.error)
+COLUMNS = ("transcript_id", "meeting_id", "organizer", "created", "cue_index",
+           "start_ms", "end_ms", "speaker", "text")
+
+
+def transcript_name(path: str) -> str:
+    name = os.path.basename(path)
+    for suffix in TRANSCRIPT_SUFFIXES:
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+def load_manifests(directories: list) -> dict:
+    """transcript_id -> export manifest record, from every manifest.ndjson under the inputs."""
+    metadata = {}
+    for directory in directories:
+        path = os.path.join(directory, "manifest.ndjson")
+        if not os.path.isfile(path):
+            continue
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get("status") == "ok":
+                    metadata[record["transcript_id"]] = record
+    return metadata
+
+
+def find_transcripts(inputs: list) -> list:
+    """(path, size) for every transcript file under the inputs, largest first."""
+    found = []
+    for item in inputs:
+        if os.path.isfile(item):
+            found.append((item, os.path.getsize(item)))
+            continue
+        for root, _, files in os.walk(item):
+            for filename in files:
+                if filename.endswith(TRANSCRIPT_SUFFIXES):
+                    path = os.path.join(root, filename)
+                    found.append((path, os.path.getsize(path)))
+    # Largest first so one huge transcript does not finish last on its own
+    found.sort(key=lambda item: -item[1])
+    return found
+
+
+def make_parts(files: list, metadata: dict, files_per_part: int) -> list:
+    """Deal files round-robin into parts of roughly equal total size."""
+    count = max(1, -(-len(files) // files_per_part))
+    parts = [[] for _ in range(count)]
+    for i, (path, _) in enumerate(files):
+        name = transcript_name(path)
+        record = metadata.get(name, {})
+        meta = {
+            "transcript_id": name,
+            "meeting_id": record.get("meeting_id"),
+            "organizer": record.get("organizer"),
+            "created": record.get("created"),
+        }
+        parts[i % count].append((path, meta))
+    return parts
+
+
+def _columns_for(files: list, stats: dict) -> dict:
+    columns = {name: [] for name in COLUMNS}
+    for path, meta in files:
+        try:
+            cues = list(iter_cues_from_path(path))
+        except READ_ERRORS as e:
+            stats["errors"].append(f"{path}: {e}")
+            continue
+        n = len(cues)
+        for key in ("transcript_id", "meeting_id", "organizer", "created"):
+            columns[key].extend([meta[key]] * n)
+        columns["cue_index"].extend(range(n))
+        columns["start_ms"].extend(c.start_ms for c in cues)
+        columns["end_ms"].extend(c.end_ms for c in cues)
+        columns["speaker"].extend(c.speaker for c in cues)
+        columns["text"].extend(c.text for c in cues)
+        stats["files"] += 1
+        stats["cues"] += n
+        stats["bytes"] += os.path.getsize(path)
+    return columns
+
+
+def _write_pyarrow(columns: dict, path: str, fmt: str, compression: str) -> None:
+    import pyarrow as pa
+
+    schema = pa.schema([
+        ("transcript_id", pa.dictionary(pa.int32(), pa.string())),
+        ("meeting_id", pa.dictionary(pa.int32(), pa.string())),
+        ("organizer", pa.dictionary(pa.int32(), pa.string())),
+        ("created", pa.string()),
+        ("cue_index", pa.int32()),
+        ("start_ms", pa.uint32()),
+        ("end_ms", pa.uint32()),
+        ("speaker", pa.dictionary(pa.int32(), pa.string())),
+        ("text", pa.string()),
+    ], metadata={"generator": "convert-vtt-columnar"})
+    table = pa.table(columns, schema=schema)
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        pq.write_table(table, path, compression=compression)
+    else:
+        with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+            writer.write_table(table)
+
+
+def convert_part(index: int, files: list, out_dir: str, fmt: str, compression: str) -> dict:
+    """Worker: parse one part's files and write its output. Returns statistics."""
+    started = time.perf_counter()
+    stats = {"part": index, "files": 0, "cues": 0, "bytes": 0, "errors": [], "output": None}
+
+    if fmt == "tct":
+        for path, meta in files:
+            try:
+                transcript = CompactTranscript.from_vtt(path, meta["meeting_id"])
+                transcript.save(os.path.join(out_dir, f"{meta['transcript_id']}.tct"))
+            except READ_ERRORS as e:
+                stats["errors"].append(f"{path}: {e}")
+                continue
+            stats["files"] += 1
+            stats["cues"] += len(transcript)
+            stats["bytes"] += os.path.getsize(path)
+    else:
+        columns = _columns_for(files, stats)
+        if stats["files"]:
+            output = os.path.join(out_dir, f"part-{index:05d}.{fmt}")
+            partial = output + ".part"
+            _write_pyarrow(columns, partial, fmt, compression)
+            os.replace(partial, output)
+            stats["output"] = output
+
+    stats["seconds"] = time.perf_counter() - started
+    return stats
+
+
+def remove_stale_parts(out_dir: str, fmt: str) -> int:
+    """Delete part files an earlier run left in out_dir, so readers do not count them twice."""
+    stale = glob.glob(os.path.join(glob.escape(out_dir), f"part-*.{fmt}"))
+    stale += glob.glob(os.path.join(glob.escape(out_dir), f"part-*.{fmt}.part"))
+    for path in stale:
+        os.remove(path)
+    return len(stale)
+
+
+def convert(parts: list, out_dir: str, fmt: str, workers: int, compression: str = "zstd",
+            verbose: bool = True) -> dict:
+    """Convert every part on a pool of ``workers`` processes."""
+    os.makedirs(out_dir, exist_ok=True)
+    if fmt != "tct":
+        removed = remove_stale_parts(out_dir, fmt)
+        if removed and verbose:
+            print(f"   🧹 Removed {removed} part file(s) from an earlier run")
+    totals = {"files": 0, "cues": 0, "bytes": 0, "errors": [], "parts": 0}
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(convert_part, i, files, out_dir, fmt, compression)
+                   for i, files in enumerate(parts) if files]
+        for future in as_completed(futures):
+            stats = future.result()
+            totals["parts"] += 1
+            for key in ("files", "cues", "bytes"):
+                totals[key] += stats[key]
+            totals["errors"].extend(stats["errors"])
+            if verbose:
+                where = f" → {stats['output']}" if stats["output"] else ""
+                print(f"   ✅ Part {stats['part']}: {stats['files']} file(s), {stats['cues']:,} cues "
+                      f"in {stats['seconds']:.1f}s{where}")
+    totals["seconds"] = time.perf_counter() - started
+    return totals
+
+
+def throughput(totals: dict) -> tuple:
+    seconds = totals["seconds"] or 1e-9
+    return totals["files"] / seconds, totals["bytes"] / seconds / 1_000_000
+
+
+def run_bench(parts: list, fmt: str, max_workers: int, compression: str) -> int:
+    counts = []
+    n = 1
+    while n < max_workers:
+        counts.append(n)
+        n *= 2
+    counts.append(max_workers)
+
+    print(f"\n{'workers':>8} {'seconds':>9} {'files/s':>9} {'MB/s':>8} {'speedup':>8}")
+    baseline = None
+    for workers in counts:
+        out_dir = tempfile.mkdtemp(prefix="vtt-columnar-bench-")
+        try:
+            totals = convert(parts, out_dir, fmt, workers, compression, verbose=False)
+        finally:
+            shutil.rmtree(out_dir, ignore_errors=True)
+        files_per_s, mb_per_s = throughput(totals)
+        baseline = baseline or files_per_s
+        print(f"{workers:>8} {totals['seconds']:>9.2f} {files_per_s:>9.1f} {mb_per_s:>8.2f} "
+              f"{files_per_s / baseline:>7.2f}x")
+    print(f"\n{os.cpu_count()} CPU(s) available; speedup flattens once workers exceed cores or disk bandwidth.")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Convert .vtt transcripts to columnar files using all cores',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python convert-vtt-columnar.py ./export -o ./columnar
+  python convert-vtt-columnar.py ./transcripts -o ./columnar --format arrow -j 8
+  python convert-vtt-columnar.py ./transcripts -o ./compact --format tct
+  python convert-vtt-columnar.py ./export --bench
+        """
+    )
+    parser.add_argument('inputs', nargs='+', help='Directories (searched recursively) or .vtt/.vtt.gz files')
+    parser.add_argument('--output', '-o', help='Output directory')
+    parser.add_argument('--format', '-f', choices=FORMATS, default='parquet', help='Output format (default: parquet)')
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes (default: all CPUs)')
+    parser.add_argument('--files-per-part', type=int, default=DEFAULT_FILES_PER_PART,
+                        help=f'Transcripts per output part (default: {DEFAULT_FILES_PER_PART})')
+    parser.add_argument('--compression', default='zstd', help='Parquet compression codec (default: zstd)')
+    parser.add_argument('--bench', action='store_true', help='Report files/s and MB/s at 1, 2, 4, ... workers')
+    args = parser.parse_args()
+
+    if not args.bench and not args.output:
+        parser.error('--output is required unless --bench is given')
+    if args.format != 'tct':
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            print("❌ --format parquet/arrow needs pyarrow (pip install pyarrow), or use --format tct")
+            return 1
+
+    print("🧱 VTT → Columnar Converter")
+    print("=" * 80)
+    files = find_transcripts(args.inputs)
+    if not files:
+        print("❌ No .vtt / .vtt.gz files found")
+        return 1
+    metadata = load_manifests([i for i in args.inputs if os.path.isdir(i)])
+    # At least one part per worker, or some cores sit idle
+    files_per_part = max(1, min(args.files_per_part, -(-len(files) // args.jobs)))
+    parts = make_parts(files, metadata, files_per_part)
+    total_bytes = sum(size for _, size in files)
+    print(f"Input: {len(files):,} transcript(s), {total_bytes / 1_000_000:.1f} MB, "
+          f"{len(metadata):,} with manifest metadata")
+    print(f"Parts: {len(parts)} x ~{files_per_part} file(s), format {args.format}")
+
+    if args.bench:
+        return run_bench(parts, args.format, args.jobs, args.compression)
+
+    print(f"\n🔄 Converting with {args.jobs} worker process(es)...")
+    totals = convert(parts, args.output, args.format, args.jobs, args.compression)
+    files_per_s, mb_per_s = throughput(totals)
+
+    print(f"\n📊 Summary:")
+    print(f"   Transcripts: {totals['files']:,}/{len(files):,} ({totals['cues']:,} cues)")
+    print(f"   Wall time: {totals['seconds']:.1f}s")
+    print(f"   Throughput: {files_per_s:.1f} files/s, {mb_per_s:.2f} MB/s")
+    print(f"   Output: {args.output}")
+    for error in totals["errors"][:20]:
+        print(f"   ❌ {error}")
+    return 0 if not totals["errors"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
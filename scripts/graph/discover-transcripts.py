@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Org-wide incremental transcript discovery.
+
+Calls getAllTranscripts for every organizer in the monitored group and keeps
+a per-organizer createdDateTime watermark, so each sweep only asks Graph for
+transcripts created since the last one. Every page (@odata.nextLink) is
+followed, and organizers are swept concurrently over one pooled session.
+
+New transcripts are written as NDJSON change notifications, the same shape
+Graph posts to the webhook, so they can be piped straight into the
+downloader:
+
+    python discover-transcripts.py --ndjson - | \\
+        python process_transcript_notification.py --stream -o ./transcripts
+
+Usage:
+    # First sweep looks back --since days, later sweeps resume from the watermarks
+    python discover-transcripts.py --ndjson new-transcripts.ndjson
+
+    # Re-run every 10 minutes
+    python discover-transcripts.py --ndjson - --loop 600 | ...
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+
+from auth_helper import get_config, get_graph_session
+from org_transcripts import iso, iter_organizer_transcripts, list_organizers, parse_time
+
+DEFAULT_STATE = "transcript_watermarks.json"
+DEFAULT_WORKERS = 8
+
+# Transcripts can show up in getAllTranscripts a little after their
+# createdDateTime, so each sweep re-reads this window behind the watermark
+# and drops the IDs it has already reported.
+DEFAULT_OVERLAP_MINUTES = 15
+
+log_stream = sys.stdout
+
+
+def log(message: str = "") -> None:
+    print(message, file=log_stream, flush=True)
+
+
+def load_state(path: str) -> dict:
+    if not os.path.exists(path):
+        return {"organizers": {}}
+    with open(path, encoding="utf-8") as f:
+        state = json.load(f)
+    state.setdefault("organizers", {})
+    return state
+
+
+def save_state(path: str, state: dict) -> None:
+    """Write the watermark file atomically so an interrupted sweep never corrupts it."""
+    state["updated_at"] = iso(datetime.now(timezone.utc))
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def transcript_notification(organizer_id: str, transcript: dict) -> dict:
+    """A Graph-shaped change notification for one discovered transcript."""
+    meeting_id = transcript.get("meetingId")
+    transcript_id = transcript.get("id")
+    return {
+        "subscriptionId": "discover-transcripts",
+        "changeType": "created",
+        "resource": f"users/{organizer_id}/onlineMeetings/{meeting_id}/transcripts/{transcript_id}",
+        "resourceData": {
+            "id": transcript_id,
+            "meetingId": meeting_id,
+            "createdDateTime": transcript.get("createdDateTime"),
+            "endDateTime": transcript.get("endDateTime"),
+            "contentCorrelationId": transcript.get("contentCorrelationId"),
+        },
+    }
+
+
+def sweep_organizer(session, organizer: dict, entry: dict, default_start: datetime,
+                    overlap: timedelta) -> dict:
+    """
+    Page through getAllTranscripts for one organizer from its watermark.
+    Returns the new transcripts and the updated state entry; the caller
+    commits the entry only if the sweep succeeded.
+    """
+    organizer_id = organizer["id"]
+    watermark = parse_time(entry["watermark"]) if entry.get("watermark") else None
+    start = (watermark - overlap) if watermark else default_start
+    already_seen = set(entry.get("recent_ids", []))
+
+    started = time.perf_counter()
+    new, listed = [], []
+    for transcript in iter_organizer_transcripts(session, organizer_id, start):
+        listed.append(transcript)
+        if transcript.get("id") not in already_seen:
+            new.append(transcript)
+
+    created = [parse_time(t["createdDateTime"]) for t in listed if t.get("createdDateTime")]
+    new_watermark = max(created + ([watermark] if watermark else []), default=watermark)
+    # Remember IDs inside the next sweep's overlap window so they are not reported twice
+    recent_ids = sorted({
+        t["id"] for t in listed
+        if t.get("createdDateTime") and new_watermark
+        and parse_time(t["createdDateTime"]) >= new_watermark - overlap
+    })
+
+    updated = {
+        "upn": organizer.get("userPrincipalName") or organizer.get("mail"),
+        "watermark": iso(new_watermark) if new_watermark else None,
+        "recent_ids": recent_ids,
+        "last_sweep": iso(datetime.now(timezone.utc)),
+        "total_found": entry.get("total_found", 0) + len(new),
+    }
+    return {
+        "organizer_id": organizer_id,
+        "new": new,
+        "listed": len(listed),
+        "seconds": time.perf_counter() - started,
+        "entry": updated,
+    }
+
+
+def sweep(session, organizers: list, state: dict, state_path: str, workers: int,
+          default_start: datetime, overlap: timedelta, emit) -> dict:
+    """Sweep every organizer concurrently; returns counters for the run."""
+    summary = {"organizers": len(organizers), "listed": 0, "new": 0, "failed": 0, "unlicensed": 0}
+    lock = threading.Lock()
+    entries = state["organizers"]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(sweep_organizer, session, organizer, entries.get(organizer["id"], {}),
+                        default_start, overlap): organizer
+            for organizer in organizers
+        }
+        for future in as_completed(futures):
+            organizer = futures[future]
+            name = organizer.get("userPrincipalName") or organizer["id"]
+            try:
+                result = future.result()
+            except Exception as e:
+                # Users without a Teams license or policy answer 403/404; keep going
+                message = str(e)
+                if " 403 " in message or " 404 " in message:
+                    summary["unlicensed"] += 1
+                    log(f"   ⚠️  {name}: {message[:160]}")
+                else:
+                    summary["failed"] += 1
+                    log(f"   ❌ {name}: {message[:160]}")
+                continue
+
+            with lock:
+                for transcript in result["new"]:
+                    emit(transcript_notification(result["organizer_id"], transcript))
+                entries[result["organizer_id"]] = result["entry"]
+                summary["listed"] += result["listed"]
+                summary["new"] += len(result["new"])
+                save_state(state_path, state)
+
+            if result["new"]:
+                log(f"   ✅ {name}: {len(result['new'])} new transcript(s) "
+                    f"({result['listed']} listed, {result['seconds']:.1f}s)")
+    return summary
+
+
+def run_once(args, session, state: dict, emit) -> dict:
+    started = time.perf_counter()
+    log(f"\n🔍 Listing organizers in group {args.group_id}...")
+    organizers = list_organizers(session, args.group_id)
+    log(f"   {len(organizers)} organizer(s)")
+
+    default_start = datetime.now(timezone.utc) - timedelta(days=args.since)
+    overlap = timedelta(minutes=args.overlap)
+    summary = sweep(session, organizers, state, args.state, args.workers, default_start, overlap, emit)
+
+    elapsed = time.perf_counter() - started
+    log(f"\n📊 Sweep finished in {elapsed:.1f}s")
+    log(f"   Organizers: {summary['organizers']}")
+    log(f"   Transcripts listed: {summary['listed']}")
+    log(f"   New transcripts: {summary['new']}")
+    if summary["unlicensed"]:
+        log(f"   ⚠️  Skipped (403/404): {summary['unlicensed']}")
+    if summary["failed"]:
+        log(f"   ❌ Failed: {summary['failed']}")
+    return summary
+
+
+def main():
+    global log_stream
+
+    parser = argparse.ArgumentParser(
+        description='Discover new transcripts for every organizer in the monitored group',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python discover-transcripts.py --ndjson new.ndjson
+  python discover-transcripts.py --since 30 --workers 16 --ndjson -
+  python discover-transcripts.py --ndjson - --loop 600 | python process_transcript_notification.py --stream -o ./transcripts
+        """
+    )
+    parser.add_argument('--group-id', help='Group whose members are swept (default: ENTRA_GROUP_ID)')
+    parser.add_argument('--state', default=DEFAULT_STATE,
+                        help=f'Per-organizer watermark file (default: {DEFAULT_STATE})')
+    parser.add_argument('--ndjson', metavar='PATH',
+                        help='Append new transcripts as NDJSON notifications ("-" for stdout)')
+    parser.add_argument('--since', type=float, default=7,
+                        help='Days to look back for organizers without a watermark (default: 7)')
+    parser.add_argument('--overlap', type=float, default=DEFAULT_OVERLAP_MINUTES,
+                        help=f'Minutes re-read behind each watermark (default: {DEFAULT_OVERLAP_MINUTES})')
+    parser.add_argument('--workers', '-w', type=int, default=DEFAULT_WORKERS,
+                        help=f'Organizers swept concurrently (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--loop', type=float, metavar='SECONDS',
+                        help='Keep sweeping, sleeping this long between sweeps')
+    args = parser.parse_args()
+
+    args.group_id = args.group_id or get_config()['group_id']
+    if not args.group_id:
+        print("❌ No group: pass --group-id or set ENTRA_GROUP_ID", file=sys.stderr)
+        return 1
+
+    if args.ndjson == '-':
+        # Keep stdout clean for the NDJSON consumer
+        log_stream = sys.stderr
+        out = sys.stdout
+    elif args.ndjson:
+        out = open(args.ndjson, "a", encoding="utf-8")
+    else:
+        out = None
+
+    def emit(notification: dict) -> None:
+        if out is not None:
+            out.write(json.dumps(notification) + "\n")
+            out.flush()
+
+    log("🛰️  Transcript Discovery")
+    log("=" * 80)
+    state = load_state(args.state)
+    log(f"   State: {args.state} ({len(state['organizers'])} organizer watermark(s))")
+
+    session = get_graph_session(pool_size=args.workers)
+    failed = 0
+    try:
+        while True:
+            summary = run_once(args, session, state, emit)
+            failed = summary["failed"]
+            if not args.loop:
+                break
+            log(f"\n💤 Next sweep in {args.loop:.0f}s")
+            time.sleep(args.loop)
+    except KeyboardInterrupt:
+        log("\n⏹️  Interrupted; watermarks saved for completed organizers")
+    finally:
+        if out is not None and out is not sys.stdout:
+            out.close()
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Download Teams meeting recordings with parallel, resumable Range requests.
+
+Lists the meeting's recordings (or takes one recording ID) and downloads
+each with recording_downloader: the MP4 is fetched in chunks on several
+connections into a preallocated file, progress is kept in a sidecar next to
+it, and re-running the same command after an interruption fetches only the
+missing chunks.
+
+Usage:
+    python download-recording.py <user_email> <meeting_id> [recording_id] -o ./recordings
+    python download-recording.py user@contoso.com MSo... -o ./recordings -w 16 --chunk-mb 32
+"""
+
+import argparse
+import os
+import re
+import sys
+
+from auth_helper import get_graph_session, graph_get, iter_graph_pages
+from recording_downloader import DEFAULT_CHUNK_SIZE, DEFAULT_WORKERS, DownloadError, RangeDownloader
+
+GRAPH = "https://graph.microsoft.com/v1.0"
+
+
+def recording_filename(recording: dict) -> str:
+    """Stable file name, so a re-run finds the sidecar of an interrupted download."""
+    created = (recording.get('createdDateTime') or '')[:19].replace(':', '-')
+    rid = re.sub(r'[^A-Za-z0-9_-]', '_', recording['id'])[-40:]
+    return f"recording_{created}_{rid}.mp4" if created else f"recording_{rid}.mp4"
+
+
+def print_progress(state: dict):
+    elapsed = state['seconds'] or 1e-9
+    print(f"   ⏱️  {state['done']}/{state['chunks']} chunks, {state['fetched'] / 1048576:,.0f} MiB fetched "
+          f"({state['fetched'] / elapsed / 1048576:,.1f} MiB/s)", end='\r', flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Download meeting recordings with parallel, resumable Range requests',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Every recording of a meeting
+  python download-recording.py user@contoso.com MSo123...__ -o ./recordings
+
+  # One recording, 16 connections of 32 MiB chunks (re-run to resume)
+  python download-recording.py user@contoso.com MSo123...__ VjEjI... -o ./recordings -w 16 --chunk-mb 32
+        """
+    )
+    parser.add_argument('user_email', help='Meeting organizer (email or user ID)')
+    parser.add_argument('meeting_id', help='Online meeting ID')
+    parser.add_argument('recording_id', nargs='?', help='Recording ID (default: all recordings of the meeting)')
+    parser.add_argument('--output', '-o', default='.', help='Directory for recordings (default: .)')
+    parser.add_argument('--workers', '-w', type=int, default=DEFAULT_WORKERS,
+                        help=f'Parallel connections per recording (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--chunk-mb', type=float, default=DEFAULT_CHUNK_SIZE / 1048576,
+                        help=f'Range chunk size in MiB (default: {DEFAULT_CHUNK_SIZE // 1048576})')
+    args = parser.parse_args()
+
+    print("🎬 Meeting Recording Downloader")
+    print("=" * 80)
+    session = get_graph_session(pool_size=args.workers)
+    base = f"{GRAPH}/users/{args.user_email}/onlineMeetings/{args.meeting_id}/recordings"
+
+    if args.recording_id:
+        # Same metadata as the listing, so the file name (and resume) matches list mode
+        response = graph_get(session, f"{base}/{args.recording_id}")
+        if response.status_code != 200:
+            print(f"❌ Could not get recording {args.recording_id}: {response.status_code} {response.text[:300]}")
+            return 1
+        recordings = [response.json()]
+    else:
+        try:
+            recordings = list(iter_graph_pages(session, base))
+        except RuntimeError as e:
+            print(f"❌ Could not list recordings: {e}")
+            return 1
+        print(f"📋 {len(recordings)} recording(s)")
+    if not recordings:
+        print("⚠️  No recordings for this meeting yet")
+        return 1
+
+    failed = 0
+    for recording in recordings:
+        dest = os.path.join(args.output, recording_filename(recording))
+        print(f"\n📥 {recording['id'][:40]}... → {dest}")
+        if os.path.exists(dest):
+            print("   ✅ Already downloaded")
+            continue
+        if os.path.exists(dest + '.progress.json'):
+            print("   ♻️  Resuming interrupted download")
+        downloader = RangeDownloader(session, f"{base}/{recording['id']}/content", dest,
+                                     workers=args.workers, chunk_size=int(args.chunk_mb * 1048576),
+                                     progress=print_progress)
+        try:
+            result = downloader.run()
+        except KeyboardInterrupt:
+            print("\n⏹️  Interrupted; re-run the same command to resume")
+            return 1
+        except (DownloadError, OSError) as e:
+            failed += 1
+            print(f"\n   ❌ {e}")
+            continue
+        rate = (result['fetched'] / result['seconds'] / 1048576) if result['seconds'] else 0
+        mode = f"{result['chunks']} chunks, {result['resumed_chunks']} resumed" if result['ranged'] else "single stream"
+        print(f"\n   ✅ {result['size']:,} bytes verified ({mode}) in {result['seconds']:.1f}s, {rate:,.1f} MiB/s")
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Bulk-export every transcript of the monitored group for a date range.
+
+Enumerates the group's organizers, lists each organizer's transcripts
+created in [--start, --end) through getAllTranscripts (all pages, organizers
+listed concurrently), then downloads the content with a bounded worker pool.
+
+Output is either one NDJSON file (one record per transcript, with the VTT
+text and meeting metadata) or one directory per meeting holding .vtt files.
+Every finished transcript is appended to manifest.ndjson in the output
+directory; re-running the same command skips transcripts the manifest
+already records as exported, so an interrupted export resumes where it
+stopped.
+
+Usage:
+    # A quarter, as per-meeting .vtt.gz files
+    python export-transcripts.py --start 2025-01-01 --end 2025-04-01 -o ./export --gzip
+
+    # One NDJSON file, 16 downloads at a time
+    python export-transcripts.py --start 2025-01-01 --end 2025-04-01 -o ./export --format ndjson -w 16
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from datetime import datetime, timezone
+
+from auth_helper import get_config, get_graph_headers, get_graph_session
+from org_transcripts import iso, iter_organizer_transcripts, list_organizers, parse_time, parsed_transcript
+from process_transcript_notification import HEADER_REFRESH_SECONDS, fetch_transcript
+from transcript_cache import open_cache
+
+DEFAULT_WORKERS = 8
+MANIFEST = "manifest.ndjson"
+NDJSON_FILE = "transcripts.ndjson"
+
+
+def safe_name(value: str) -> str:
+    """Filesystem-safe directory name for a UPN or meeting ID."""
+    return re.sub(r"[^A-Za-z0-9@._=-]", "_", value or "unknown")[:200]
+
+
+def load_manifest(path: str) -> dict:
+    """transcript_id -> manifest record for transcripts already exported."""
+    done = {}
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # a line torn by an interrupted run
+            if record.get("status") == "ok":
+                done[record["transcript_id"]] = record
+    return done
+
+
+def enumerate_transcripts(session, organizers: list, start: datetime, end: datetime, workers: int) -> tuple:
+    """
+    List every organizer's transcripts in [start, end) concurrently.
+    Returns (list of (organizer, transcript), number of organizers that failed).
+    """
+    found, failed = [], 0
+
+    def list_one(organizer):
+        return list(iter_organizer_transcripts(session, organizer["id"], start, end))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(list_one, organizer): organizer for organizer in organizers}
+        for future in as_completed(futures):
+            organizer = futures[future]
+            name = organizer.get("userPrincipalName") or organizer["id"]
+            try:
+                transcripts = future.result()
+            except Exception as e:
+                # Unlicensed users answer 403/404; the rest of the group still exports
+                failed += 1
+                print(f"   ⚠️  {name}: {str(e)[:160]}")
+                continue
+            if transcripts:
+                print(f"   📋 {name}: {len(transcripts)} transcript(s)")
+            found.extend((organizer, t) for t in transcripts)
+    found.sort(key=lambda item: item[1].get("createdDateTime") or "")
+    return found, failed
+
+
+def export(items: list, output_dir: str, fmt: str, workers: int, gzip_output: bool,
+           manifest_path: str, cache=None, progress_every: int = 50) -> dict:
+    """Download items with at most ``workers`` in flight, recording each one in the manifest."""
+    session = get_graph_session(pool_size=workers)
+    headers = get_graph_headers()
+    headers_at = time.monotonic()
+    stats = {"exported": 0, "failed": 0, "cached": 0, "bytes": 0, "started": time.perf_counter()}
+    pending = {}
+
+    manifest = open(manifest_path, "a", encoding="utf-8")
+    ndjson = open(os.path.join(output_dir, NDJSON_FILE), "a", encoding="utf-8") if fmt == "ndjson" else None
+
+    def reap(futures):
+        for future in futures:
+            organizer, transcript, parsed = pending.pop(future)
+            r = future.result()
+            record = {
+                "transcript_id": parsed["transcript_id"],
+                "meeting_id": parsed["meeting_id"],
+                "organizer_id": organizer["id"],
+                "organizer": organizer.get("userPrincipalName") or organizer.get("mail"),
+                "created": transcript.get("createdDateTime"),
+                "end": transcript.get("endDateTime"),
+                "bytes": r["bytes"],
+                "cached": r["cached"],
+                "exported_at": iso(datetime.now(timezone.utc)),
+            }
+            if r["error"] is None:
+                if ndjson is not None:
+                    # Data line first: a crash between the two writes re-exports, never loses
+                    ndjson.write(json.dumps({**record, "vtt": r["content"]}, ensure_ascii=False) + "\n")
+                    ndjson.flush()
+                    record["path"] = ndjson.name
+                else:
+                    record["path"] = r["path"]
+                record["status"] = "ok"
+                stats["exported"] += 1
+                stats["cached"] += r["cached"]
+                stats["bytes"] += r["bytes"]
+            else:
+                record["status"] = "failed"
+                record["error"] = f"HTTP {r['status']}: {r['error'][:300]}"
+                stats["failed"] += 1
+                print(f"   ❌ {parsed['transcript_id'][:40]}: {record['error'][:200]}")
+            manifest.write(json.dumps(record) + "\n")
+            manifest.flush()
+
+            done = stats["exported"] + stats["failed"]
+            if progress_every and done % progress_every == 0:
+                print_progress(stats, done, len(items))
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            try:
+                for organizer, transcript in items:
+                    if time.monotonic() - headers_at > HEADER_REFRESH_SECONDS:
+                        headers = get_graph_headers()
+                        headers_at = time.monotonic()
+
+                    while len(pending) >= workers * 2:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        reap(done)
+
+                    parsed = parsed_transcript(organizer["id"], transcript)
+                    target = None
+                    if fmt == "files":
+                        upn = organizer.get("userPrincipalName") or organizer["id"]
+                        target = os.path.join(output_dir, safe_name(upn), safe_name(parsed["meeting_id"]))
+                    future = pool.submit(fetch_transcript, parsed, target, session, headers, gzip_output, cache)
+                    pending[future] = (organizer, transcript, parsed)
+            except KeyboardInterrupt:
+                print(f"\n⏹️  Interrupted, finishing {len(pending)} in-flight download(s); re-run to resume")
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                reap(done)
+    finally:
+        manifest.close()
+        if ndjson is not None:
+            ndjson.close()
+    return stats
+
+
+def print_progress(stats: dict, done: int, total: int) -> None:
+    elapsed = time.perf_counter() - stats["started"]
+    per_minute = done / elapsed * 60 if elapsed else 0
+    print(f"   ⏱️  {done:,}/{total:,} ({stats['failed']:,} failed), {per_minute:,.0f} transcripts/min, "
+          f"{stats['bytes'] / elapsed / 1048576 if elapsed else 0:.2f} MiB/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Export every transcript of the monitored group for a date range',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python export-transcripts.py --start 2025-01-01 --end 2025-04-01 -o ./q1 --gzip
+  python export-transcripts.py --start 2025-03-01 -o ./march --format ndjson -w 16
+  python export-transcripts.py --start 2025-01-01 --end 2025-04-01 -o ./q1 --gzip   # resumes
+        """
+    )
+    parser.add_argument('--start', required=True, help='Export transcripts created on/after this date (ISO-8601)')
+    parser.add_argument('--end', help='... and before this date (default: now)')
+    parser.add_argument('--output', '-o', required=True, help='Export directory (holds the manifest)')
+    parser.add_argument('--format', choices=['files', 'ndjson'], default='files',
+                        help='Per-meeting .vtt files, or one transcripts.ndjson (default: files)')
+    parser.add_argument('--gzip', action='store_true', help='Gzip .vtt files (--format files)')
+    parser.add_argument('--workers', '-w', type=int, default=DEFAULT_WORKERS,
+                        help=f'Concurrent downloads and organizer listings (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--group-id', help='Group whose members are exported (default: ENTRA_GROUP_ID)')
+    parser.add_argument('--cache', metavar='DIR',
+                        help='Reuse transcripts fetched before from this cache (default: $TRANSCRIPT_CACHE_DIR)')
+    parser.add_argument('--cache-max-mb', type=float, default=None,
+                        help='Evict least recently used cached transcripts beyond this size (default: 1024)')
+    args = parser.parse_args()
+
+    group_id = args.group_id or get_config()['group_id']
+    if not group_id:
+        print("❌ No group: pass --group-id or set ENTRA_GROUP_ID")
+        return 1
+    start = parse_time(args.start)
+    end = parse_time(args.end) if args.end else datetime.now(timezone.utc)
+    if end <= start:
+        print("❌ --end must be after --start")
+        return 1
+
+    print("📦 Transcript Export")
+    print("=" * 80)
+    print(f"Range: {iso(start)} → {iso(end)}")
+    print(f"Output: {args.output} ({args.format})")
+    print("=" * 80)
+
+    os.makedirs(args.output, exist_ok=True)
+    manifest_path = os.path.join(args.output, MANIFEST)
+    already = load_manifest(manifest_path)
+    if already:
+        print(f"\n♻️  Resuming: {len(already):,} transcript(s) already in {manifest_path}")
+
+    session = get_graph_session(pool_size=args.workers)
+    print(f"\n🔍 Listing organizers in group {group_id}...")
+    organizers = list_organizers(session, group_id)
+    print(f"   {len(organizers)} organizer(s)")
+
+    print(f"\n🔍 Listing transcripts...")
+    listed_at = time.perf_counter()
+    found, list_failed = enumerate_transcripts(session, organizers, start, end, args.workers)
+    items = [(o, t) for o, t in found if t.get("id") not in already]
+    print(f"   {len(found):,} transcript(s) in range, {len(items):,} to export "
+          f"({time.perf_counter() - listed_at:.1f}s)")
+
+    if not items:
+        print("\n✅ Nothing to export")
+        return 0 if list_failed == 0 else 1
+
+    cache = open_cache(args.cache, args.cache_max_mb)
+    print(f"\n📥 Downloading with {args.workers} worker(s)...")
+    try:
+        stats = export(items, args.output, args.format, args.workers, args.gzip, manifest_path, cache)
+    finally:
+        if cache is not None:
+            cache.close()
+
+    elapsed = time.perf_counter() - stats["started"]
+    done = stats["exported"] + stats["failed"]
+    print(f"\n📊 Export summary:")
+    print(f"   Exported: {stats['exported']:,}/{len(items):,} ({stats['failed']:,} failed, "
+          f"{len(already):,} from earlier runs)")
+    if stats["cached"]:
+        print(f"   Served from cache: {stats['cached']:,}")
+    print(f"   Bytes: {stats['bytes']:,}")
+    print(f"   Wall time: {elapsed:.1f}s")
+    print(f"   Throughput: {done / elapsed * 60 if elapsed else 0:,.1f} transcripts/min, "
+          f"{stats['bytes'] / elapsed / 1048576 if elapsed else 0:.2f} MiB/s")
+    print(f"   Manifest: {manifest_path}")
+    if list_failed:
+        print(f"   ⚠️  Organizers that could not be listed: {list_failed}")
+    if done < len(items) or stats["failed"]:
+        print("\n💡 Re-run the same command to retry failed or remaining transcripts")
+    return 0 if stats["failed"] == 0 and done == len(items) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""
+Graph Resource Parser
+Shared, precompiled parsing of Graph change-notification resource paths
+
+Classifies a notification's resource as an event, transcript, recording or
+callRecord and extracts its IDs from one split of the path. Both path
+styles Graph produces are understood:
+
+    users/{user}/events/{event}
+    users/{user}/onlineMeetings/{meeting}/transcripts/{transcript}
+    users/{user}/adhocCalls/{call}/recordings/{recording}
+    communications/onlineMeetings('{meeting}')/transcripts('{transcript}')
+    users/{user}/onlineMeetings/getAllTranscripts(meetingOrganizerUserId='{org}')/{transcript}
+    communications/onlineMeetings/getAllRecordings(...)('{recording}')
+    communications/callRecords/{callRecord}
+"""
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+EVENT = "event"
+TRANSCRIPT = "transcript"
+RECORDING = "recording"
+CALL_RECORD = "callRecord"
+UNKNOWN = "unknown"
+
+# OData key segments: onlineMeetings('abc') -> onlineMeetings/abc
+_KEY_SEGMENT = re.compile(r"\('([^']*)'\)")
+
+_ORGANIZER_ARG = re.compile(r"meetingOrganizerUserId\s*=\s*'([^']*)'", re.IGNORECASE)
+
+_USERS = {"users", "Users"}
+_COMMUNICATIONS = {"communications", "Communications"}
+_EVENTS = {"events", "Events"}
+_CONTAINERS = {"onlineMeetings", "adhocCalls"}
+_CHILD_KINDS = {"transcripts": TRANSCRIPT, "recordings": RECORDING}
+_GET_ALL = (("getAllTranscripts", TRANSCRIPT), ("getAllRecordings", RECORDING))
+
+
+class GraphResource(NamedTuple):
+    """Parsed resource path. ``id`` is the leaf (event/transcript/recording/callRecord) ID."""
+    kind: str
+    id: Optional[str] = None
+    user_id: Optional[str] = None
+    meeting_id: Optional[str] = None
+    container: Optional[str] = None  # onlineMeetings | adhocCalls
+    organizer_id: Optional[str] = None
+    resource: str = ""
+
+
+def _get_all(segment: str) -> Optional[Tuple[str, Optional[str]]]:
+    """(kind, organizer ID) for a getAllTranscripts/getAllRecordings[(args)] segment, else None."""
+    for name, kind in _GET_ALL:
+        if segment.startswith(name):
+            args = segment[len(name):]
+            if not args:
+                return kind, None
+            if args[0] == "(" and args.find(")") == len(args) - 1:
+                organizer = _ORGANIZER_ARG.search(args)
+                return kind, organizer.group(1) if organizer else None
+    return None
+
+
+def parse_resource(resource: str) -> GraphResource:
+    """Parse one resource path. Unrecognized paths return kind="unknown"."""
+    # One split and a few segment-name checks; several times cheaper than an
+    # anchored regex over every path form
+    path = _KEY_SEGMENT.sub(r"/\1", resource) if "('" in resource else resource
+    parts = path.split("/")
+    if not parts[0]:
+        del parts[0]  # leading "/"
+    if parts and not parts[-1]:
+        parts.pop()  # trailing "/"
+    if not parts or "" in parts:
+        return GraphResource(UNKNOWN, None, None, None, None, None, resource)
+
+    head = parts[0]
+    if head in _USERS:
+        if len(parts) < 4:
+            return GraphResource(UNKNOWN, None, None, None, None, None, resource)
+        user, i = parts[1], 2
+    elif head in _COMMUNICATIONS:
+        user, i = None, 1
+    else:
+        return GraphResource(UNKNOWN, None, None, None, None, None, resource)
+    n = len(parts) - i
+    if n < 2:
+        return GraphResource(UNKNOWN, None, None, None, None, None, resource)
+    section = parts[i]
+
+    if n == 4:
+        kind = _CHILD_KINDS.get(parts[i + 2])
+        if kind is not None and section in _CONTAINERS:
+            return GraphResource(kind, parts[i + 3], user, parts[i + 1], section, None, resource)
+    elif n == 2:
+        if section in _EVENTS:
+            return GraphResource(EVENT, parts[i + 1], user, None, None, None, resource)
+        if section == "callRecords":
+            return GraphResource(CALL_RECORD, parts[i + 1], None, None, None, None, resource)
+    elif n == 3 and section == "onlineMeetings":
+        get_all = _get_all(parts[i + 1])
+        if get_all is not None:
+            kind, organizer_id = get_all
+            return GraphResource(kind, parts[i + 2], user or organizer_id, None, "onlineMeetings",
+                                 organizer_id, resource)
+    return GraphResource(UNKNOWN, None, None, None, None, None, resource)
+
+
+def transcript_path_ids(resource: str) -> Optional[Tuple[str, str, str, str]]:
+    """
+    Fast path for the plain users/{user}/{onlineMeetings|adhocCalls}/{meeting}/transcripts/{id}
+    form transcript subscriptions deliver: (user, container, meeting, transcript), or None
+    for any other path (use parse_resource / parse_notification for those).
+    """
+    parts = resource.split("/")
+    if (len(parts) == 6 and parts[4] == "transcripts" and parts[2] in _CONTAINERS
+            and parts[0] in _USERS and "" not in parts and "('" not in resource):
+        return parts[1], parts[2], parts[3], parts[5]
+    return None
+
+
+def _from_odata_type(notification: Dict[str, Any]) -> GraphResource:
+    """Fallback classification from resourceData, mirroring the EventHub Lambda."""
+    resource = notification.get("resource", "")
+    resource_data = notification.get("resourceData") or {}
+    odata_type = resource_data.get("@odata.type", "")
+    if "callTranscript" in odata_type or "onlineMeetingTranscript" in odata_type:
+        kind = TRANSCRIPT
+    elif "callRecording" in odata_type:
+        kind = RECORDING
+    elif "callRecord" in odata_type:
+        kind = CALL_RECORD
+    else:
+        return GraphResource(UNKNOWN, resource=resource)
+    return GraphResource(kind, resource_data.get("id"), resource=resource)
+
+
+def parse_notification(notification: Dict[str, Any]) -> GraphResource:
+    """Parse a notification's resource, falling back to resourceData."""
+    parsed = parse_resource(notification.get("resource", ""))
+    if parsed.kind == UNKNOWN:
+        return _from_odata_type(notification)
+    if parsed.id is None:
+        return parsed._replace(id=(notification.get("resourceData") or {}).get("id"))
+    return parsed
+
+
+def parse_notifications(payload: Any) -> List[Tuple[Dict[str, Any], GraphResource]]:
+    """
+    Batch API: parse a webhook payload ({value: [...]}), a list of
+    notifications or a single notification into (notification, parsed) pairs.
+    """
+    if isinstance(payload, dict):
+        notifications = payload["value"] if "value" in payload else [payload]
+    else:
+        notifications = payload
+    return [(n, parse_notification(n)) for n in notifications]
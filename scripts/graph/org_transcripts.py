@@ -0,0 +1,68 @@
+"""
+Organization Transcripts
+Enumerate the monitored group's organizers and their transcripts
+
+Shared by discover-transcripts.py (incremental sweeps) and
+export-transcripts.py (date-range exports). Every collection is paged to
+the end through @odata.nextLink.
+
+    organizers = list_organizers(session, group_id)
+    for transcript in iter_organizer_transcripts(session, organizer["id"], start, end):
+        ...
+"""
+from datetime import datetime, timezone
+from typing import Iterator, List, Optional
+
+from auth_helper import iter_graph_pages
+
+GRAPH = "https://graph.microsoft.com/v1.0"
+
+
+def iso(value: datetime) -> str:
+    """Graph-style UTC timestamp (naive datetimes are taken as UTC)."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def parse_time(value: str) -> datetime:
+    """Aware datetime from an ISO-8601 string; date-only and naive values are UTC."""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def list_organizers(session, group_id: str) -> List[dict]:
+    """All user members of the group (transitively), every page."""
+    url = f"{GRAPH}/groups/{group_id}/transitiveMembers/microsoft.graph.user"
+    params = {"$select": "id,displayName,userPrincipalName,mail", "$top": 999}
+    return list(iter_graph_pages(session, url, params=params))
+
+
+def organizer_transcripts_url(organizer_id: str, start: Optional[datetime] = None,
+                              end: Optional[datetime] = None) -> str:
+    args = [f"meetingOrganizerUserId='{organizer_id}'"]
+    if start is not None:
+        args.append(f"startDateTime={iso(start)}")
+    if end is not None:
+        args.append(f"endDateTime={iso(end)}")
+    return f"{GRAPH}/users/{organizer_id}/onlineMeetings/getAllTranscripts({','.join(args)})"
+
+
+def iter_organizer_transcripts(session, organizer_id: str, start: Optional[datetime] = None,
+                               end: Optional[datetime] = None) -> Iterator[dict]:
+    """Every transcript of meetings organized by organizer_id created in [start, end)."""
+    return iter_graph_pages(session, organizer_transcripts_url(organizer_id, start, end))
+
+
+def parsed_transcript(organizer_id: str, transcript: dict) -> dict:
+    """A getAllTranscripts item in the shape process_transcript_notification.fetch_transcript takes."""
+    return {
+        "user_id": organizer_id,
+        "meeting_id": transcript.get("meetingId"),
+        "transcript_id": transcript.get("id"),
+        "resource_type": "onlineMeetings",
+        "created": transcript.get("createdDateTime"),
+        "end": transcript.get("endDateTime"),
+    }
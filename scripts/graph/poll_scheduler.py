@@ -0,0 +1,207 @@
+"""
+Transcript Poll Scheduler
+One event loop polling many meetings for transcripts
+
+Each pending meeting sits in a heap keyed on its next check time. Checks are
+spaced by a backoff policy measured from the meeting's end time, so a meeting
+that just ended is checked soon and one that ended hours ago rarely. When a
+check finds transcripts, ``on_ready`` runs immediately (typically to download
+them) and the meeting leaves the heap. Graph calls therefore scale with the
+number of meetings still waiting, not with the number of polling processes.
+
+    scheduler = PollScheduler(check=list_transcripts, on_ready=download)
+    scheduler.add("alice@contoso.com", meeting_id, end_time)
+    stats = scheduler.run()
+"""
+import heapq
+import itertools
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+
+class ExponentialBackoff:
+    """
+    Check at end + first, then double the gap each time (capped at
+    max_interval) until give_up_after seconds past the meeting end.
+    """
+
+    def __init__(self, first: float = 120, factor: float = 2.0, max_interval: float = 900,
+                 give_up_after: float = 4 * 3600):
+        self.first = first
+        self.factor = factor
+        self.max_interval = max_interval
+        self.give_up_after = give_up_after
+        self._offsets: List[float] = []
+
+    def offset(self, attempt: int) -> Optional[float]:
+        """Seconds after meeting end for check number ``attempt`` (0-based), or None to give up."""
+        offsets = self._offsets
+        while len(offsets) <= attempt and (not offsets or offsets[-1] <= self.give_up_after):
+            if not offsets:
+                offsets.append(self.first)
+            else:
+                gap = min(self.first * self.factor ** (len(offsets) - 1), self.max_interval)
+                offsets.append(offsets[-1] + gap)
+        if attempt >= len(offsets) or offsets[attempt] > self.give_up_after:
+            return None
+        return offsets[attempt]
+
+
+class PendingMeeting:
+    """Scheduler state for one meeting."""
+
+    __slots__ = ("key", "user", "meeting_id", "end_time", "attempt", "next_at", "last_check", "info")
+
+    def __init__(self, user: str, meeting_id: str, end_time: float, info: Optional[Dict[str, Any]] = None):
+        self.key = (user, meeting_id)
+        self.user = user
+        self.meeting_id = meeting_id
+        self.end_time = end_time
+        self.attempt = 0
+        self.next_at = 0.0
+        self.last_check = None  # time of the last unsuccessful check
+        self.info = info or {}
+
+    def __repr__(self) -> str:
+        return f"PendingMeeting({self.user!r}, {self.meeting_id[:24]!r}..., attempt={self.attempt})"
+
+
+def to_epoch(value) -> float:
+    """Epoch seconds from a datetime, an ISO-8601 string (naive = UTC) or a number."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    return float(value)
+
+
+class PollScheduler:
+    """
+    Heap-driven poller for many meetings.
+
+    check(meeting) -> list of transcripts (empty if not ready yet)
+    on_ready(meeting, transcripts) runs on the worker that found them
+    on_give_up(meeting) runs when the policy stops scheduling checks
+    policy.offset(attempt) gives the check time relative to meeting end
+    """
+
+    def __init__(self, check: Callable[[PendingMeeting], list],
+                 on_ready: Optional[Callable[[PendingMeeting, list], Any]] = None,
+                 on_give_up: Optional[Callable[[PendingMeeting], Any]] = None,
+                 policy=None, workers: int = 8, clock: Callable[[], float] = time.time,
+                 sleep: Callable[[float], Any] = time.sleep):
+        self.check = check
+        self.on_ready = on_ready
+        self.on_give_up = on_give_up
+        self.policy = policy or ExponentialBackoff()
+        self.workers = workers
+        self.clock = clock
+        self.sleep = sleep
+        self.meetings: Dict[tuple, PendingMeeting] = {}
+        self._heap: List[tuple] = []
+        self._seq = itertools.count()
+        self.stats = {"added": 0, "checks": 0, "errors": 0, "ready": 0, "gave_up": 0}
+
+    def __len__(self) -> int:
+        return len(self.meetings)
+
+    def _schedule(self, meeting: PendingMeeting, now: float) -> bool:
+        """Push the meeting's next check; skip offsets already in the past. False = give up."""
+        while True:
+            offset = self.policy.offset(meeting.attempt)
+            if offset is None:
+                return False
+            due = meeting.end_time + offset
+            # A meeting added late gets one immediate check, then resumes the schedule
+            if due >= now or meeting.attempt == 0:
+                break
+            meeting.attempt += 1
+        meeting.next_at = max(due, now)
+        heapq.heappush(self._heap, (meeting.next_at, next(self._seq), meeting.key))
+        return True
+
+    def add(self, user: str, meeting_id: str, end_time, info: Optional[Dict[str, Any]] = None) -> PendingMeeting:
+        """Track a meeting. end_time is a datetime, ISO-8601 string or epoch seconds."""
+        meeting = PendingMeeting(user, meeting_id, to_epoch(end_time), info)
+        if meeting.key in self.meetings:
+            return self.meetings[meeting.key]
+        self.meetings[meeting.key] = meeting
+        self.stats["added"] += 1
+        if not self._schedule(meeting, self.clock()):
+            self._give_up(meeting)
+        return meeting
+
+    def _give_up(self, meeting: PendingMeeting) -> None:
+        self.meetings.pop(meeting.key, None)
+        self.stats["gave_up"] += 1
+        if self.on_give_up:
+            self.on_give_up(meeting)
+
+    def _run_check(self, meeting: PendingMeeting):
+        try:
+            transcripts = self.check(meeting)
+        except Exception as e:
+            return None, e
+        if transcripts and self.on_ready:
+            try:
+                self.on_ready(meeting, transcripts)
+            except Exception as e:
+                # Keep the meeting scheduled so the download is retried
+                return None, e
+        return transcripts, None
+
+    def _handle(self, meeting: PendingMeeting, transcripts, error) -> None:
+        self.stats["checks"] += 1
+        if error is not None:
+            self.stats["errors"] += 1
+        if transcripts:
+            self.meetings.pop(meeting.key, None)
+            self.stats["ready"] += 1
+            return
+        now = self.clock()
+        meeting.last_check = now
+        meeting.attempt += 1
+        if not self._schedule(meeting, now):
+            self._give_up(meeting)
+
+    def next_due(self) -> Optional[float]:
+        return self._heap[0][0] if self._heap else None
+
+    def run(self, until: Optional[float] = None) -> Dict[str, int]:
+        """
+        Run until every meeting is ready or given up (or ``until`` epoch
+        seconds). Due checks run on up to ``workers`` threads.
+        """
+        heap = self._heap
+        inflight = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while heap or inflight:
+                now = self.clock()
+                if until is not None and now >= until and not inflight:
+                    break
+
+                while heap and heap[0][0] <= now and len(inflight) < self.workers:
+                    due, _, key = heapq.heappop(heap)
+                    meeting = self.meetings.get(key)
+                    if meeting is None or meeting.next_at != due:
+                        continue  # stale entry
+                    inflight[pool.submit(self._run_check, meeting)] = meeting
+
+                if len(inflight) >= self.workers or not heap:
+                    timeout = None  # wait for a check to finish
+                else:
+                    timeout = max(0.0, heap[0][0] - now)
+                if until is not None:
+                    timeout = max(0.0, until - now if timeout is None else min(timeout, until - now))
+                if inflight:
+                    done, _ = wait(inflight, timeout=timeout, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        meeting = inflight.pop(future)
+                        self._handle(meeting, *future.result())
+                elif timeout:
+                    self.sleep(timeout)
+        return self.stats
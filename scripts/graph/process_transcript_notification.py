@@ -11,25 +11,40 @@ Usage:
     
     # From notification JSON string
     python process_transcript_notification.py --json '{"subscriptionId": "...", ...}'
+    
+    # Long-running worker over NDJSON on stdin, or a watched directory
+    cat notifications.ndjson | python process_transcript_notification.py --stream -o ./transcripts
+    python process_transcript_notification.py --stream --watch ./inbox -o ./transcripts
 """
 
 import sys
 import json
+import gzip
+import time
 import argparse
 import os
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from pathlib import Path
 
 # Add scripts/graph to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'scripts', 'graph'))
 
-from auth_helper import get_graph_headers
+from auth_helper import get_graph_headers, get_graph_session
+from graph_resources import TRANSCRIPT, parse_notification as parse_graph_notification, transcript_path_ids
 import requests
 
+CHUNK_SIZE = 64 * 1024
+DEFAULT_WORKERS = 8
+HEADER_REFRESH_SECONDS = 300  # --stream: re-read the (cached) token this often
+SEEN_TRANSCRIPTS_MAX = 100_000  # --stream: transcript IDs remembered for in-run dedupe (LRU)
+
 
-def parse_notification(notification: dict) -> dict:
+def parse_notification(notification: dict, verbose: bool = True) -> list:
     """Extract key information from webhook notification."""
     
-    print("📬 Parsing webhook notification...")
+    if verbose:
+        print("📬 Parsing webhook notification...")
     
     # Handle both single notification and value array formats
     if 'value' in notification:
@@ -44,92 +59,549 @@ def parse_notification(notification: dict) -> dict:
         resource_data = notif.get('resourceData', {})
         subscription_id = notif.get('subscriptionId', '')
         
-        print(f"\n  Subscription ID: {subscription_id}")
-        print(f"  Resource: {resource}")
+        if verbose:
+            print(f"\n  Subscription ID: {subscription_id}")
+            print(f"  Resource: {resource}")
         
-        # Parse resource path - examples:
+        # Parse resource path - the plain forms take the fast path:
         # users/{user_id}/onlineMeetings/{meeting_id}/transcripts/{transcript_id}
         # users/{user_id}/adhocCalls/{call_id}/transcripts/{transcript_id}
+        # others go through the full parser, e.g.
+        # users/{user_id}/onlineMeetings/getAllTranscripts(meetingOrganizerUserId='...')/{transcript_id}
+        ids = transcript_path_ids(resource)
+        if ids is None:
+            parsed = parse_graph_notification(notif)
+            if parsed.kind == TRANSCRIPT:
+                ids = (parsed.user_id or parsed.organizer_id, parsed.container,
+                       parsed.meeting_id or resource_data.get('meetingId'), parsed.id)
         
-        parts = resource.split('/')
-        
-        if 'users' in parts and 'transcripts' in parts:
-            user_idx = parts.index('users')
-            transcript_idx = parts.index('transcripts')
+        if ids is not None:
+            user_id, container, meeting_id, transcript_id = ids
             
-            user_id = parts[user_idx + 1] if user_idx + 1 < len(parts) else None
-            transcript_id = parts[transcript_idx + 1] if transcript_idx + 1 < len(parts) else None
-            
-            # Extract meeting ID (either onlineMeetings or adhocCalls)
-            meeting_id = None
-            if 'onlineMeetings' in parts:
-                meeting_idx = parts.index('onlineMeetings')
-                meeting_id = parts[meeting_idx + 1] if meeting_idx + 1 < len(parts) else None
-            elif 'adhocCalls' in parts:
-                call_idx = parts.index('adhocCalls')
-                meeting_id = parts[call_idx + 1] if call_idx + 1 < len(parts) else None
+            if not (user_id and meeting_id):
+                if verbose:
+                    print(f"  ⚠️  Transcript resource is missing a user or meeting ID: {resource}")
+                continue
             
             result = {
                 'user_id': user_id,
                 'meeting_id': meeting_id,
                 'transcript_id': transcript_id,
-                'resource_type': 'onlineMeetings' if 'onlineMeetings' in parts else 'adhocCalls',
+                'resource_type': container,
                 'subscription_id': subscription_id,
                 'resource': resource,
                 'resource_data': resource_data
             }
             
-            print(f"  ✅ Parsed:")
-            print(f"     User: {user_id}")
-            print(f"     Meeting ID: {meeting_id}")
-            print(f"     Transcript ID: {transcript_id}")
+            if verbose:
+                print(f"  ✅ Parsed:")
+                print(f"     User: {user_id}")
+                print(f"     Meeting ID: {meeting_id}")
+                print(f"     Transcript ID: {transcript_id}")
             
             results.append(result)
-        else:
+        elif verbose:
             print(f"  ⚠️  Unrecognized resource format: {resource}")
     
     return results
 
 
-def fetch_transcript(parsed: dict, output_dir: str = None) -> str:
-    """Fetch transcript content using parsed notification data."""
+def transcript_content_url(parsed: dict) -> str:
+    """Build the /content URL for a parsed transcript notification."""
+    container = 'adhocCalls' if parsed['resource_type'] == 'adhocCalls' else 'onlineMeetings'
+    return (f"https://graph.microsoft.com/v1.0/users/{parsed['user_id']}/{container}/"
+            f"{parsed['meeting_id']}/transcripts/{parsed['transcript_id']}/content")
+
+
+def fetch_transcript(parsed: dict, output_dir: str = None, session=None, headers: dict = None,
+                     gzip_output: bool = False, cache=None, redactor=None) -> dict:
+    """
+    Fetch transcript content using parsed notification data.
     
-    print(f"\n📄 Fetching transcript content...")
+    With output_dir the response is streamed to disk in chunks (optionally
+    gzip-compressed) and never held in memory; otherwise the content is
+    returned in the result. With a TranscriptCache, a transcript fetched
+    before is served from the cache and new downloads are added to it (the
+    cache keeps the original). With a Redactor, the saved file or returned
+    content is redacted before the result is returned. Returns a dict with transcript_id, url, status, bytes, seconds, path,
+    content, cached and error.
+    """
+    session = session or requests
+    headers = headers or get_graph_headers()
+    url = transcript_content_url(parsed)
+    result = {
+        'transcript_id': parsed['transcript_id'],
+        'url': url,
+        'status': None,
+        'bytes': 0,
+        'seconds': 0.0,
+        'path': None,
+        'content': None,
+        'cached': False,
+        'error': None,
+    }
     
-    headers = get_graph_headers()
+    started = time.perf_counter()
+    if cache is not None and serve_from_cache(cache, parsed, result, output_dir, gzip_output):
+        if redactor is not None:
+            redact_result(redactor, result)
+        result['seconds'] = time.perf_counter() - started
+        return result
     
-    # Construct URL based on resource type
-    if parsed['resource_type'] == 'onlineMeetings':
-        url = f"https://graph.microsoft.com/v1.0/users/{parsed['user_id']}/onlineMeetings/{parsed['meeting_id']}/transcripts/{parsed['transcript_id']}/content"
-    else:  # adhocCalls
-        url = f"https://graph.microsoft.com/v1.0/users/{parsed['user_id']}/adhocCalls/{parsed['meeting_id']}/transcripts/{parsed['transcript_id']}/content"
+    try:
+        with session.get(url, headers=headers, timeout=60, stream=True) as response:
+            result['status'] = response.status_code
+            if response.status_code != 200:
+                result['error'] = response.text[:500]
+                return result
+            
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+                filename = f"{parsed['transcript_id']}.vtt" + ('.gz' if gzip_output else '')
+                filepath = os.path.join(output_dir, filename)
+                partial = filepath + '.part'
+                opener = gzip.open if gzip_output else open
+                try:
+                    with opener(partial, 'wb') as f:
+                        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                            f.write(chunk)
+                            result['bytes'] += len(chunk)
+                    os.replace(partial, filepath)
+                except BaseException:
+                    # Never leave a truncated transcript behind
+                    if os.path.exists(partial):
+                        os.remove(partial)
+                    raise
+                result['path'] = filepath
+                if cache is not None:
+                    store_in_cache(cache, parsed, path=filepath)
+            else:
+                chunks = []
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    chunks.append(chunk)
+                    result['bytes'] += len(chunk)
+                data = b''.join(chunks)
+                result['content'] = data.decode(response.encoding or 'utf-8', errors='replace')
+                if cache is not None:
+                    store_in_cache(cache, parsed, data=data)
+        if redactor is not None:
+            redact_result(redactor, result)
+    except requests.exceptions.RequestException as e:
+        result['error'] = str(e)
+    except OSError as e:
+        # Disk full, permissions, ...: fail this transcript, not the batch or --stream worker
+        result['error'] = f"write failed: {e}"
+    finally:
+        result['seconds'] = time.perf_counter() - started
     
-    print(f"   URL: {url}")
+    return result
+
+
+def redact_result(redactor, result: dict):
+    """
+    Redact a fetched transcript in place (saved file or in-memory content).
+    If redaction fails the unredacted copy is discarded and the result fails.
+    """
+    from transcript_redaction import redact_file, redact_text
+    try:
+        if result['path']:
+            redact_file(result['path'], redactor)
+        elif result['content'] is not None:
+            result['content'] = redact_text(result['content'], redactor)
+    except Exception as e:
+        if result['path'] and os.path.exists(result['path']):
+            os.remove(result['path'])
+        result['path'] = None
+        result['content'] = None
+        result['error'] = f"redaction failed: {e}"
+
+
+def store_in_cache(cache, parsed: dict, path: str = None, data: bytes = None):
+    """Add a download to the transcript cache; a cache failure never fails the download."""
+    key = (parsed['user_id'], parsed['meeting_id'], parsed['transcript_id'])
+    try:
+        if path:
+            cache.put_file(*key, path)
+        else:
+            cache.put(*key, data)
+    except Exception as e:
+        print(f"   ⚠️  Failed to cache {parsed['transcript_id'][:40]}: {e}", file=sys.stderr)
+
+
+def serve_from_cache(cache, parsed: dict, result: dict, output_dir: str = None,
+                     gzip_output: bool = False) -> bool:
+    """Fill result from the transcript cache; False on a miss. A cache failure counts as a miss."""
+    key = (parsed['user_id'], parsed['meeting_id'], parsed['transcript_id'])
+    try:
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+            filename = f"{parsed['transcript_id']}.vtt" + ('.gz' if gzip_output else '')
+            filepath = os.path.join(output_dir, filename)
+            size = cache.copy_to(*key, filepath, gzip_output=gzip_output)
+            if size is None:
+                return False
+            result['path'] = filepath
+        else:
+            content = cache.get_bytes(*key)
+            if content is None:
+                return False
+            size = len(content)
+            result['content'] = content.decode('utf-8', errors='replace')
+    except Exception as e:
+        print(f"   ⚠️  Cache read failed for {parsed['transcript_id'][:40]}: {e}", file=sys.stderr)
+        return False
+    result['status'] = 200
+    result['bytes'] = size
+    result['cached'] = True
+    return True
+
+
+def fetch_transcripts(parsed_list: list, output_dir: str = None, workers: int = DEFAULT_WORKERS,
+                      gzip_output: bool = False, session=None, headers: dict = None, cache=None,
+                      redactor=None) -> tuple:
+    """
+    Fetch every transcript in a notification batch concurrently.
     
-    response = requests.get(url, headers=headers, timeout=60)
+    One token and one pooled session are shared by all workers, so a batch
+    takes roughly as long as its slowest download. Returns (results, summary)
+    with results in the same order as parsed_list.
+    """
+    workers = max(1, min(workers, len(parsed_list)))
+    session = session or get_graph_session(pool_size=workers)
+    headers = headers or get_graph_headers()
     
-    print(f"   Status: {response.status_code}")
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(fetch_transcript, parsed, output_dir, session, headers, gzip_output, cache, redactor)
+            for parsed in parsed_list
+        ]
+        for future in as_completed(futures):
+            r = future.result()
+            if r['error'] is None:
+                where = f" → {r['path']}" if r['path'] else ''
+                source = ' (cached)' if r['cached'] else ''
+                print(f"   ✅ {r['transcript_id'][:40]}: {r['bytes']:,} bytes in {r['seconds']:.2f}s{source}{where}")
+            else:
+                print(f"   ❌ {r['transcript_id'][:40]}: HTTP {r['status']} {r['error'][:200]}")
+    results = [f.result() for f in futures]
     
-    if response.status_code == 200:
-        content = response.text
-        print(f"   ✅ Content retrieved ({len(content)} characters)")
+    wall = time.perf_counter() - started
+    ok = [r for r in results if r['error'] is None]
+    summary = {
+        'transcripts': len(results),
+        'succeeded': len(ok),
+        'cached': sum(1 for r in ok if r['cached']),
+        'failed': len(results) - len(ok),
+        'bytes': sum(r['bytes'] for r in ok),
+        'seconds': wall,
+        'slowest_seconds': max((r['seconds'] for r in results), default=0.0),
+        'sequential_seconds': sum(r['seconds'] for r in results),
+    }
+    return results, summary
+
+
+def print_summary(summary: dict):
+    """Print the per-run download summary."""
+    rate = summary['bytes'] / summary['seconds'] / 1024 if summary['seconds'] else 0
+    print(f"\n📊 Run summary:")
+    print(f"   Transcripts: {summary['succeeded']}/{summary['transcripts']} succeeded")
+    if summary['cached']:
+        print(f"   Served from cache: {summary['cached']}")
+    print(f"   Bytes: {summary['bytes']:,} ({rate:,.1f} KiB/s)")
+    print(f"   Wall time: {summary['seconds']:.2f}s "
+          f"(slowest single download {summary['slowest_seconds']:.2f}s, "
+          f"sequential would be ~{summary['sequential_seconds']:.2f}s)")
+
+
+def read_preview(result: dict, max_lines: int = 20) -> tuple:
+    """Return (first lines, total line count or None) for a fetched transcript."""
+    if result['content'] is not None:
+        lines = result['content'].split('\n')
+        return lines[:max_lines], len(lines)
+    opener = gzip.open if result['path'].endswith('.gz') else open
+    lines = []
+    with opener(result['path'], 'rt', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            if len(lines) >= max_lines:
+                return lines, None
+            lines.append(line.rstrip('\n'))
+    return lines, len(lines)
+
+
+def iter_ndjson(stream, stats: dict):
+    """Yield one JSON document per non-empty line; malformed lines are counted and skipped."""
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            stats['invalid_lines'] += 1
+            print(f"   ⚠️  Skipping malformed line: {e}", file=sys.stderr)
+
+
+def iter_watch_directory(directory: str, stats: dict, poll_interval: float = 2.0,
+                         idle_exit: float = None):
+    """
+    Watch a directory and yield notifications from new *.json / *.ndjson files.
+    
+    Files are picked up oldest first once their size and mtime have stayed
+    the same for one poll interval, so a file still being written is not
+    read half-finished. A .json file only counts as read once it parses;
+    one that does not is retried whenever it changes. .json files hold a
+    single notification or {value: [...]} payload; .ndjson files hold one
+    per line. Stops after idle_exit seconds without new files (runs until
+    Ctrl+C if None).
+    """
+    seen = set()
+    observed = {}  # name -> (size, mtime) at the previous poll, for files not read yet
+    unparsed = {}  # .json name -> (size, mtime) when it last failed to parse
+    idle_since = time.monotonic()
+    while True:
+        ready = []
+        present = set()
+        for entry in os.scandir(directory):
+            if not (entry.is_file() and entry.name.endswith(('.json', '.ndjson'))):
+                continue
+            present.add(entry.name)
+            if entry.name in seen:
+                continue
+            try:
+                st = entry.stat()
+            except OSError:
+                continue  # removed since scandir
+            signature = (st.st_size, st.st_mtime_ns)
+            if unparsed.get(entry.name) == signature:
+                continue
+            if observed.get(entry.name) == signature:
+                ready.append((st.st_mtime, entry, signature))
+            else:
+                observed[entry.name] = signature
+        # Forget files that were removed so long-running watches stay bounded
+        seen &= present
+        for tracked in (observed, unparsed):
+            for name in [name for name in tracked if name not in present]:
+                del tracked[name]
         
-        # Save to file if output_dir specified
-        if output_dir:
-            os.makedirs(output_dir, exist_ok=True)
-            filename = f"{parsed['transcript_id']}.vtt"
-            filepath = os.path.join(output_dir, filename)
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
-            
-            print(f"   💾 Saved to: {filepath}")
+        ready.sort(key=lambda item: item[0])
+        for _, entry, signature in ready:
+            del observed[entry.name]
+            try:
+                with open(entry.path, 'r', encoding='utf-8') as f:
+                    if entry.name.endswith('.ndjson'):
+                        seen.add(entry.name)
+                        stats['files'] += 1
+                        yield from iter_ndjson(f, stats)
+                        continue
+                    notification = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                unparsed[entry.name] = signature
+                stats['invalid_lines'] += 1
+                print(f"   ⚠️  Skipping {entry.name} until it changes: {e}", file=sys.stderr)
+                continue
+            seen.add(entry.name)
+            unparsed.pop(entry.name, None)
+            stats['files'] += 1
+            yield notification
         
-        return content
-    else:
-        print(f"   ❌ Failed to fetch content")
-        print(f"   Response: {response.text[:500]}")
+        if ready or observed:
+            idle_since = time.monotonic()
+        elif idle_exit is not None and time.monotonic() - idle_since >= idle_exit:
+            return
+        time.sleep(poll_interval)
+
+
+def new_stream_stats() -> dict:
+    return {
+        'files': 0,
+        'notifications': 0,
+        'invalid_lines': 0,
+        'skipped': 0,
+        'duplicates': 0,
+        'queued': 0,
+        'succeeded': 0,
+        'failed': 0,
+        'cached': 0,
+        'bytes': 0,
+        'download_seconds': 0.0,
+        'started': time.perf_counter(),
+    }
+
+
+def run_stream(notifications, output_dir: str = None, workers: int = DEFAULT_WORKERS,
+               max_pending: int = None, gzip_output: bool = False, stats: dict = None,
+               progress_every: int = 100, index=None, cache=None, redactor=None) -> dict:
+    """
+    Process a long-running stream of notifications.
+    
+    One pooled session is shared for the whole run and auth headers are
+    refreshed from the MSAL token cache every few minutes. At most
+    max_pending downloads are in flight; once that is reached the reader
+    blocks until one completes, so a fast producer cannot queue unbounded work.
+    The most recent SEEN_TRANSCRIPTS_MAX transcript IDs of this run are
+    skipped if they come up again while in flight or after succeeding; a
+    failed one (often a brief 404/5xx before the transcript is ready) is
+    fetched again when redelivered. Ones fetched in earlier runs are
+    served from ``cache`` (a TranscriptCache). Saved files
+    are added to ``index`` (a TranscriptIndex) as they complete, after
+    ``redactor`` (a transcript_redaction.Redactor) has sanitized them.
+    """
+    stats = stats or new_stream_stats()
+    max_pending = max_pending or workers * 4
+    session = get_graph_session(pool_size=workers)
+    headers = get_graph_headers()
+    headers_at = time.monotonic()
+    seen_transcripts = OrderedDict()
+    pending = set()
+    
+    def reap(futures):
+        for future in futures:
+            r = future.result()
+            if r['error'] is None:
+                stats['succeeded'] += 1
+                stats['cached'] += r['cached']
+                stats['bytes'] += r['bytes']
+                if index is not None and r['path']:
+                    index_transcript(index, r)
+            else:
+                stats['failed'] += 1
+                # Let a redelivered notification retry it
+                seen_transcripts.pop(r['transcript_id'], None)
+                print(f"   ❌ {r['transcript_id'][:40]}: HTTP {r['status']} {r['error'][:200]}")
+            stats['download_seconds'] += r['seconds']
+            done = stats['succeeded'] + stats['failed']
+            if progress_every and done % progress_every == 0:
+                print_stream_stats(stats, in_flight=len(pending), final=False)
+    
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        try:
+            for notification in notifications:
+                stats['notifications'] += 1
+                parsed_list = parse_notification(notification, verbose=False)
+                if not parsed_list:
+                    stats['skipped'] += 1
+                    continue
+                
+                if time.monotonic() - headers_at > HEADER_REFRESH_SECONDS:
+                    headers = get_graph_headers()
+                    headers_at = time.monotonic()
+                
+                for parsed in parsed_list:
+                    if parsed['transcript_id'] in seen_transcripts:
+                        seen_transcripts.move_to_end(parsed['transcript_id'])
+                        stats['duplicates'] += 1
+                        continue
+                    seen_transcripts[parsed['transcript_id']] = None
+                    if len(seen_transcripts) > SEEN_TRANSCRIPTS_MAX:
+                        seen_transcripts.popitem(last=False)
+                    
+                    # Backpressure: block the reader while the window is full
+                    while len(pending) >= max_pending:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        reap(done)
+                    
+                    pending.add(pool.submit(fetch_transcript, parsed, output_dir, session, headers, gzip_output,
+                                             cache, redactor))
+                    stats['queued'] += 1
+        except KeyboardInterrupt:
+            print(f"\n⏹️  Interrupted, waiting for {len(pending)} in-flight download(s)...")
+        
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            reap(done)
+    
+    return stats
+
+
+def print_stream_stats(stats: dict, in_flight: int = 0, final: bool = True):
+    """Print throughput statistics for a --stream run."""
+    elapsed = time.perf_counter() - stats['started']
+    done = stats['succeeded'] + stats['failed']
+    per_second = done / elapsed if elapsed else 0
+    mib_per_second = stats['bytes'] / elapsed / 1024 / 1024 if elapsed else 0
+    
+    if not final:
+        print(f"   ⏱️  {done:,} done ({stats['failed']:,} failed), {in_flight} in flight, "
+              f"{per_second:.1f} transcripts/s, {mib_per_second:.2f} MiB/s")
+        return
+    
+    avg = stats['download_seconds'] / done if done else 0
+    print(f"\n📊 Stream summary:")
+    if stats['files']:
+        print(f"   Files read: {stats['files']:,}")
+    print(f"   Notifications: {stats['notifications']:,} "
+          f"({stats['skipped']:,} without transcripts, {stats['invalid_lines']:,} malformed)")
+    print(f"   Transcripts: {stats['succeeded']:,}/{stats['queued']:,} succeeded, "
+          f"{stats['failed']:,} failed, {stats['duplicates']:,} duplicates skipped")
+    if stats['cached']:
+        print(f"   Served from cache: {stats['cached']:,}")
+    print(f"   Bytes: {stats['bytes']:,}")
+    print(f"   Wall time: {elapsed:.1f}s (avg download {avg:.2f}s)")
+    print(f"   Throughput: {per_second:.1f} transcripts/s, {mib_per_second:.2f} MiB/s, "
+          f"{stats['notifications'] / elapsed if elapsed else 0:.1f} notifications/s")
+
+
+def open_index(args):
+    """Open the --index search index, if one was requested."""
+    if not args.index:
+        return None
+    from transcript_index import TranscriptIndex
+    return TranscriptIndex(args.index)
+
+
+def open_transcript_cache(args):
+    """Open the --cache transcript cache (or TRANSCRIPT_CACHE_DIR), if configured."""
+    from transcript_cache import open_cache
+    return open_cache(args.cache, args.cache_max_mb)
+
+
+def open_redactor(args):
+    """Redactor for --redact / --redact-terms, if requested."""
+    if not (args.redact or args.redact_terms):
         return None
+    from transcript_redaction import open_redactor as build_redactor
+    return build_redactor(args.redact_terms)
+
+
+def index_transcript(index, result: dict) -> bool:
+    """Add a saved transcript to the search index; failures are reported, not raised."""
+    try:
+        index.add_file(result['path'], name=result['transcript_id'])
+        return True
+    except Exception as e:
+        print(f"   ⚠️  Failed to index {result['path']}: {e}", file=sys.stderr)
+        return False
+
+
+def stream_main(args):
+    print("🎯 Transcript Notification Processor (stream mode)")
+    print("=" * 80)
+    if not args.output:
+        print("⚠️  No --output given: transcripts are downloaded and discarded")
+    
+    stats = new_stream_stats()
+    if args.watch:
+        print(f"👀 Watching {args.watch} for .json/.ndjson files...")
+        notifications = iter_watch_directory(args.watch, stats, idle_exit=args.idle_exit)
+    else:
+        print("📥 Reading NDJSON notifications from stdin...")
+        notifications = iter_ndjson(sys.stdin, stats)
+    
+    index = open_index(args)
+    cache = open_transcript_cache(args)
+    try:
+        run_stream(notifications, output_dir=args.output, workers=args.workers,
+                   max_pending=args.max_pending, gzip_output=args.gzip, stats=stats, index=index,
+                   cache=cache, redactor=open_redactor(args))
+    finally:
+        if index is not None:
+            index.close()
+        if cache is not None:
+            cache.close()
+    print_stream_stats(stats)
+    return 0 if stats['failed'] == 0 else 1
 
 
 def main():
@@ -146,15 +618,59 @@ Examples:
   
   # Save transcripts to directory
   python process_transcript_notification.py notification.json --output ./transcripts
+  
+  # Gzip saved transcripts and download up to 16 at once
+  python process_transcript_notification.py notification.json -o ./transcripts --gzip -w 16
+  
+  # Backfill: NDJSON notifications on stdin, one process, one token
+  python process_transcript_notification.py --stream -o ./transcripts < notifications.ndjson
+  
+  # Keep a search index up to date as transcripts arrive
+  python process_transcript_notification.py --stream -o ./transcripts --index ./transcripts.index.sqlite
+  
+  # Watch a directory for new .json/.ndjson files, exit after 60s idle
+  python process_transcript_notification.py --stream --watch ./inbox -o ./transcripts --idle-exit 60
+  
+  # Redact PII (plus names listed in pii-terms.txt) from saved transcripts
+  python process_transcript_notification.py notification.json -o ./transcripts --redact-terms pii-terms.txt
+  
+  # Re-runs serve transcripts fetched before from a local cache
+  python process_transcript_notification.py --stream -o ./transcripts --cache ~/.cache/tmf-transcripts
         """
     )
     
     parser.add_argument('file', nargs='?', help='Path to notification JSON file')
     parser.add_argument('--json', help='Notification JSON string (use "-" for stdin)')
-    parser.add_argument('--output', '-o', help='Directory to save transcript files')
+    parser.add_argument('--output', '-o', help='Directory to save transcript files (streamed to disk)')
+    parser.add_argument('--workers', '-w', type=int, default=DEFAULT_WORKERS,
+                        help=f'Concurrent transcript downloads (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--gzip', action='store_true', help='Gzip transcript files written to --output')
+    parser.add_argument('--index', metavar='PATH',
+                        help='Add saved transcripts to this search index (see search-transcripts.py)')
+    parser.add_argument('--cache', metavar='DIR',
+                        help='Reuse transcripts fetched before from this cache (default: $TRANSCRIPT_CACHE_DIR)')
+    parser.add_argument('--cache-max-mb', type=float, default=None,
+                        help='Evict least recently used cached transcripts beyond this size (default: 1024)')
+    parser.add_argument('--redact', action='store_true',
+                        help='Redact PII (emails, phone/card numbers, ...) from saved transcripts')
+    parser.add_argument('--redact-terms', metavar='PATH',
+                        help='Also redact the dictionary terms in PATH (implies --redact)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Long-running mode: read NDJSON notifications from stdin (or --watch)')
+    parser.add_argument('--watch', metavar='DIR', help='With --stream, watch DIR for new .json/.ndjson files')
+    parser.add_argument('--idle-exit', type=float, default=None,
+                        help='With --watch, exit after this many seconds without new files')
+    parser.add_argument('--max-pending', type=int, default=None,
+                        help='With --stream, max downloads in flight before reading pauses (default: 4 x workers)')
     
     args = parser.parse_args()
     
+    if args.index and not args.output:
+        parser.error('--index requires --output')
+    
+    if args.stream:
+        return stream_main(args)
+    
     print("🎯 Transcript Notification Processor")
     print("=" * 80)
     
@@ -183,27 +699,46 @@ Examples:
     
     print(f"\n✅ Found {len(parsed_list)} transcript(s)")
     
-    # Fetch each transcript
-    for idx, parsed in enumerate(parsed_list, 1):
+    # Fetch all transcripts concurrently
+    print(f"\n📄 Fetching {len(parsed_list)} transcript(s) with up to {args.workers} workers...")
+    cache = open_transcript_cache(args)
+    try:
+        results, summary = fetch_transcripts(
+            parsed_list, output_dir=args.output, workers=args.workers, gzip_output=args.gzip, cache=cache,
+            redactor=open_redactor(args)
+        )
+    finally:
+        if cache is not None:
+            cache.close()
+    
+    for idx, result in enumerate(results, 1):
+        if result['error'] is not None:
+            continue
         print(f"\n{'=' * 80}")
-        print(f"Processing transcript {idx}/{len(parsed_list)}")
+        print(f"Transcript {idx}/{len(results)}: {result['transcript_id']}")
         print('=' * 80)
         
-        content = fetch_transcript(parsed, output_dir=args.output)
-        
-        if content:
-            # Show preview
-            lines = content.split('\n')
-            preview_lines = min(20, len(lines))
-            print(f"\n📝 Preview (first {preview_lines} lines):")
-            print("-" * 80)
-            print('\n'.join(lines[:preview_lines]))
-            if len(lines) > preview_lines:
-                print(f"... ({len(lines) - preview_lines} more lines)")
-            print("-" * 80)
+        # Show preview
+        preview, total_lines = read_preview(result)
+        print(f"\n📝 Preview (first {len(preview)} lines):")
+        print("-" * 80)
+        print('\n'.join(preview))
+        if total_lines is None:
+            print("... (more lines)")
+        elif total_lines > len(preview):
+            print(f"... ({total_lines - len(preview)} more lines)")
+        print("-" * 80)
+    
+    print_summary(summary)
+    
+    index = open_index(args)
+    if index is not None:
+        with index:
+            indexed = sum(index_transcript(index, r) for r in results if r['path'])
+        print(f"   Indexed: {indexed} transcript(s) into {args.index}")
     
     print("\n✅ All transcripts processed!")
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,265 @@
+"""
+Recording Downloader
+Resumable, parallel HTTP Range download for large meeting recordings
+
+The recording is split into fixed-size chunks that are fetched concurrently
+with ``Range: bytes=a-b`` requests and written straight to their offset in a
+preallocated ``<dest>.part`` file. Completed chunks are recorded in a
+``<dest>.progress.json`` sidecar, so an interrupted download resumes with
+only the missing chunks. The file is renamed into place once every chunk is
+present and the size matches the server's.
+
+Graph's recording /content endpoint usually redirects to a pre-authenticated
+download URL; chunks go to that URL directly, and it is re-resolved if it
+expires mid-download (aborting if the recording changed in the meantime).
+Connection errors, short reads, 429 and 5xx are retried with backoff; other
+HTTP errors fail the chunk at once. Servers that ignore Range fall back to
+one stream.
+
+    downloader = RangeDownloader(session, content_url, "meeting.mp4")
+    result = downloader.run()
+"""
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from auth_helper import get_graph_headers
+
+DEFAULT_CHUNK_SIZE = 16 * 1024 * 1024
+DEFAULT_WORKERS = 8
+READ_SIZE = 1024 * 1024
+MAX_RETRIES = 5
+
+# Throttling and transient server errors, as in auth_helper.graph_get
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+NETWORK_ERRORS = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+
+
+class DownloadError(Exception):
+    pass
+
+
+class TransientError(DownloadError):
+    """A chunk failure worth retrying: throttling, 5xx or a short read."""
+
+
+def preallocate(path: str, size: int) -> None:
+    """Create path at its final size (allocating the blocks where the OS supports it)."""
+    with open(path, "ab") as f:
+        if hasattr(os, "posix_fallocate") and size:
+            try:
+                os.posix_fallocate(f.fileno(), 0, size)
+                return
+            except OSError:
+                pass  # e.g. filesystems without fallocate support
+        f.truncate(size)
+
+
+class RangeDownloader:
+    """Download one URL into dest with parallel Range requests and a resumable sidecar."""
+
+    def __init__(self, session, url: str, dest: str, workers: int = DEFAULT_WORKERS,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, headers: Optional[Callable[[], Dict]] = None,
+                 progress: Optional[Callable[[Dict], None]] = None):
+        self.session = session
+        self.url = url
+        self.dest = dest
+        self.part = dest + ".part"
+        self.sidecar = dest + ".progress.json"
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.headers = headers or get_graph_headers
+        self.progress = progress
+        self._lock = threading.Lock()
+        self._download_url: Optional[str] = None
+        self._download_auth = True
+        self.size: Optional[int] = None
+        self.validator: Optional[str] = None
+
+    # ---- probing -------------------------------------------------------------
+
+    def _resolve(self) -> Tuple[str, bool, Optional[int], bool, Optional[str]]:
+        """
+        Follow the Graph redirect and probe the size with a one-byte range.
+        Returns (download URL, whether it takes the bearer token, size or None
+        if unknown, whether ranges are supported, ETag/Last-Modified validator).
+        """
+        response = self.session.get(self.url, headers={**self.headers(), "Range": "bytes=0-0"},
+                                    allow_redirects=False, stream=True, timeout=60)
+        with response:
+            if response.status_code in (301, 302, 303, 307, 308):
+                # Pre-authenticated URL: send no bearer token to the storage host
+                url, auth = response.headers["Location"], False
+                response = self.session.get(url, headers={"Range": "bytes=0-0"}, stream=True, timeout=60)
+            else:
+                url, auth = self.url, True
+            with response:
+                if response.status_code not in (200, 206):
+                    raise DownloadError(f"HTTP {response.status_code}: {response.text[:300]}")
+                validator = response.headers.get("ETag") or response.headers.get("Last-Modified")
+                if response.status_code == 206:
+                    content_range = response.headers.get("Content-Range", "")
+                    total = content_range.rpartition("/")[2]
+                    if total.isdigit():
+                        return url, auth, int(total), True, validator
+                length = response.headers.get("Content-Length")
+                return url, auth, (int(length) if length and length.isdigit() else None), False, validator
+
+    def _refresh_download_url(self, expired: str) -> None:
+        """Resolve a fresh pre-authenticated URL, unless another worker already has."""
+        with self._lock:
+            if self._download_url != expired:
+                return
+            url, auth, size, _, validator = self._resolve()
+            if size != self.size or validator != self.validator:
+                # Chunks from two versions must not end up in one file
+                raise DownloadError(f"recording changed during download (size {self.size} -> {size}, "
+                                    f"validator {self.validator} -> {validator}); re-run to start over")
+            self._download_url, self._download_auth = url, auth
+
+    def _request_headers(self, extra: Dict) -> Dict:
+        if self._download_auth:
+            return {**self.headers(), **extra}
+        return extra
+
+    # ---- sidecar --------------------------------------------------------------
+
+    def _load_progress(self) -> List[int]:
+        """Chunk indices already on disk, if the sidecar matches this download."""
+        if not (os.path.exists(self.sidecar) and os.path.exists(self.part)):
+            return []
+        try:
+            with open(self.sidecar, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return []
+        if (state.get("size") != self.size or state.get("chunk_size") != self.chunk_size
+                or state.get("validator") != self.validator):
+            return []  # the recording changed, or different chunking: start over
+        return sorted(set(state.get("done", [])))
+
+    def _save_progress(self, done: set) -> None:
+        state = {"url": self.url, "size": self.size, "chunk_size": self.chunk_size,
+                 "validator": self.validator, "done": sorted(done), "updated_at": time.time()}
+        tmp = self.sidecar + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.sidecar)
+
+    # ---- chunks ---------------------------------------------------------------
+
+    def _fetch_chunk(self, index: int) -> int:
+        start = index * self.chunk_size
+        end = min(start + self.chunk_size, self.size) - 1
+        expected = end - start + 1
+        last_error = None
+        for attempt in range(MAX_RETRIES):
+            written = 0
+            delay = min(2 ** attempt, 30)
+            try:
+                url = self._download_url
+                response = self.session.get(url, headers=self._request_headers({"Range": f"bytes={start}-{end}"}),
+                                            stream=True, timeout=60)
+                with response:
+                    if response.status_code in (401, 403) and not self._download_auth:
+                        # Pre-authenticated URL expired: resolve a fresh one and retry at once
+                        self._refresh_download_url(url)
+                        last_error = DownloadError(f"HTTP {response.status_code} (download URL refreshed)")
+                        continue
+                    if response.status_code in RETRY_STATUSES:
+                        retry_after = response.headers.get("Retry-After")
+                        if retry_after and retry_after.isdigit():
+                            delay = float(retry_after)
+                        raise TransientError(f"HTTP {response.status_code} for bytes {start}-{end}")
+                    if response.status_code != 206:
+                        raise DownloadError(f"HTTP {response.status_code} for bytes {start}-{end}")
+                    with open(self.part, "r+b") as f:
+                        f.seek(start)
+                        for block in response.iter_content(chunk_size=READ_SIZE):
+                            written += len(block)
+                            if written > expected:
+                                raise DownloadError(f"chunk {index}: server sent more than {expected} bytes")
+                            f.write(block)
+                if written != expected:
+                    raise TransientError(f"chunk {index}: got {written} of {expected} bytes")
+                return expected
+            except (TransientError,) + NETWORK_ERRORS as e:
+                last_error = e
+                time.sleep(delay)
+        raise DownloadError(f"chunk {index} failed after {MAX_RETRIES} attempts: {last_error}")
+
+    def _single_stream(self) -> int:
+        """Fallback for servers without Range support: one sequential stream."""
+        written = 0
+        with self.session.get(self._download_url, headers=self._request_headers({}), stream=True,
+                              timeout=60) as response:
+            if response.status_code != 200:
+                raise DownloadError(f"HTTP {response.status_code}: {response.text[:300]}")
+            with open(self.part, "wb") as f:
+                for block in response.iter_content(chunk_size=READ_SIZE):
+                    f.write(block)
+                    written += len(block)
+        if self.size is not None and written != self.size:
+            raise DownloadError(f"got {written} of {self.size} bytes")
+        return written
+
+    def run(self) -> Dict:
+        """Download (or resume) into dest. Returns size, bytes fetched, chunks, seconds and resumed flag."""
+        started = time.perf_counter()
+        self._download_url, self._download_auth, self.size, ranged, self.validator = self._resolve()
+        result = {"path": self.dest, "size": self.size, "fetched": 0, "chunks": 0, "resumed_chunks": 0,
+                  "ranged": ranged, "seconds": 0.0}
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.dest)), exist_ok=True)
+        if not ranged or not self.size:
+            result["fetched"] = self._single_stream()
+            result["size"] = result["fetched"]
+        else:
+            chunks = -(-self.size // self.chunk_size)
+            done = set(self._load_progress())
+            if not done:
+                if os.path.exists(self.part):
+                    os.remove(self.part)
+                preallocate(self.part, self.size)
+            result["chunks"] = chunks
+            result["resumed_chunks"] = len(done)
+            todo = [i for i in range(chunks) if i not in done]
+            self._save_progress(done)
+
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                pending = {pool.submit(self._fetch_chunk, i): i for i in todo[:self.workers * 2]}
+                queue = iter(todo[self.workers * 2:])
+                try:
+                    while pending:
+                        finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            index = pending.pop(future)
+                            result["fetched"] += future.result()
+                            done.add(index)
+                            self._save_progress(done)
+                            if self.progress:
+                                self.progress({"done": len(done), "chunks": chunks, "fetched": result["fetched"],
+                                               "size": self.size, "seconds": time.perf_counter() - started})
+                            nxt = next(queue, None)
+                            if nxt is not None:
+                                pending[pool.submit(self._fetch_chunk, nxt)] = nxt
+                except BaseException:
+                    # Keep the sidecar and .part for resume; drop queued chunks
+                    for future in pending:
+                        future.cancel()
+                    raise
+
+            actual = os.path.getsize(self.part)
+            if len(done) != chunks or actual != self.size:
+                raise DownloadError(f"size check failed: {actual} bytes on disk, expected {self.size}")
+
+        os.replace(self.part, self.dest)
+        if os.path.exists(self.sidecar):
+            os.remove(self.sidecar)
+        result["seconds"] = time.perf_counter() - started
+        return result
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Redact PII from saved transcripts.
+
+Streams each .vtt / .vtt.gz file cue by cue through transcript_redaction:
+dictionary terms (one Aho-Corasick automaton) plus structured PII (one
+combined regex). Timing lines, cue identifiers and the WEBVTT header are
+left exactly as they were.
+
+Usage:
+    # Redact a directory in place
+    python redact-transcripts.py ./transcripts --terms pii-terms.txt
+
+    # Write redacted copies elsewhere, pseudonymizing speaker names
+    python redact-transcripts.py ./transcripts -o ./redacted --speakers pseudonymize
+
+    # Benchmark: redacted MB/s vs one regex per pattern/term
+    python redact-transcripts.py --bench --bench-terms 2000
+
+pii-terms.txt holds one term per line, optionally followed by a tab and a
+label (e.g. "Project Falcon<TAB>PROJECT"); the default label is TERM.
+"""
+
+import argparse
+import io
+import os
+import random
+import re
+import sys
+import time
+
+from transcript_index import TRANSCRIPT_SUFFIXES
+from transcript_redaction import DEFAULT_PATTERNS, Redactor, load_terms, redact_file, redact_vtt
+
+SPEAKER_STYLES = ('keep', 'pseudonymize', 'redact')
+
+
+def iter_inputs(inputs):
+    """Yield (input root, path) for every transcript; --output mirrors each path relative to its root."""
+    for item in inputs:
+        if os.path.isfile(item):
+            yield os.path.dirname(item), item
+            continue
+        for root, _, files in os.walk(item):
+            for filename in sorted(files):
+                if filename.endswith(TRANSCRIPT_SUFFIXES):
+                    yield item, os.path.join(root, filename)
+
+
+def cmd_redact(args) -> int:
+    terms = load_terms(args.terms) if args.terms else []
+    redactor = Redactor(terms=terms)
+    print(f"🕶️  Redacting with {len(terms):,} dictionary term(s) and {len(DEFAULT_PATTERNS)} PII pattern(s)")
+
+    files = failed = 0
+    size = 0
+    written_to = set()
+    started = time.perf_counter()
+    for base, path in iter_inputs(args.inputs):
+        dest = None
+        if args.output:
+            dest = os.path.join(args.output, os.path.relpath(path, base or os.curdir))
+            if dest in written_to:
+                # Same relative path under two inputs; never overwrite the first copy
+                failed += 1
+                print(f"   ❌ {path}: {dest} already written from another input")
+                continue
+            written_to.add(dest)
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+        try:
+            written = redact_file(path, redactor, dest, speakers=args.speakers)
+        except (OSError, UnicodeDecodeError, EOFError) as e:
+            failed += 1
+            print(f"   ❌ {path}: {e}")
+            continue
+        files += 1
+        size += os.path.getsize(path)
+        if args.verbose:
+            print(f"   ✅ {written}")
+    elapsed = time.perf_counter() - started
+
+    print(f"\n📊 Redacted {files:,} transcript(s) in {elapsed:.1f}s "
+          f"({size / elapsed / 1_000_000 if elapsed else 0:.2f} MB/s on disk)")
+    for label, count in redactor.counts.most_common():
+        print(f"   {label}: {count:,}")
+    if failed:
+        print(f"   ❌ Failed: {failed}")
+    return 0 if failed == 0 else 1
+
+
+# ---- benchmark -------------------------------------------------------------
+
+WORDS = ("the we should ship next sprint budget review customer latency dashboard "
+         "action item follow up agreed blocker deploy rollback metrics team").split()
+FIRST = ["Alice", "Bob", "Carol", "Dave", "Eve", "Frank", "Grace", "Heidi", "Ivan", "Judy", "Mallory", "Oscar"]
+
+
+def synthetic_terms(count: int, rng: random.Random) -> list:
+    terms = set()
+    while len(terms) < count:
+        terms.add(f"{rng.choice(FIRST)} {rng.choice(['Smith', 'Jones', 'Nguyen', 'Li', 'Garcia'])}{rng.randint(1, 9999)}")
+    return [(t, "NAME") for t in sorted(terms)]
+
+
+def synthetic_vtt(cues: int, terms: list, rng: random.Random) -> str:
+    out = io.StringIO()
+    out.write("WEBVTT\n\n")
+    t = 0
+    for n in range(cues):
+        start, t = t, t + rng.randint(1000, 6000)
+        out.write(f"s/{n}-0\n{start // 3600000:02d}:{start // 60000 % 60:02d}:{start // 1000 % 60:02d}.{start % 1000:03d}"
+                  f" --> {t // 3600000:02d}:{t // 60000 % 60:02d}:{t // 1000 % 60:02d}.{t % 1000:03d}\n")
+        words = rng.choices(WORDS, k=rng.randint(6, 16))
+        roll = rng.random()
+        if roll < 0.05:
+            words.insert(rng.randrange(len(words)), f"{rng.choice(FIRST).lower()}@contoso.com")
+        elif roll < 0.08:
+            words.insert(rng.randrange(len(words)), f"425-555-{rng.randint(0, 9999):04d}")
+        elif roll < 0.15 and terms:
+            words.insert(rng.randrange(len(words)), rng.choice(terms)[0])
+        out.write(f"<v {rng.choice(FIRST)}>{' '.join(words)}</v>\n\n")
+    return out.getvalue()
+
+
+def naive_redact(content: str, regexes: list) -> str:
+    """One compiled regex per pattern and per term, applied one after another."""
+    for regex, replacement in regexes:
+        content = regex.sub(replacement, content)
+    return content
+
+
+def cmd_bench(args) -> int:
+    rng = random.Random(7)
+    terms = synthetic_terms(args.bench_terms, rng)
+    content = synthetic_vtt(args.bench_cues, terms, rng)
+    size_mb = len(content.encode("utf-8")) / 1_000_000
+    print(f"🏁 {args.bench_cues:,} cues ({size_mb:.1f} MB), {len(terms):,} dictionary terms, "
+          f"{len(DEFAULT_PATTERNS)} patterns")
+
+    build_started = time.perf_counter()
+    redactor = Redactor(terms=terms)
+    build_s = time.perf_counter() - build_started
+
+    def run_engine():
+        sink = io.StringIO()
+        redact_vtt(content, sink, redactor)
+        return sink.getvalue()
+
+    naive = [(re.compile(regex), f"[{label}]") for label, regex in DEFAULT_PATTERNS]
+    naive += [(re.compile(r"\b" + re.escape(term) + r"\b", re.IGNORECASE), f"[{label}]") for term, label in terms]
+
+    results = []
+    for name, fn in (("automaton + combined regex", run_engine),
+                     ("one regex per pattern/term", lambda: naive_redact(content, naive))):
+        best = float("inf")
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - started)
+        results.append((name, best))
+
+    print(f"\n{'engine':<28} {'seconds':>8} {'MB/s':>8}")
+    for name, seconds in results:
+        print(f"{name:<28} {seconds:>8.3f} {size_mb / seconds:>8.2f}")
+    print(f"\nAutomaton build: {build_s * 1000:.1f} ms; speedup {results[1][1] / results[0][1]:.1f}x")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Redact PII from transcripts while keeping VTT timing intact',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python redact-transcripts.py ./transcripts --terms pii-terms.txt
+  python redact-transcripts.py ./transcripts -o ./redacted --speakers pseudonymize
+  python redact-transcripts.py --bench --bench-terms 5000 --bench-cues 50000
+        """
+    )
+    parser.add_argument('inputs', nargs='*', help='Directories (recursive) or .vtt/.vtt.gz files')
+    parser.add_argument('--terms', metavar='PATH', help='Dictionary terms file (term[<TAB>LABEL] per line)')
+    parser.add_argument('--output', '-o', help='Write redacted copies here instead of redacting in place')
+    parser.add_argument('--speakers', choices=SPEAKER_STYLES, default='keep',
+                        help='Voice-tag speaker names: keep, pseudonymize ("Speaker N") or redact')
+    parser.add_argument('--verbose', '-v', action='store_true', help='List every file written')
+    parser.add_argument('--bench', action='store_true', help='Benchmark on a synthetic transcript')
+    parser.add_argument('--bench-terms', type=int, default=1000, help='Dictionary terms for --bench (default: 1000)')
+    parser.add_argument('--bench-cues', type=int, default=20000, help='Cues for --bench (default: 20,000)')
+    parser.add_argument('--repeat', type=int, default=3, help='Best-of repeats for --bench (default: 3)')
+    args = parser.parse_args()
+
+    if args.bench:
+        return cmd_bench(args)
+    if not args.inputs:
+        parser.error('give transcript files/directories, or --bench')
+    return cmd_redact(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Index and search fetched transcripts.
+
+Builds an incremental inverted index (see transcript_index.py) over the .vtt
+and .vtt.gz files written by 05-fetch-transcript.py --output and
+process_transcript_notification.py -o, then answers keyword and phrase
+queries with links back to the exact cue time.
+
+Usage:
+    # Index (or re-index new/changed files in) a transcripts directory
+    python search-transcripts.py index ./transcripts
+
+    # Keyword (AND) and phrase queries
+    python search-transcripts.py search budget review
+    python search-transcripts.py search '"ship next sprint"' rollback
+
+    # Index statistics
+    python search-transcripts.py stats
+"""
+
+import argparse
+import sys
+import time
+
+from transcript_index import TranscriptIndex
+from vtt_parser import format_timestamp
+
+DEFAULT_INDEX = "transcripts.index.sqlite"
+
+
+def cmd_index(index: TranscriptIndex, args) -> int:
+    print(f"📚 Indexing {', '.join(args.directories)} into {args.index}...")
+    started = time.perf_counter()
+
+    def progress(stats):
+        if stats["indexed"] % 500 == 0:
+            print(f"   ... {stats['indexed']:,} indexed, {stats['unchanged']:,} unchanged")
+
+    stats = index.update(args.directories, prune=args.prune, progress=progress)
+    elapsed = time.perf_counter() - started
+    rate = stats["indexed"] / elapsed if elapsed else 0
+    print(f"\n✅ Scanned {stats['scanned']:,} transcript(s) in {elapsed:.1f}s")
+    print(f"   Indexed: {stats['indexed']:,} ({rate:.1f}/s)")
+    print(f"   Unchanged: {stats['unchanged']:,}")
+    if stats["pruned"]:
+        print(f"   Pruned: {stats['pruned']:,}")
+    if stats["failed"]:
+        print(f"   ❌ Failed: {stats['failed']:,}")
+    return 0 if stats["failed"] == 0 else 1
+
+
+def cmd_search(index: TranscriptIndex, args) -> int:
+    query = " ".join(args.query)
+    started = time.perf_counter()
+    hits = list(index.search(query, limit=args.limit))
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    if not hits:
+        print(f"🔍 No matches for {query!r} ({elapsed_ms:.1f} ms)")
+        return 1
+
+    print(f"🔍 {len(hits)} matching cue(s) for {query!r} ({elapsed_ms:.1f} ms)")
+    current = None
+    for hit in hits:
+        if hit.path != current:
+            current = hit.path
+            print(f"\n📄 {hit.name}")
+            print(f"   {hit.path}")
+        speaker = f"{hit.speaker}: " if hit.speaker else ""
+        print(f"   [{format_timestamp(hit.start_ms)}] {speaker}{hit.text}")
+        if args.links:
+            print(f"      {hit.path}#t={hit.start_ms / 1000:.3f}")
+    return 0
+
+
+def cmd_stats(index: TranscriptIndex, args) -> int:
+    stats = index.stats()
+    print(f"📊 Index: {args.index}")
+    print(f"   Transcripts: {stats['documents']:,}")
+    print(f"   Cues: {stats['cues']:,}")
+    print(f"   Tokens: {stats['tokens']:,}")
+    print(f"   Distinct terms: {stats['terms']:,}")
+    print(f"   Size: {stats['bytes'] / 1024 / 1024:.1f} MiB")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Index and search fetched transcripts',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python search-transcripts.py index ./transcripts --prune
+  python search-transcripts.py search quarterly budget
+  python search-transcripts.py search '"action item"' --links
+        """
+    )
+    parser.add_argument('--index', default=DEFAULT_INDEX, help=f'Index file (default: {DEFAULT_INDEX})')
+    subparsers = parser.add_subparsers(dest='command', help='Command')
+
+    index_parser = subparsers.add_parser('index', help='Index new or changed transcripts')
+    index_parser.add_argument('directories', nargs='+', help='Directories holding .vtt / .vtt.gz files')
+    index_parser.add_argument('--prune', action='store_true', help='Drop transcripts whose files were deleted')
+
+    search_parser = subparsers.add_parser('search', help='Search indexed transcripts')
+    search_parser.add_argument('query', nargs='+', help='Words (AND) and "quoted phrases"')
+    search_parser.add_argument('--limit', '-l', type=int, default=50, help='Maximum cues to show (default: 50)')
+    search_parser.add_argument('--links', action='store_true', help='Print path#t=seconds links for each cue')
+
+    subparsers.add_parser('stats', help='Show index statistics')
+
+    args = parser.parse_args()
+    if not args.command:
+        parser.print_help()
+        return 1
+
+    commands = {'index': cmd_index, 'search': cmd_search, 'stats': cmd_stats}
+    with TranscriptIndex(args.index) as index:
+        return commands[args.command](index, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
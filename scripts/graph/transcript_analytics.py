@@ -0,0 +1,195 @@
+"""
+Transcript Analytics
+Vectorized per-meeting conversation metrics over parsed cue arrays
+
+Every metric is computed with whole-array NumPy operations on a meeting's
+columns (start/end ms, speaker ids, words per cue), with no Python loop over
+cues:
+
+- talk time per speaker: bincount of cue durations by speaker
+- speech / silence: union of cue intervals via a running maximum of ends
+- silence gaps: gaps between merged speech segments above a threshold
+- overlap: sweep over +1/-1 start/end events, time with 2+ cues active
+- words per minute: words per cue from the UTF-8 text buffer, reduced by
+  cue offsets, over talk time
+
+Inputs are CompactTranscript objects (.tct files or parsed .vtt) or the
+Parquet / Arrow parts written by convert-vtt-columnar.py.
+
+    row = analyze_compact(CompactTranscript.open("meeting.tct"))
+"""
+import json
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_SILENCE_MS = 2000
+
+# Bytes that separate words in the UTF-8 text buffer
+_SPACE = np.zeros(256, dtype=bool)
+_SPACE[[9, 10, 11, 12, 13, 32]] = True
+
+
+def word_counts(text: bytes, offsets: np.ndarray) -> np.ndarray:
+    """Words per cue, given the concatenated UTF-8 text and n+1 cue offsets."""
+    n = len(offsets) - 1
+    if n <= 0:
+        return np.zeros(0, dtype=np.int64)
+    data = np.frombuffer(text, dtype=np.uint8)
+    if data.size == 0:
+        return np.zeros(n, dtype=np.int64)
+    word = ~_SPACE[data]
+    previous = np.empty_like(word)
+    previous[0] = False
+    previous[1:] = word[:-1]
+    # A cue boundary always starts a new word
+    cue_starts = offsets[:-1].astype(np.int64)
+    previous[cue_starts[cue_starts < data.size]] = False
+    cumulative = np.zeros(data.size + 1, dtype=np.int64)
+    np.cumsum(word & ~previous, out=cumulative[1:])
+    offsets = offsets.astype(np.int64)
+    return cumulative[offsets[1:]] - cumulative[offsets[:-1]]
+
+
+def _speech_segments(starts: np.ndarray, ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Merged [start, end) segments covering every cue, from cues sorted by start."""
+    running_end = np.maximum.accumulate(ends)
+    new_segment = np.empty(len(starts), dtype=bool)
+    new_segment[0] = True
+    new_segment[1:] = starts[1:] > running_end[:-1]
+    first = np.flatnonzero(new_segment)
+    last = np.append(first[1:] - 1, len(starts) - 1)
+    return starts[first], running_end[last]
+
+
+def _overlap_ms(starts: np.ndarray, ends: np.ndarray) -> int:
+    """Milliseconds during which two or more cues are active."""
+    times = np.concatenate((starts, ends))
+    deltas = np.concatenate((np.ones(len(starts), dtype=np.int64), -np.ones(len(ends), dtype=np.int64)))
+    # At equal times process ends (-1) before starts so touching cues do not overlap
+    order = np.lexsort((deltas, times))
+    times, active = times[order], np.cumsum(deltas[order])
+    spans = np.diff(times)
+    return int(spans[active[:-1] >= 2].sum())
+
+
+def meeting_metrics(starts, ends, speaker_ids, speakers: Sequence[str], words,
+                    meeting_id: Optional[str] = None, silence_ms: int = DEFAULT_SILENCE_MS) -> Dict:
+    """
+    One summary row for a meeting. speaker_ids index ``speakers``; -1 means
+    no speaker. Times are milliseconds; returned durations are seconds.
+    """
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    speaker_ids = np.asarray(speaker_ids, dtype=np.int64)
+    words = np.asarray(words, dtype=np.int64)
+    n = len(starts)
+    row = {"meeting_id": meeting_id, "cues": n}
+    if n == 0:
+        return row
+
+    if np.any(starts[1:] < starts[:-1]):
+        order = np.argsort(starts, kind="stable")
+        starts, ends, speaker_ids, words = starts[order], ends[order], speaker_ids[order], words[order]
+    ends = np.maximum(ends, starts)
+    durations = ends - starts
+
+    seg_starts, seg_ends = _speech_segments(starts, ends)
+    span_ms = int(seg_ends.max() - starts[0])
+    speech_ms = int((seg_ends - seg_starts).sum())
+    gaps = seg_starts[1:] - seg_ends[:-1]
+    long_gaps = gaps[gaps >= silence_ms]
+    overlap_ms = _overlap_ms(starts, ends)
+
+    # Speaker -1 (unknown) lands in bin 0
+    slots = len(speakers) + 1
+    talk_ms = np.bincount(speaker_ids + 1, weights=durations, minlength=slots)
+    speaker_words = np.bincount(speaker_ids + 1, weights=words, minlength=slots)
+    names = ["(unknown)"] + list(speakers)
+    present = np.flatnonzero(talk_ms > 0)
+    total_talk_ms = float(talk_ms.sum())
+    total_words = int(words.sum())
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        wpm = np.where(talk_ms > 0, speaker_words / (talk_ms / 60000.0), 0.0)
+    top = int(present[np.argmax(talk_ms[present])]) if present.size else 0
+    turns = int(np.count_nonzero(speaker_ids[1:] != speaker_ids[:-1])) + 1
+
+    row.update({
+        "duration_s": round(span_ms / 1000, 3),
+        "speakers": int(np.count_nonzero(talk_ms[1:] > 0)),
+        "speech_s": round(speech_ms / 1000, 3),
+        "silence_s": round((span_ms - speech_ms) / 1000, 3),
+        "silence_gaps": int(long_gaps.size),
+        "longest_silence_s": round(int(gaps.max()) / 1000, 3) if gaps.size else 0.0,
+        "overlap_s": round(overlap_ms / 1000, 3),
+        "overlap_pct": round(100.0 * overlap_ms / speech_ms, 2) if speech_ms else 0.0,
+        "words": total_words,
+        "wpm": round(total_words / (total_talk_ms / 60000.0), 1) if total_talk_ms else 0.0,
+        "turns": turns,
+        "top_speaker": names[top],
+        "top_speaker_share": round(float(talk_ms[top]) / total_talk_ms, 3) if total_talk_ms else 0.0,
+        "talk_s_by_speaker": {names[i]: round(float(talk_ms[i]) / 1000, 1) for i in present},
+        "wpm_by_speaker": {names[i]: round(float(wpm[i]), 1) for i in present},
+    })
+    return row
+
+
+def analyze_compact(transcript, meeting_id: Optional[str] = None, silence_ms: int = DEFAULT_SILENCE_MS) -> Dict:
+    """Summary row for a CompactTranscript, using zero-copy views of its columns."""
+    cols = transcript.to_numpy()
+    words = word_counts(transcript.text, cols["offsets"])
+    return meeting_metrics(cols["starts"], cols["ends"], cols["speaker_ids"], transcript.speakers, words,
+                           meeting_id or transcript.meeting_id, silence_ms)
+
+
+def _dictionary_codes(column) -> Tuple[np.ndarray, List[Optional[str]]]:
+    """(int codes with -1 for null, dictionary values) for an Arrow column."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    array = column.combine_chunks() if hasattr(column, "combine_chunks") else column
+    if not pa.types.is_dictionary(array.type):
+        array = pc.dictionary_encode(array)
+    codes = array.indices.fill_null(-1).to_numpy(zero_copy_only=False).astype(np.int64)
+    return codes, array.dictionary.to_pylist()
+
+
+def iter_table_meetings(table) -> Iterator[Tuple[str, Dict]]:
+    """
+    Yield (transcript name, columns) for each transcript in an Arrow table
+    shaped like convert-vtt-columnar.py output (rows grouped by transcript).
+    """
+    import pyarrow.compute as pc
+
+    if table.num_rows == 0:
+        return
+    transcripts, names = _dictionary_codes(table.column("transcript_id"))
+    meetings, meeting_names = _dictionary_codes(table.column("meeting_id"))
+    speakers, speaker_names = _dictionary_codes(table.column("speaker"))
+    starts = table.column("start_ms").to_numpy()
+    ends = table.column("end_ms").to_numpy()
+    words = pc.count_substring_regex(table.column("text").combine_chunks(), r"\S+").to_numpy(zero_copy_only=False)
+
+    boundaries = np.flatnonzero(transcripts[1:] != transcripts[:-1]) + 1
+    bounds = np.concatenate(([0], boundaries, [len(transcripts)]))
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        # Re-number this transcript's speakers densely
+        local, inverse = np.unique(speakers[lo:hi], return_inverse=True)
+        has_none = local.size and local[0] == -1
+        named = local[1:] if has_none else local
+        ids = inverse - 1 if has_none else inverse
+        meeting = meetings[lo]
+        yield names[transcripts[lo]], {
+            "meeting_id": meeting_names[meeting] if meeting >= 0 else None,
+            "starts": starts[lo:hi],
+            "ends": ends[lo:hi],
+            "speaker_ids": ids,
+            "speakers": [speaker_names[i] for i in named],
+            "words": words[lo:hi],
+        }
+
+
+def flatten_row(row: Dict) -> Dict:
+    """Row with the per-speaker dicts JSON-encoded, for CSV output."""
+    return {k: json.dumps(v, ensure_ascii=False) if isinstance(v, dict) else v for k, v in row.items()}
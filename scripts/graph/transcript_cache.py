@@ -0,0 +1,306 @@
+"""
+Transcript Cache
+Content-addressed local store for downloaded transcript content
+
+Entries are keyed by (organizer, meeting ID, transcript ID) and point at a
+gzip blob named by the SHA-256 of the VTT content, so identical content is
+stored once no matter how many keys reference it. A transcript ID that has
+been fetched before is served from disk instead of downloaded again.
+Blobs are evicted least-recently-used first once the store grows past
+max_bytes.
+
+    cache = TranscriptCache("~/.cache/tmf-transcripts", max_bytes=512 * 2**20)
+    content = cache.get(organizer, meeting_id, transcript_id)
+    if content is None:
+        content = download(...)
+        cache.put(organizer, meeting_id, transcript_id, content)
+
+The index is a small SQLite file next to the blobs; the Graph scripts accept
+--cache DIR or read TRANSCRIPT_CACHE_DIR / TRANSCRIPT_CACHE_MAX_MB.
+"""
+import gzip
+import hashlib
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Dict, Optional, Union
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+
+class TranscriptCache:
+    """Size-bounded, content-addressed transcript store with LRU eviction."""
+
+    def __init__(self, root: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = os.path.abspath(os.path.expanduser(root))
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.join(self.root, "objects"), exist_ok=True)
+        # get()/put() are called from download worker threads
+        self.db = sqlite3.connect(os.path.join(self.root, "index.sqlite"), check_same_thread=False)
+        self._lock = threading.Lock()
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                organizer     TEXT NOT NULL,
+                meeting_id    TEXT NOT NULL,
+                transcript_id TEXT NOT NULL,
+                sha256        TEXT NOT NULL,
+                cached_at     REAL NOT NULL,
+                PRIMARY KEY (organizer, meeting_id, transcript_id)
+            );
+            CREATE INDEX IF NOT EXISTS entries_transcript ON entries (meeting_id, transcript_id);
+            CREATE INDEX IF NOT EXISTS entries_sha ON entries (sha256);
+            CREATE TABLE IF NOT EXISTS blobs (
+                sha256       TEXT PRIMARY KEY,
+                size         INTEGER NOT NULL,
+                stored_bytes INTEGER NOT NULL,
+                last_access  REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS blobs_lru ON blobs (last_access);
+        """)
+        self.db.commit()
+        self.stats = {"hits": 0, "misses": 0, "stored": 0, "deduplicated": 0, "evicted": 0}
+
+    # Keys -----------------------------------------------------------------
+
+    @staticmethod
+    def _organizer(organizer: Optional[str]) -> str:
+        # Emails and object IDs are both case-insensitive in Graph
+        return (organizer or "").strip().lower()
+
+    def blob_path(self, sha256: str) -> str:
+        return os.path.join(self.root, "objects", sha256[:2], f"{sha256}.vtt.gz")
+
+    def _lookup(self, organizer: str, meeting_id: str, transcript_id: str) -> Optional[str]:
+        row = self.db.execute(
+            "SELECT sha256 FROM entries WHERE organizer = ? AND meeting_id = ? AND transcript_id = ?",
+            (self._organizer(organizer), meeting_id, transcript_id)).fetchone()
+        if row is None:
+            # The same transcript cached under the organizer's email vs object ID
+            row = self.db.execute(
+                "SELECT sha256 FROM entries WHERE meeting_id = ? AND transcript_id = ? LIMIT 1",
+                (meeting_id, transcript_id)).fetchone()
+        return row[0] if row else None
+
+    def lookup(self, organizer: str, meeting_id: str, transcript_id: str) -> Optional[str]:
+        """Content hash cached for this transcript, or None. Does not touch LRU order."""
+        with self._lock:
+            sha = self._lookup(organizer, meeting_id, transcript_id)
+        if sha and not os.path.exists(self.blob_path(sha)):
+            return None
+        return sha
+
+    def __contains__(self, key: tuple) -> bool:
+        return self.lookup(*key) is not None
+
+    # Reads ----------------------------------------------------------------
+
+    def _hit(self, organizer: str, meeting_id: str, transcript_id: str) -> Optional[tuple]:
+        """(blob path, content size) for a cached transcript, marking it recently used; None on a miss."""
+        with self._lock:
+            sha = self._lookup(organizer, meeting_id, transcript_id)
+            path = self.blob_path(sha) if sha else None
+            if path and not os.path.exists(path):
+                # Blob removed behind our back; forget it
+                self._forget(sha)
+                self.db.commit()
+                path = None
+            if path is None:
+                self.stats["misses"] += 1
+                return None
+            self.db.execute("UPDATE blobs SET last_access = ? WHERE sha256 = ?", (time.time(), sha))
+            self.db.commit()
+            size = self.db.execute("SELECT size FROM blobs WHERE sha256 = ?", (sha,)).fetchone()[0]
+            self.stats["hits"] += 1
+            return path, size
+
+    def _evicted_after_hit(self) -> None:
+        """A blob returned by _hit was evicted by a concurrent put() before it could be read."""
+        with self._lock:
+            self.stats["hits"] -= 1
+            self.stats["misses"] += 1
+
+    def get_bytes(self, organizer: str, meeting_id: str, transcript_id: str) -> Optional[bytes]:
+        hit = self._hit(organizer, meeting_id, transcript_id)
+        if hit is None:
+            return None
+        try:
+            with gzip.open(hit[0], "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            self._evicted_after_hit()
+            return None
+
+    def get(self, organizer: str, meeting_id: str, transcript_id: str) -> Optional[str]:
+        """Cached VTT text, or None on a miss."""
+        data = self.get_bytes(organizer, meeting_id, transcript_id)
+        return data.decode("utf-8", errors="replace") if data is not None else None
+
+    def copy_to(self, organizer: str, meeting_id: str, transcript_id: str, dest: str,
+                gzip_output: bool = False) -> Optional[int]:
+        """
+        Write a cached transcript to dest (gzip or plain) without holding it
+        in memory. Returns the uncompressed size, or None on a miss (including
+        a blob evicted by a concurrent put() between lookup and copy).
+        """
+        hit = self._hit(organizer, meeting_id, transcript_id)
+        if hit is None:
+            return None
+        path, size = hit
+        partial = dest + ".part"
+        try:
+            if gzip_output:
+                # The blob already is gzip
+                shutil.copyfile(path, partial)
+            else:
+                with gzip.open(path, "rb") as src, open(partial, "wb") as dst:
+                    shutil.copyfileobj(src, dst, CHUNK_SIZE)
+            os.replace(partial, dest)
+        except FileNotFoundError:
+            if os.path.exists(partial):
+                os.remove(partial)
+            if os.path.exists(path):
+                raise
+            self._evicted_after_hit()
+            return None
+        except BaseException:
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
+        return size
+
+    # Writes ---------------------------------------------------------------
+
+    def put(self, organizer: str, meeting_id: str, transcript_id: str, content: Union[str, bytes]) -> str:
+        """Cache transcript content; returns its SHA-256."""
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        sha = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(sha)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+            try:
+                with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as f:
+                    f.write(data)
+                os.replace(tmp, path)
+            except BaseException:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+                raise
+        self._record(organizer, meeting_id, transcript_id, sha, len(data), os.path.getsize(path))
+        return sha
+
+    def put_file(self, organizer: str, meeting_id: str, transcript_id: str, source: str) -> str:
+        """Cache a transcript already written to disk (plain or .gz) by streaming it in."""
+        opener = gzip.open if source.endswith(".gz") else open
+        digest = hashlib.sha256()
+        size = 0
+        objects = os.path.join(self.root, "objects")
+        fd, tmp = tempfile.mkstemp(dir=objects, suffix=".part")
+        try:
+            with opener(source, "rb") as src, os.fdopen(fd, "wb") as raw, \
+                    gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as dst:
+                for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                    digest.update(chunk)
+                    dst.write(chunk)
+                    size += len(chunk)
+            sha = digest.hexdigest()
+            path = self.blob_path(sha)
+            if os.path.exists(path):
+                os.remove(tmp)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        self._record(organizer, meeting_id, transcript_id, sha, size, os.path.getsize(path))
+        return sha
+
+    def _record(self, organizer: str, meeting_id: str, transcript_id: str, sha: str,
+                size: int, stored_bytes: int) -> None:
+        now = time.time()
+        with self._lock:
+            existing = self.db.execute("SELECT 1 FROM blobs WHERE sha256 = ?", (sha,)).fetchone()
+            self.stats["deduplicated" if existing else "stored"] += 1
+            self.db.execute(
+                "INSERT OR REPLACE INTO blobs (sha256, size, stored_bytes, last_access) VALUES (?, ?, ?, ?)",
+                (sha, size, stored_bytes, now))
+            self.db.execute(
+                "INSERT OR REPLACE INTO entries (organizer, meeting_id, transcript_id, sha256, cached_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self._organizer(organizer), meeting_id, transcript_id, sha, now))
+            self._evict(keep=sha)
+            self.db.commit()
+
+    # Eviction -------------------------------------------------------------
+
+    def _forget(self, sha: str) -> None:
+        self.db.execute("DELETE FROM entries WHERE sha256 = ?", (sha,))
+        self.db.execute("DELETE FROM blobs WHERE sha256 = ?", (sha,))
+
+    def _evict(self, keep: Optional[str] = None) -> int:
+        """Drop least-recently-used blobs until the store fits max_bytes. Caller holds the lock."""
+        total = self.db.execute("SELECT COALESCE(SUM(stored_bytes), 0) FROM blobs").fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+        evicted = 0
+        rows = self.db.execute("SELECT sha256, stored_bytes FROM blobs ORDER BY last_access").fetchall()
+        for sha, stored_bytes in rows:
+            if total <= self.max_bytes:
+                break
+            if sha == keep:
+                continue
+            try:
+                os.remove(self.blob_path(sha))
+            except FileNotFoundError:
+                pass
+            self._forget(sha)
+            total -= stored_bytes
+            evicted += 1
+        self.stats["evicted"] += evicted
+        return evicted
+
+    def evict(self) -> int:
+        """Enforce max_bytes now; returns the number of blobs removed."""
+        with self._lock:
+            evicted = self._evict()
+            self.db.commit()
+        return evicted
+
+    def summary(self) -> Dict[str, int]:
+        with self._lock:
+            entries = self.db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            blobs, size, stored = self.db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(stored_bytes), 0) FROM blobs").fetchone()
+        return {"entries": entries, "blobs": blobs, "bytes": size, "stored_bytes": stored,
+                "max_bytes": self.max_bytes}
+
+    def close(self) -> None:
+        self.db.commit()
+        self.db.close()
+
+    def __enter__(self) -> "TranscriptCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def open_cache(path: Optional[str] = None, max_mb: Optional[float] = None) -> Optional[TranscriptCache]:
+    """
+    Cache from a --cache flag, falling back to TRANSCRIPT_CACHE_DIR and
+    TRANSCRIPT_CACHE_MAX_MB. Returns None when caching is not configured.
+    """
+    path = path or os.getenv("TRANSCRIPT_CACHE_DIR")
+    if not path:
+        return None
+    if max_mb is None and os.getenv("TRANSCRIPT_CACHE_MAX_MB"):
+        max_mb = float(os.getenv("TRANSCRIPT_CACHE_MAX_MB"))
+    max_bytes = int(max_mb * 1024 * 1024) if max_mb else DEFAULT_MAX_BYTES
+    return TranscriptCache(path, max_bytes=max_bytes)
@@ -0,0 +1,339 @@
+"""
+Transcript Index
+Incremental on-disk inverted index over fetched .vtt transcripts
+
+Saved transcripts (05-fetch-transcript.py --output, process_transcript_notification.py -o)
+are indexed into a single SQLite file:
+
+    documents  doc_id, name (file stem, usually the transcript id), path,
+               mtime/size (for incremental re-indexing), cue_starts blob
+    cues       (doc_id, cue) -> start_ms, end_ms, speaker, text
+    terms      term -> term_id, df (number of documents containing it)
+    postings   (term_id, doc_id) -> positions blob
+
+Positions are token offsets within the whole transcript, stored as a
+little-endian uint32 array, so one row holds every occurrence of a term in a
+meeting. The cue a position falls in is found by bisecting the document's
+cue_starts array, so hits link back to the exact cue and timestamp.
+
+Queries are AND across clauses; a clause is a word or a "quoted phrase".
+Documents are intersected starting from the rarest term, and phrases are
+matched by aligning position arrays.
+"""
+import os
+import re
+import shlex
+import sqlite3
+import sys
+import time
+from array import array
+from bisect import bisect_right
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from vtt_parser import iter_cues_from_path
+
+_TOKEN = re.compile(r"\w+(?:'\w+)*")
+TRANSCRIPT_SUFFIXES = (".vtt", ".vtt.gz")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    doc_id     INTEGER PRIMARY KEY,
+    name       TEXT NOT NULL,
+    path       TEXT NOT NULL UNIQUE,
+    mtime      REAL NOT NULL,
+    size       INTEGER NOT NULL,
+    cue_count  INTEGER NOT NULL,
+    tokens     INTEGER NOT NULL,
+    cue_starts BLOB NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cues (
+    doc_id   INTEGER NOT NULL,
+    cue      INTEGER NOT NULL,
+    start_ms INTEGER NOT NULL,
+    end_ms   INTEGER NOT NULL,
+    speaker  TEXT,
+    text     TEXT NOT NULL,
+    PRIMARY KEY (doc_id, cue)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS terms (
+    term_id INTEGER PRIMARY KEY,
+    term    TEXT NOT NULL UNIQUE,
+    df      INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term_id   INTEGER NOT NULL,
+    doc_id    INTEGER NOT NULL,
+    positions BLOB NOT NULL,
+    PRIMARY KEY (term_id, doc_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc_id);
+"""
+
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens; apostrophes inside words are kept (don't, O'Brien)."""
+    return _TOKEN.findall(text.lower())
+
+
+def _pack(values: array) -> bytes:
+    if not _LITTLE_ENDIAN:
+        values = array("I", values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _unpack(blob: bytes) -> array:
+    values = array("I")
+    values.frombytes(blob)
+    if not _LITTLE_ENDIAN:
+        values.byteswap()
+    return values
+
+
+def parse_query(query: str) -> List[List[str]]:
+    """Split a query into clauses: each bare word or "quoted phrase" becomes a token list."""
+    try:
+        parts = shlex.split(query)
+    except ValueError:
+        parts = query.split()
+    clauses = [tokenize(part) for part in parts]
+    return [clause for clause in clauses if clause]
+
+
+class Hit(NamedTuple):
+    """One matching cue."""
+    name: str
+    path: str
+    cue: int
+    start_ms: int
+    end_ms: int
+    speaker: Optional[str]
+    text: str
+
+
+class TranscriptIndex:
+    """Incremental inverted index stored in one SQLite file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(_SCHEMA)
+        self._term_ids: Dict[str, int] = {}
+
+    # ---- indexing ----------------------------------------------------------
+
+    def _ensure_terms(self, terms: Iterable[str]) -> None:
+        missing = [t for t in terms if t not in self._term_ids]
+        if not missing:
+            return
+        self.db.executemany("INSERT OR IGNORE INTO terms (term) VALUES (?)", ((t,) for t in missing))
+        for i in range(0, len(missing), 500):
+            chunk = missing[i:i + 500]
+            rows = self.db.execute(
+                f"SELECT term, term_id FROM terms WHERE term IN ({','.join('?' * len(chunk))})", chunk)
+            self._term_ids.update(rows)
+
+    def _delete_document(self, doc_id: int) -> None:
+        self.db.execute(
+            "UPDATE terms SET df = df - 1 WHERE term_id IN (SELECT term_id FROM postings WHERE doc_id = ?)",
+            (doc_id,))
+        self.db.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+        self.db.execute("DELETE FROM cues WHERE doc_id = ?", (doc_id,))
+        self.db.execute("DELETE FROM documents WHERE doc_id = ?", (doc_id,))
+
+    def add_file(self, path: str, name: Optional[str] = None, force: bool = False) -> bool:
+        """
+        Index one .vtt / .vtt.gz file. Returns False when the file is already
+        indexed and unchanged (same mtime and size), True otherwise.
+        """
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        row = self.db.execute("SELECT doc_id, mtime, size FROM documents WHERE path = ?", (path,)).fetchone()
+        if row and not force and row[1] == st.st_mtime and row[2] == st.st_size:
+            return False
+
+        if name is None:
+            name = os.path.basename(path)
+            for suffix in TRANSCRIPT_SUFFIXES:
+                if name.endswith(suffix):
+                    name = name[:-len(suffix)]
+                    break
+
+        positions: Dict[str, array] = defaultdict(lambda: array("I"))
+        cue_starts = array("I")
+        cue_rows = []
+        pos = 0
+        for cue_no, cue in enumerate(iter_cues_from_path(path)):
+            cue_starts.append(pos)
+            cue_rows.append((cue_no, cue.start_ms, cue.end_ms, cue.speaker, cue.text))
+            for token in tokenize(cue.text):
+                positions[token].append(pos)
+                pos += 1
+
+        try:
+            self._write_document(row, name, path, st, cue_rows, pos, cue_starts, positions)
+        except Exception:
+            # Term ids inserted by the rolled-back transaction no longer exist
+            self._term_ids.clear()
+            raise
+        return True
+
+    def _write_document(self, row, name, path, st, cue_rows, tokens, cue_starts, positions) -> None:
+        with self.db:
+            if row:
+                self._delete_document(row[0])
+            cur = self.db.execute(
+                "INSERT INTO documents (name, path, mtime, size, cue_count, tokens, cue_starts, indexed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (name, path, st.st_mtime, st.st_size, len(cue_rows), tokens, _pack(cue_starts), time.time()))
+            doc_id = cur.lastrowid
+            self.db.executemany(
+                "INSERT INTO cues (doc_id, cue, start_ms, end_ms, speaker, text) VALUES (?, ?, ?, ?, ?, ?)",
+                ((doc_id,) + r for r in cue_rows))
+            self._ensure_terms(positions)
+            term_ids = self._term_ids
+            self.db.executemany(
+                "INSERT INTO postings (term_id, doc_id, positions) VALUES (?, ?, ?)",
+                ((term_ids[t], doc_id, _pack(p)) for t, p in positions.items()))
+            self.db.executemany(
+                "UPDATE terms SET df = df + 1 WHERE term_id = ?", ((term_ids[t],) for t in positions))
+
+    def remove_path(self, path: str) -> bool:
+        row = self.db.execute("SELECT doc_id FROM documents WHERE path = ?", (os.path.abspath(path),)).fetchone()
+        if not row:
+            return False
+        with self.db:
+            self._delete_document(row[0])
+        return True
+
+    def update(self, directories: Iterable[str], prune: bool = False,
+               progress=None) -> Dict[str, int]:
+        """
+        Index new or changed transcripts under ``directories`` (recursively).
+        With prune, documents whose files no longer exist are removed.
+        """
+        stats = {"scanned": 0, "indexed": 0, "unchanged": 0, "failed": 0, "pruned": 0}
+        for directory in directories:
+            for root, _, files in os.walk(directory):
+                for filename in sorted(files):
+                    if not filename.endswith(TRANSCRIPT_SUFFIXES):
+                        continue
+                    stats["scanned"] += 1
+                    path = os.path.join(root, filename)
+                    try:
+                        changed = self.add_file(path)
+                    except (OSError, UnicodeDecodeError, sqlite3.Error) as e:
+                        stats["failed"] += 1
+                        print(f"   ⚠️  Failed to index {path}: {e}", file=sys.stderr)
+                        continue
+                    stats["indexed" if changed else "unchanged"] += 1
+                    if progress and changed:
+                        progress(stats)
+
+        if prune:
+            for doc_id, path in self.db.execute("SELECT doc_id, path FROM documents").fetchall():
+                if not os.path.exists(path):
+                    with self.db:
+                        self._delete_document(doc_id)
+                    stats["pruned"] += 1
+        return stats
+
+    # ---- querying -----------------------------------------------------------
+
+    def _term_postings(self, term: str) -> Tuple[int, Optional[int]]:
+        row = self.db.execute("SELECT term_id, df FROM terms WHERE term = ?", (term,)).fetchone()
+        return (row[1], row[0]) if row else (0, None)
+
+    def _docs_for(self, term_id: int, doc_ids: Optional[set]) -> Dict[int, array]:
+        """doc_id -> positions for a term, optionally restricted to doc_ids."""
+        # Point lookups win for a few candidates; otherwise one range scan is cheaper
+        if doc_ids is None or len(doc_ids) > 64:
+            rows = self.db.execute("SELECT doc_id, positions FROM postings WHERE term_id = ?", (term_id,))
+            return {doc_id: _unpack(blob) for doc_id, blob in rows if doc_ids is None or doc_id in doc_ids}
+        result = {}
+        for doc_id in doc_ids:
+            row = self.db.execute(
+                "SELECT positions FROM postings WHERE term_id = ? AND doc_id = ?", (term_id, doc_id)).fetchone()
+            if row:
+                result[doc_id] = _unpack(row[0])
+        return result
+
+    def _match(self, clauses: List[List[str]]) -> Dict[int, set]:
+        """Return doc_id -> matching token positions (phrase starts or word hits)."""
+        terms = {t for clause in clauses for t in clause}
+        info = {t: self._term_postings(t) for t in terms}
+        if any(term_id is None for _, term_id in info.values()):
+            return {}
+
+        # Intersect documents from the rarest term outwards so later lookups are keyed
+        candidates: Optional[set] = None
+        postings: Dict[str, Dict[int, array]] = {}
+        for term in sorted(terms, key=lambda t: info[t][0]):
+            postings[term] = self._docs_for(info[term][1], candidates)
+            candidates = set(postings[term])
+            if not candidates:
+                return {}
+
+        hits: Dict[int, set] = {doc_id: set() for doc_id in candidates}
+        for clause in clauses:
+            for doc_id in list(hits):
+                if len(clause) == 1:
+                    matched = set(postings[clause[0]][doc_id])
+                else:
+                    matched = set(postings[clause[0]][doc_id])
+                    for offset, term in enumerate(clause[1:], 1):
+                        following = set(postings[term][doc_id])
+                        matched = {p for p in matched if p + offset in following}
+                        if not matched:
+                            break
+                if matched:
+                    hits[doc_id] |= matched
+                else:
+                    del hits[doc_id]
+        return hits
+
+    def search(self, query: str, limit: int = 50) -> Iterator[Hit]:
+        """Yield matching cues, grouped by document (most hits first), in time order."""
+        clauses = parse_query(query)
+        if not clauses:
+            return
+        hits = self._match(clauses)
+        emitted = 0
+        for doc_id in sorted(hits, key=lambda d: -len(hits[d])):
+            name, path, blob = self.db.execute(
+                "SELECT name, path, cue_starts FROM documents WHERE doc_id = ?", (doc_id,)).fetchone()
+            cue_starts = _unpack(blob)
+            cue_numbers = sorted({bisect_right(cue_starts, p) - 1 for p in hits[doc_id]})
+            for cue_no in cue_numbers:
+                start_ms, end_ms, speaker, text = self.db.execute(
+                    "SELECT start_ms, end_ms, speaker, text FROM cues WHERE doc_id = ? AND cue = ?",
+                    (doc_id, cue_no)).fetchone()
+                yield Hit(name, path, cue_no, start_ms, end_ms, speaker, text)
+                emitted += 1
+                if emitted >= limit:
+                    return
+
+    def stats(self) -> Dict[str, int]:
+        documents, cues, tokens = self.db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(cue_count), 0), COALESCE(SUM(tokens), 0) FROM documents").fetchone()
+        (terms,) = self.db.execute("SELECT COUNT(*) FROM terms WHERE df > 0").fetchone()
+        size = os.path.getsize(self.path) if self.path != ":memory:" and os.path.exists(self.path) else 0
+        return {"documents": documents, "cues": cues, "tokens": tokens, "terms": terms, "bytes": size}
+
+    def close(self) -> None:
+        self.db.commit()
+        self.db.close()
+
+    def __enter__(self) -> "TranscriptIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,172 @@
+"""
+Transcript Readiness
+Observed meeting-end -> transcript-available delays, and poll schedules fitted to them
+
+Every time a transcript is found, record how long after the meeting ended it
+became available (exactly, from the transcript's createdDateTime, or bounded
+by the poll that found it). Delays are kept per tenant in a small SQLite file.
+The empirical distribution then drives QuantilePolicy, a PollScheduler policy
+that checks at the delay quantiles instead of on a fixed backoff, so most
+meetings are found on the first or second list call.
+
+    model = ReadinessModel("transcript_readiness.sqlite")
+    model.record(tenant, meeting_id, end_time, ready_time, exact=True)
+    policy = QuantilePolicy(model.delays(tenant))
+"""
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from poll_scheduler import to_epoch
+
+DEFAULT_DB = "transcript_readiness.sqlite"
+
+# Check where these fractions of transcripts have become available
+DEFAULT_QUANTILES = (0.3, 0.6, 0.8, 0.9, 0.95, 0.99)
+MIN_SAMPLES = 20
+MAX_SAMPLES = 2000
+
+# Used until a tenant has MIN_SAMPLES observations: "5-30 minutes after end"
+PRIOR_DELAYS = tuple(300 + 1500 * i / 19 for i in range(20))
+
+
+def quantile(sorted_values: Sequence[float], q: float) -> float:
+    """Linear-interpolated quantile of an already sorted sequence."""
+    if not sorted_values:
+        raise ValueError("quantile of empty sequence")
+    pos = q * (len(sorted_values) - 1)
+    lo = math.floor(pos)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
+class QuantilePolicy:
+    """
+    PollScheduler policy: check at the empirical delay quantiles, then fall
+    back to checks every tail_interval seconds until give_up_after.
+    """
+
+    def __init__(self, delays: Iterable[float], quantiles: Sequence[float] = DEFAULT_QUANTILES,
+                 min_gap: float = 30, tail_interval: float = 900, give_up_after: float = 4 * 3600):
+        self.delays = sorted(d for d in delays if d >= 0)
+        if not self.delays:
+            self.delays = sorted(PRIOR_DELAYS)
+        self.quantiles = tuple(quantiles)
+        self.tail_interval = tail_interval
+        self.give_up_after = give_up_after
+
+        offsets: List[float] = []
+        for q in self.quantiles:
+            t = quantile(self.delays, q)
+            if offsets and t < offsets[-1] + min_gap:
+                continue
+            offsets.append(max(t, min_gap))
+        self._offsets = offsets
+
+    def offset(self, attempt: int) -> Optional[float]:
+        if attempt < len(self._offsets):
+            value = self._offsets[attempt]
+        else:
+            value = self._offsets[-1] + (attempt - len(self._offsets) + 1) * self.tail_interval
+        return value if value <= self.give_up_after else None
+
+    def offsets(self) -> List[float]:
+        result, attempt = [], 0
+        while True:
+            value = self.offset(attempt)
+            if value is None:
+                return result
+            result.append(value)
+            attempt += 1
+
+
+class ReadinessModel:
+    """Per-tenant store of observed transcript delays."""
+
+    def __init__(self, path: str = DEFAULT_DB):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # record() is called from PollScheduler worker threads
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS delays (
+                tenant      TEXT NOT NULL,
+                meeting_id  TEXT NOT NULL,
+                end_time    REAL NOT NULL,
+                ready_time  REAL NOT NULL,
+                delay       REAL NOT NULL,
+                exact       INTEGER NOT NULL,
+                recorded_at REAL NOT NULL,
+                PRIMARY KEY (tenant, meeting_id)
+            )""")
+        self.db.commit()
+
+    def record(self, tenant: str, meeting_id: str, end_time, ready_time, exact: bool = False,
+               earliest=None) -> float:
+        """
+        Record one observation. ``ready_time`` is when the transcript was
+        created (exact) or found. For inexact observations, ``earliest`` (the
+        previous unsuccessful check) narrows the estimate to the midpoint.
+        Returns the recorded delay in seconds.
+        """
+        end = to_epoch(end_time)
+        ready = to_epoch(ready_time)
+        if not exact and earliest is not None:
+            ready = (max(to_epoch(earliest), end) + ready) / 2
+        delay = max(0.0, ready - end)
+        with self._lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO delays (tenant, meeting_id, end_time, ready_time, delay, exact, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (tenant, meeting_id, end, ready, delay, int(exact), time.time()))
+            self.db.commit()
+        return delay
+
+    def delays(self, tenant: str, limit: int = MAX_SAMPLES) -> List[float]:
+        """Most recent observed delays for a tenant (seconds)."""
+        with self._lock:
+            rows = self.db.execute(
+                "SELECT delay FROM delays WHERE tenant = ? ORDER BY recorded_at DESC LIMIT ?",
+                (tenant, limit)).fetchall()
+        return [row[0] for row in rows]
+
+    def tenants(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.db.execute("SELECT tenant, COUNT(*) FROM delays GROUP BY tenant").fetchall())
+
+    def policy(self, tenant: str, min_samples: int = MIN_SAMPLES, **kwargs) -> QuantilePolicy:
+        """
+        QuantilePolicy fitted to the tenant's delays. Until min_samples
+        observations exist they are blended with the 5-30 minute prior.
+        """
+        delays = self.delays(tenant)
+        if len(delays) < min_samples:
+            delays = list(PRIOR_DELAYS) + delays
+        return QuantilePolicy(delays, **kwargs)
+
+    def summary(self, tenant: str) -> Optional[Dict[str, float]]:
+        delays = sorted(self.delays(tenant))
+        if not delays:
+            return None
+        return {
+            "samples": len(delays),
+            "p50": quantile(delays, 0.5),
+            "p90": quantile(delays, 0.9),
+            "p99": quantile(delays, 0.99),
+            "max": delays[-1],
+        }
+
+    def close(self) -> None:
+        self.db.commit()
+        self.db.close()
+
+    def __enter__(self) -> "ReadinessModel":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,263 @@
+"""
+Transcript Redaction
+Streaming PII redaction for WebVTT transcripts
+
+Two matchers run over each cue payload line:
+
+- an Aho-Corasick automaton over dictionary terms (names, project code
+  names, customer names, ...). It walks words rather than characters, so a
+  line costs one transition per word however many terms are loaded, and
+  terms only ever match whole words ("Al" never hits "Alice").
+- one precompiled alternation regex for structured PII (emails, card
+  numbers, SSNs, IP addresses, phone numbers); ``lastgroup`` names the kind.
+
+Overlapping matches resolve leftmost-longest. Only payload text is rewritten:
+the WEBVTT header, cue identifiers, timing lines and NOTE blocks pass through
+byte-for-byte, so cue timing is untouched. Voice-tag speaker names can be kept
+or replaced with stable "Speaker N" pseudonyms.
+
+    redactor = Redactor(terms=load_terms("pii-terms.txt"))
+    with open("raw.vtt", "rb") as src, open("clean.vtt", "w") as dst:
+        redact_vtt(src, dst, redactor)
+"""
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from vtt_parser import iter_lines
+
+# Order matters: earlier kinds win when two could start at the same place
+DEFAULT_PATTERNS = (
+    ("EMAIL", r"[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}"),
+    ("CARD", r"(?<!\d)\d(?:[ -]?\d){12,18}(?!\d)"),
+    ("SSN", r"(?<!\d)\d{3}-\d{2}-\d{4}(?!\d)"),
+    ("IP", r"(?<![\d.])(?:(?:25[0-5]|2[0-4]\d|1?\d?\d)\.){3}(?:25[0-5]|2[0-4]\d|1?\d?\d)(?![\d.])"),
+    ("PHONE", r"(?<![\w+])(?:\+\d{1,3}[ .-]?)?(?:\(\d{2,4}\)[ .-]?|\d{2,4}[ .-])\d{3,4}[ .-]?\d{3,4}(?!\w)"),
+)
+
+WORD = re.compile(r"\w+")
+# Every default pattern needs an @ or a digit; lines without one skip the regex
+DEFAULT_TRIGGER = re.compile(r"[@\d]")
+_VOICE_PREFIX = re.compile(r"<v(?:\.[^\s>]+)?[ \t]+([^>]*)>")
+
+
+def luhn_valid(digits: str) -> bool:
+    total, parity = 0, len(digits) % 2
+    for i, ch in enumerate(digits):
+        d = ord(ch) - 48
+        if i % 2 == parity:
+            d *= 2
+            if d > 9:
+                d -= 9
+        total += d
+    return total % 10 == 0
+
+
+class WordAutomaton:
+    """Aho-Corasick automaton whose alphabet is lower-cased words."""
+
+    def __init__(self, terms: Iterable[Tuple[str, str]] = ()):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # (length in words, label) of every term ending in this state, longest first
+        self._out: List[List[Tuple[int, str]]] = [[]]
+        self.size = 0
+        self._first_words = set()
+        for term, label in terms:
+            self.add(term, label)
+        self._build()
+
+    def add(self, term: str, label: str) -> None:
+        words = [w.lower() for w in WORD.findall(term)]
+        if not words:
+            return
+        self._first_words.add(words[0])
+        state = 0
+        for word in words:
+            nxt = self._goto[state].get(word)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[state][word] = nxt
+            state = nxt
+        if all(n != len(words) for n, _ in self._out[state]):
+            self._out[state].append((len(words), label))
+            self.size += 1
+
+    def _build(self) -> None:
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = list(goto[0].values())
+        for state in queue:
+            for word, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and word not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(word, 0)
+                out[nxt].extend(o for o in out[fail[nxt]] if o not in out[nxt])
+                out[nxt].sort(reverse=True)
+
+    def finditer(self, text: str) -> Iterable[Tuple[int, int, str]]:
+        """(start, end, label) for every term occurrence, overlapping ones included."""
+        # Most lines contain no term at all: one C-level set test rules them out
+        if self.size == 0 or self._first_words.isdisjoint(WORD.findall(text.lower())):
+            return
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        starts: List[int] = []
+        for m in WORD.finditer(text):
+            word = m.group().lower()
+            starts.append(m.start())
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            if out[state]:
+                end = m.end()
+                for length, label in out[state]:
+                    yield starts[-length], end, label
+
+
+class Redactor:
+    """Dictionary terms plus structured-PII patterns, applied to one line at a time."""
+
+    def __init__(self, terms: Iterable[Tuple[str, str]] = (), patterns=DEFAULT_PATTERNS,
+                 replacement: str = "[{label}]", check_luhn: bool = True, trigger=None):
+        self.automaton = WordAutomaton(terms)
+        self.pattern = re.compile("|".join(f"(?P<{label}>{regex})" for label, regex in patterns)) if patterns else None
+        # Cheap pre-check a line must pass before the combined regex runs
+        self.trigger = trigger or (DEFAULT_TRIGGER if patterns is DEFAULT_PATTERNS else None)
+        self.replacement = replacement
+        self.check_luhn = check_luhn
+        self.counts: Counter = Counter()
+
+    def spans(self, text: str) -> List[Tuple[int, int, str]]:
+        """Non-overlapping (start, end, label) spans to replace, leftmost-longest."""
+        found = []
+        if self.pattern is not None and (self.trigger is None or self.trigger.search(text)):
+            for m in self.pattern.finditer(text):
+                label = m.lastgroup
+                if label == "CARD" and self.check_luhn:
+                    digits = m.group().replace(" ", "").replace("-", "")
+                    if not luhn_valid(digits):
+                        continue
+                found.append((m.start(), m.end(), label))
+        found.extend(self.automaton.finditer(text))
+        if len(found) < 2:
+            return found
+        found.sort(key=lambda s: (s[0], s[0] - s[1]))
+        merged, last_end = [], -1
+        for span in found:
+            if span[0] >= last_end:
+                merged.append(span)
+                last_end = span[1]
+        return merged
+
+    def redact(self, text: str) -> str:
+        spans = self.spans(text)
+        if not spans:
+            return text
+        parts, pos = [], 0
+        for start, end, label in spans:
+            parts.append(text[pos:start])
+            parts.append(self.replacement.format(label=label))
+            self.counts[label] += 1
+            pos = end
+        parts.append(text[pos:])
+        return "".join(parts)
+
+
+def load_terms(path: str, default_label: str = "TERM") -> List[Tuple[str, str]]:
+    """
+    Read dictionary terms, one per line: ``term`` or ``term<TAB>LABEL``.
+    Blank lines and lines starting with # are ignored.
+    """
+    terms = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            term, _, label = line.partition("\t")
+            terms.append((term.strip(), label.strip() or default_label))
+    return terms
+
+
+def iter_redacted_lines(source, redactor: Redactor, speakers: str = "keep") -> Iterable[str]:
+    """
+    Yield the transcript's lines with cue payloads redacted. Headers, cue
+    identifiers, timing lines and NOTE/STYLE blocks pass through unchanged.
+    speakers: "keep" leaves voice-tag names, "pseudonymize" maps each name
+    to "Speaker N" (stable within the transcript), "redact" uses [SPEAKER].
+    """
+    pseudonyms: Dict[str, str] = {}
+    in_payload = False
+    for line in iter_lines(source):
+        if not line.strip():
+            in_payload = False
+            yield line
+            continue
+        if not in_payload:
+            if "-->" in line:
+                in_payload = True
+            yield line
+            continue
+
+        prefix = ""
+        voice = _VOICE_PREFIX.match(line)
+        if voice:
+            name = voice.group(1)
+            if speakers == "keep":
+                prefix = voice.group(0)
+            else:
+                if speakers == "redact":
+                    alias = "[SPEAKER]"
+                else:
+                    alias = pseudonyms.setdefault(name, f"Speaker {len(pseudonyms) + 1}")
+                prefix = voice.group(0)[:voice.start(1)] + alias + ">"
+            line = line[voice.end():]
+        yield prefix + redactor.redact(line)
+
+
+def redact_vtt(source, dest, redactor: Redactor, speakers: str = "keep") -> int:
+    """Stream a redacted copy of ``source`` into the text file ``dest``. Returns lines written."""
+    count = 0
+    for line in iter_redacted_lines(source, redactor, speakers):
+        dest.write(line)
+        dest.write("\n")
+        count += 1
+    return count
+
+
+def redact_text(content: str, redactor: Redactor, speakers: str = "keep") -> str:
+    """Redacted copy of in-memory VTT content."""
+    return "\n".join(iter_redacted_lines(content, redactor, speakers)) + "\n"
+
+
+def redact_file(path: str, redactor: Redactor, dest: Optional[str] = None, speakers: str = "keep") -> str:
+    """
+    Redact a .vtt / .vtt.gz file (in place when dest is None; output keeps
+    the input's compression). Returns the written path.
+    """
+    import gzip
+    import os
+
+    dest = dest or path
+    opener = gzip.open if path.endswith(".gz") else open
+    dest_opener = gzip.open if dest.endswith(".gz") else open
+    partial = dest + ".redacting"
+    try:
+        with opener(path, "rb") as src, dest_opener(partial, "wt", encoding="utf-8", newline="\n") as dst:
+            redact_vtt(src, dst, redactor, speakers)
+        os.replace(partial, dest)
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+    return dest
+
+
+def open_redactor(terms_path: Optional[str] = None) -> Redactor:
+    """Redactor with the default patterns plus terms from --redact-terms, if given."""
+    return Redactor(terms=load_terms(terms_path) if terms_path else ())
@@ -0,0 +1,255 @@
+"""
+WebVTT Parser
+Streaming, incremental parsing of Teams transcript (WebVTT) content
+
+Reads a transcript line by line and yields one compact ``Cue`` per cue block,
+so memory stays constant regardless of transcript length. Understands the
+format Teams produces:
+
+    WEBVTT
+
+    0a3d1c3e-6f2b-4c1e-9a57-2f1d1c0e8b11/17-0
+    00:00:03.450 --> 00:00:05.120
+    <v Alice Smith>Hello everyone, thanks for</v>
+    <v Alice Smith>joining.</v>
+
+Cue identifiers, voice tags (``<v Speaker>`` / ``<v.class Speaker>``),
+multi-line payloads, cue settings after the end timestamp, and NOTE / STYLE /
+REGION blocks are all handled. Sources can be text or binary file objects,
+str/bytes content, or an iterable of byte chunks (e.g. requests'
+``iter_content()``).
+"""
+import codecs
+import html
+import io
+import re
+import sys
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+CHUNK_SIZE = 64 * 1024
+
+_VOICE = re.compile(r"<v(?:\.[^\s>]+)?[ \t]+([^>]*)>")
+_TAG = re.compile(r"<[^>]*>")
+_TIMESTAMP = re.compile(r"^(?:(\d+):)?(\d{1,2}):(\d{2})[.,](\d{3})$")
+
+# Blocks that carry no cue payload
+_SKIP_BLOCKS = ("WEBVTT", "NOTE", "STYLE", "REGION")
+
+
+class Cue(NamedTuple):
+    """One transcript cue. Times are integer milliseconds; speaker is interned."""
+    start_ms: int
+    end_ms: int
+    speaker: Optional[str]
+    text: str
+    id: Optional[str] = None
+
+
+def parse_timestamp_ms(value: str) -> int:
+    """Parse ``HH:MM:SS.mmm`` or ``MM:SS.mmm`` into milliseconds."""
+    # Fast path for the fixed-width form Teams always emits
+    if len(value) == 12 and value[2] == ":" and value[5] == ":" and value[8] == ".":
+        return (int(value[0:2]) * 3600000 + int(value[3:5]) * 60000
+                + int(value[6:8]) * 1000 + int(value[9:12]))
+    m = _TIMESTAMP.match(value)
+    if m is None:
+        raise ValueError(f"Invalid WebVTT timestamp: {value!r}")
+    hours, minutes, seconds, millis = m.groups()
+    return (int(hours or 0) * 3600000 + int(minutes) * 60000
+            + int(seconds) * 1000 + int(millis))
+
+
+def format_timestamp(ms: int) -> str:
+    """Format milliseconds as ``HH:MM:SS.mmm``."""
+    seconds, millis = divmod(ms, 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}.{millis:03d}"
+
+
+def _iter_chunk_batches(chunks: Iterable[bytes]) -> Iterator[list]:
+    """Decode byte chunks incrementally and yield lists of complete lines."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    buffer = ""
+    for chunk in chunks:
+        if not chunk:
+            continue
+        buffer += decoder.decode(chunk)
+        # A trailing CR may be the first half of a CRLF split across chunks
+        hold = buffer.endswith("\r")
+        if hold:
+            buffer = buffer[:-1]
+        if "\r" in buffer:
+            buffer = buffer.replace("\r\n", "\n").replace("\r", "\n")
+        lines = buffer.split("\n")
+        buffer = lines.pop() + ("\r" if hold else "")
+        yield lines
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+
+
+def _iter_file_chunks(f, size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    while True:
+        chunk = f.read(size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _iter_text_batches(f, size: int = CHUNK_SIZE) -> Iterator[list]:
+    first = True
+    while True:
+        lines = f.readlines(size)
+        if not lines:
+            return
+        lines = [line.rstrip("\r\n") for line in lines]
+        if first:
+            lines[0] = lines[0].lstrip("\ufeff")
+            first = False
+        yield lines
+
+
+def _iter_line_batches(source) -> Iterator[list]:
+    """Yield lists of lines; batching keeps per-line generator overhead out of the hot loop."""
+    if isinstance(source, str):
+        source = io.StringIO(source)
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+
+    if isinstance(source, io.TextIOBase):
+        return _iter_text_batches(source)
+    if hasattr(source, "read"):
+        return _iter_chunk_batches(_iter_file_chunks(source))
+    return _iter_chunk_batches(source)
+
+
+def iter_lines(source) -> Iterator[str]:
+    """
+    Yield lines (without terminators) from a text/binary file object,
+    str/bytes content, or an iterable of byte chunks.
+    """
+    for lines in _iter_line_batches(source):
+        yield from lines
+
+
+def _parse_timing(line: str):
+    """Return (start_ms, end_ms) for a timing line, or None if it is malformed."""
+    # Fast path: "HH:MM:SS.mmm --> HH:MM:SS.mmm[ settings]"
+    if len(line) >= 29 and line[13:16] == "-->" and line[2] == ":" and line[19] == ":":
+        try:
+            return (int(line[0:2]) * 3600000 + int(line[3:5]) * 60000
+                    + int(line[6:8]) * 1000 + int(line[9:12]),
+                    int(line[17:19]) * 3600000 + int(line[20:22]) * 60000
+                    + int(line[23:25]) * 1000 + int(line[26:29]))
+        except ValueError:
+            pass
+    start, _, rest = line.partition("-->")
+    try:
+        return parse_timestamp_ms(start.strip()), parse_timestamp_ms(rest.split(None, 1)[0])
+    except (IndexError, ValueError):
+        return None
+
+
+def _build_cue(start_ms: int, end_ms: int, cue_id: Optional[str], payload: list,
+               _intern=sys.intern, _new=tuple.__new__) -> Cue:
+    text = payload[0].strip() if len(payload) == 1 else " ".join(p.strip() for p in payload)
+    speaker = None
+    if "<" in text:
+        # Fast path for the single-voice "<v Name>text</v>" form Teams emits
+        gt = text.find(">")
+        if (text.startswith("<v ") and text.endswith("</v>")
+                and text.count("<") == 2 and gt > 3):
+            speaker = _intern(text[3:gt].strip())
+            text = text[gt + 1:-4].strip()
+        else:
+            voice = _VOICE.search(text)
+            if voice is not None:
+                speaker = _intern(voice.group(1).strip())
+            text = _TAG.sub("", text).strip()
+    if "&" in text:
+        text = html.unescape(text)
+    return _new(Cue, (start_ms, end_ms, speaker, text, cue_id))
+
+
+def iter_cues(source, include_empty: bool = False) -> Iterator[Cue]:
+    """
+    Parse WebVTT from ``source`` (see iter_lines) and yield Cue records.
+
+    Cues whose payload is empty after removing tags are skipped unless
+    include_empty is set. Malformed timing lines are skipped with the rest
+    of their block.
+    """
+    build = _build_cue
+    parse_timing = _parse_timing
+    cue_id = None
+    timing = None          # (start_ms, end_ms) of the open cue
+    payload = []
+    skipping = False
+    block_start = True
+
+    for lines in _iter_line_batches(source):
+        for line in lines:
+            if timing is not None and line and "-->" not in line:
+                if not line.isspace():
+                    payload.append(line)
+                    continue
+
+            if not line or line.isspace():
+                if timing is not None and (payload or include_empty):
+                    cue = build(timing[0], timing[1], cue_id, payload)
+                    if cue.text or include_empty:
+                        yield cue
+                cue_id = timing = None
+                payload = []
+                skipping = False
+                block_start = True
+                continue
+
+            if skipping:
+                continue
+
+            if "-->" in line:
+                # A timing line directly after a payload starts a new cue
+                if timing is not None and payload:
+                    cue = build(timing[0], timing[1], cue_id, payload)
+                    if cue.text or include_empty:
+                        yield cue
+                    cue_id = None
+                    payload = []
+                timing = parse_timing(line)
+                skipping = timing is None
+                block_start = False
+                continue
+
+            if block_start and line.startswith(_SKIP_BLOCKS):
+                skipping = True
+            else:
+                cue_id = line.strip()
+            block_start = False
+
+    if timing is not None and (payload or include_empty):
+        cue = build(timing[0], timing[1], cue_id, payload)
+        if cue.text or include_empty:
+            yield cue
+
+
+def iter_cues_from_path(path: str, include_empty: bool = False) -> Iterator[Cue]:
+    """Stream cues from a .vtt file on disk (gzip-compressed .vtt.gz is supported)."""
+    if path.endswith(".gz"):
+        import gzip
+        opener = gzip.open
+    else:
+        opener = open
+    with opener(path, "rb") as f:
+        yield from iter_cues(f, include_empty=include_empty)
+
+
+def cue_to_dict(cue: Cue) -> dict:
+    """Legacy dict shape used by 05-fetch-transcript (string timestamps)."""
+    return {
+        "start": format_timestamp(cue.start_ms),
+        "end": format_timestamp(cue.end_ms),
+        "speaker": cue.speaker,
+        "text": cue.text,
+    }
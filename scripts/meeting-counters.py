@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Materialized meeting counters: read, rebuild, consume the stream, self-test.
+
+The counters table is kept current from the meetings table stream by
+status_counters (as a Lambda on the stream, or with `consume` here), so a
+status / changeType / organizer breakdown is one small Query instead of a
+full-table scan.
+
+Usage:
+    # O(1) breakdowns
+    python scripts/meeting-counters.py show
+
+    # Seed the counters from one parallel scan (see "Rebuilding" below)
+    python scripts/meeting-counters.py rebuild
+
+    # Poll the meetings stream from the stored checkpoints
+    python scripts/meeting-counters.py consume --follow
+
+    # Simulate the pipeline against in-memory stand-ins and check the counts
+    python scripts/meeting-counters.py selftest --meetings 20000
+
+Rebuilding:
+    rebuild first reads the meetings stream to its end, marks those records as
+    applied and moves the shard checkpoints past them, then scans. Consumers
+    resume after that point instead of re-applying history the scan already
+    counts. Meetings written while the scan runs may be counted twice or
+    missed, and a consumer running during the rebuild races its overwrite, so:
+      1. Stop `consume`, or disable the Lambda trigger's event source mapping
+         (aws lambda update-event-source-mapping --uuid <id> --no-enabled)
+      2. Run rebuild in a quiet window (no webhook or enrichment writes)
+      3. Restart `consume` or re-enable the mapping; records the rebuild
+         marked are skipped
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from dynamo_scan import DEFAULT_SEGMENTS, parallel_scan
+from status_counters import (
+    BOUND_ATTRIBUTES, COUNTED, DynamoCounterTable, MemoryCounterTable, MemoryMeetingsTable,
+    StatusCounterConsumer, consume_stream, rebuild_counters, recount,
+)
+
+DYNAMODB_TABLE = "tmf-meetings-8akfpg"
+COUNTERS_TABLE = "tmf-meeting-counters-8akfpg"
+
+
+def print_breakdowns(counters):
+    for kind in COUNTED:
+        counts = counters.breakdown(kind)
+        print(f"\n{kind} ({sum(counts.values())} meetings):")
+        for name, count in sorted(counts.items(), key=lambda kv: -kv[1]):
+            print(f"  {name:30s}: {count}")
+    bounds = counters.read_bounds()
+    if bounds:
+        print("\nTimestamps:")
+        for attribute, values in sorted(bounds.items()):
+            print(f"  {attribute}: {values.get('min')} → {values.get('max')}")
+
+
+def cmd_show(args):
+    import boto3
+
+    counters = DynamoCounterTable(boto3.client("dynamodb"), args.counters)
+    started = time.perf_counter()
+    print_breakdowns(counters)
+    print(f"\n⏱️  Read in {time.perf_counter() - started:.3f}s from {args.counters}")
+    return 0
+
+
+def cmd_rebuild(args):
+    import boto3
+
+    client = boto3.client("dynamodb")
+    stream_arn = client.describe_table(TableName=args.table)["Table"].get("LatestStreamArn")
+    if not stream_arn:
+        print(f"❌ {args.table} has no stream; enable NEW_AND_OLD_IMAGES first")
+        return 1
+    print(f"🔄 Recounting {args.table} ({args.segments} parallel segments)...")
+    print("   ⚠️  The stream consumer must be stopped (see Rebuilding in --help)")
+    started = time.perf_counter()
+    result = rebuild_counters(
+        DynamoCounterTable(client, args.counters), boto3.client("dynamodbstreams"), stream_arn,
+        lambda: parallel_scan(client, args.table, segments=args.segments,
+                              projection=list(COUNTED.values()) + list(BOUND_ATTRIBUTES)))
+    print(f"   {result['marked']} stream record(s) marked applied across {result['shards']} shard(s)")
+    print(f"✅ {result['counters']} counter(s) written to {args.counters} in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+def cmd_consume(args):
+    import boto3
+
+    stream_arn = args.stream_arn
+    if not stream_arn:
+        stream_arn = boto3.client("dynamodb").describe_table(TableName=args.table)["Table"].get("LatestStreamArn")
+        if not stream_arn:
+            print(f"❌ {args.table} has no stream; enable NEW_AND_OLD_IMAGES first")
+            return 1
+    print(f"📡 Consuming {stream_arn}")
+    consumer = StatusCounterConsumer(DynamoCounterTable(boto3.client("dynamodb"), args.counters))
+    try:
+        stats = consume_stream(boto3.client("dynamodbstreams"), stream_arn, consumer, follow=args.follow)
+    except KeyboardInterrupt:
+        stats = consumer.stats
+        print("\n⏹️  Stopped; progress is checkpointed per shard")
+    print(f"✅ {stats['records']} record(s) in {stats['batches']} batch(es), "
+          f"{stats['counted']} counted, {stats['duplicates']} already applied")
+    return 0
+
+
+# ---- self-test ----------------------------------------------------------------
+
+ORGANIZERS = [f"rep{n}@contoso.com" for n in range(12)]
+
+
+def simulate(meetings, count, rng):
+    """Drive the stand-in table like the pipeline: notifications, enrichment, cancellations, deletes."""
+    keys = []
+    for n in range(count):
+        created = f"2026-03-01T{n // 3600 % 24:02d}:{n // 60 % 60:02d}:{n % 60:02d}.000Z"
+        meetings.put({"meeting_id": f"m{n}", "created_at": created, "createdAt": created, "updatedAt": created,
+                      "status": "notification_received", "changeType": "created", "organizerEmail": ""})
+        keys.append((f"m{n}", created))
+        roll = rng.random()
+        if roll < 0.3:
+            # Notification replay: same status, new updatedAt (nets to zero counter changes)
+            meetings.update(*rng.choice(keys), updatedAt=created)
+        elif roll < 0.75:
+            mid, ca = rng.choice(keys)
+            meetings.update(mid, ca, status="scheduled", changeType="processed",
+                            organizerEmail=rng.choice(ORGANIZERS), updatedAt=created)
+        elif roll < 0.85:
+            meetings.update(*rng.choice(keys), status="cancelled", changeType="deleted", updatedAt=created)
+        elif roll < 0.88:
+            key = rng.choice(keys)
+            meetings.delete(*key)
+            keys.remove(key)
+
+
+def check(label, counters, meetings):
+    """Compare the counter table with a full recount of the stand-in table; True if they match."""
+    expected, expected_bounds = recount(meetings.scan())
+    ok = True
+    for kind in COUNTED:
+        want = {name: count for (k, name), count in expected.items() if k == kind}
+        got = counters.breakdown(kind)
+        if got != want:
+            ok = False
+            print(f"❌ {label}: {kind} mismatch:\n   counters {got}\n   recount  {want}")
+    for attribute, (_, hi) in expected_bounds.items():
+        if counters.read_bounds().get(attribute, {}).get("max") != hi:
+            ok = False
+            print(f"❌ {label}: {attribute} max mismatch")
+    if ok:
+        print(f"   ✅ {label}: counters match a full recount")
+    return ok
+
+
+def cmd_selftest(args):
+    rng = random.Random(args.seed)
+    meetings = MemoryMeetingsTable()
+    counters = MemoryCounterTable()
+    consumer = StatusCounterConsumer(counters)
+    stream = meetings.stream
+
+    simulate(meetings, args.meetings, rng)
+    print(f"🧪 {args.meetings:,} meetings, {len(stream.records):,} stream records, batches of {args.batch}")
+
+    # Lambda-style delivery; some batches are redelivered with different boundaries (bisect / longer page)
+    started = time.perf_counter()
+    previous = []
+    for batch in stream.batches(args.batch):
+        consumer.process(batch)
+        if previous and rng.random() < args.redeliver:
+            cut = rng.randrange(len(previous))
+            consumer.process(previous[cut:] + batch[:rng.randrange(len(batch) + 1)])
+        previous = batch
+    consume_s = time.perf_counter() - started
+    stats = dict(consumer.stats)
+    ok = check("Lambda-style delivery with redelivery", counters, meetings)
+
+    # Polling consumer that crashed after applying a page but before checkpointing it
+    counters.set_checkpoint(stream.SHARD_ID, stream.records[-1]["dynamodb"]["SequenceNumber"])
+    checkpoint = len(stream.records)
+    simulate(meetings, args.meetings // 4, rng)
+    consumer.process(stream.records[checkpoint:checkpoint + args.batch // 2])
+    consume_stream(stream, "memory", consumer, limit=args.batch)
+    ok = check("Polling restart over a re-read page", counters, meetings) and ok
+
+    # Rebuild from a scan, then consume the stream from the checkpoints it left
+    started = time.perf_counter()
+    rebuild_counters(counters, stream, "memory", meetings.scan)
+    rebuild_s = time.perf_counter() - started
+    simulate(meetings, args.meetings // 4, rng)
+    consume_stream(stream, "memory", consumer, limit=args.batch)
+    ok = check("Rebuild then consume", counters, meetings) and ok
+
+    started = time.perf_counter()
+    recount(meetings.scan())
+    scan_s = time.perf_counter() - started
+    started = time.perf_counter()
+    breakdowns = {kind: counters.breakdown(kind) for kind in COUNTED}
+    read_s = time.perf_counter() - started
+
+    print(f"   Consumed {stats['records']:,} records in {consume_s:.2f}s "
+          f"({stats['records'] / consume_s:,.0f} records/s), {stats['duplicates']} redelivered record(s) skipped")
+    print(f"   Rebuild: {rebuild_s * 1000:.1f} ms; breakdowns from counters: {read_s * 1000:.2f} ms; "
+          f"full recount: {scan_s * 1000:.1f} ms")
+    print(f"   status: {breakdowns['status']}")
+    print("✅ Counters match a full recount" if ok else "❌ Counters drifted")
+    return 0 if ok else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Materialized meeting counters maintained from the meetings table stream',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python meeting-counters.py show
+  python meeting-counters.py rebuild --segments 16
+  python meeting-counters.py consume --follow
+  python meeting-counters.py selftest --meetings 50000 --redeliver 0.2
+        """
+    )
+    parser.add_argument('--table', default=DYNAMODB_TABLE, help=f'Meetings table (default: {DYNAMODB_TABLE})')
+    parser.add_argument('--counters', default=COUNTERS_TABLE, help=f'Counters table (default: {COUNTERS_TABLE})')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    sub.add_parser('show', help='Print breakdowns from the counters table')
+
+    rebuild = sub.add_parser('rebuild', help='Recount the meetings table into the counters table')
+    rebuild.add_argument('--segments', type=int, default=DEFAULT_SEGMENTS,
+                         help=f'Parallel scan segments (default: {DEFAULT_SEGMENTS})')
+
+    consume = sub.add_parser('consume', help='Apply the meetings stream to the counters table')
+    consume.add_argument('--stream-arn', help='Stream ARN (default: the table\'s latest stream)')
+    consume.add_argument('--follow', action='store_true', help='Keep polling after catching up')
+
+    selftest = sub.add_parser('selftest', help='Check the consumer against in-memory stand-ins')
+    selftest.add_argument('--meetings', type=int, default=10000, help='Meetings to simulate (default: 10,000)')
+    selftest.add_argument('--batch', type=int, default=100, help='Stream records per batch (default: 100)')
+    selftest.add_argument('--redeliver', type=float, default=0.1,
+                          help='Probability of redelivering part of the previous batch (default: 0.1)')
+    selftest.add_argument('--seed', type=int, default=7, help='Random seed (default: 7)')
+
+    args = parser.parse_args()
+    commands = {'show': cmd_show, 'rebuild': cmd_rebuild, 'consume': cmd_consume, 'selftest': cmd_selftest}
+    print("🧮 Meeting Counters")
+    print("=" * 70)
+    return commands[args.command](args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
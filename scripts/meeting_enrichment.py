@@ -0,0 +1,241 @@
+"""
+Direct Graph enrichment of meeting records, bypassing the admin app.
+
+Python port of the admin app's meetingService.fetchDetails for backfills:
+for a batch of meeting IDs it reads the records with BatchGetItem, fetches
+their calendar events with $select through Graph JSON $batch (20 requests
+per call), resolves organizer user IDs and onlineMeetingIds the same way
+fetchDetails does (also batched, with organizer IDs cached for the run),
+merges duplicates sharing an onlineMeetingId and writes the results back
+with DynamoDB batch writes.
+
+    enricher = DirectEnricher("tmf-meetings-8akfpg", graph_session, keys)
+    success, failures = enricher.enrich(["AAMk...", ...])
+
+keys maps meeting_id to its created_at range key (as read from the status
+index), so no per-meeting key lookup is needed.
+"""
+import os
+import sys
+import threading
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote, unquote
+
+import boto3
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "graph"))
+from auth_helper import GRAPH_BATCH_LIMIT, graph_batch
+
+ONLINE_MEETING_INDEX = "onlineMeetingId-index"
+BATCH_GET_LIMIT = 100
+
+# Everything fetchDetails reads from the event (and keeps as rawEventData)
+EVENT_SELECT = "subject,bodyPreview,start,end,organizer,attendees,onlineMeeting,isOnlineMeeting"
+
+
+def now_iso() -> str:
+    """Timestamp in the admin app's format (JavaScript toISOString)."""
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def chunks(items: List[Any], size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def organizer_address(event: Dict[str, Any]) -> str:
+    return ((event.get("organizer") or {}).get("emailAddress") or {}).get("address") or ""
+
+
+def map_attendees(event: Dict[str, Any]) -> List[Dict[str, str]]:
+    """Attendees in the admin app's Meeting shape."""
+    attendees = []
+    for attendee in event.get("attendees") or []:
+        address = (attendee.get("emailAddress") or {})
+        attendees.append({
+            "id": address.get("address") or "",
+            "email": address.get("address") or "",
+            "displayName": address.get("name") or "",
+            "role": "required" if attendee.get("type") == "required" else "optional",
+            "status": (attendee.get("status") or {}).get("response") or "notResponded",
+        })
+    return attendees
+
+
+def enriched_item(meeting: Dict[str, Any], event: Dict[str, Any], organizer_user_id: str,
+                  online_meeting_id: str, join_url: str) -> Dict[str, Any]:
+    """The record fetchDetails would write for this meeting and event."""
+    organizer = (event.get("organizer") or {}).get("emailAddress") or {}
+    status = meeting.get("status")
+    return {
+        **meeting,
+        "subject": event.get("subject") or "Untitled Meeting",
+        "description": event.get("bodyPreview") or "",
+        "startTime": (event.get("start") or {}).get("dateTime") or meeting.get("startTime", ""),
+        "endTime": (event.get("end") or {}).get("dateTime") or meeting.get("endTime", ""),
+        "organizerId": organizer.get("address") or "",
+        "organizerEmail": organizer.get("address") or "",
+        "organizerDisplayName": organizer.get("name") or "",
+        "attendees": map_attendees(event),
+        "status": "scheduled" if status == "notification_received" else status,
+        "joinWebUrl": join_url,
+        "onlineMeetingId": online_meeting_id,
+        "organizerUserId": organizer_user_id,
+        "rawEventData": event,
+        "detailsFetched": True,
+        "changeType": "processed",
+        "updatedAt": now_iso(),
+    }
+
+
+class DirectEnricher:
+    """Enrich batches of meetings straight from Graph; safe to call from several threads."""
+
+    def __init__(self, table: str, graph_session, keys: Dict[str, str]):
+        self.table_name = table
+        self.graph = graph_session
+        self.keys = keys
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._user_ids: Dict[str, Optional[str]] = {}  # organizer email -> user id (None: not resolvable)
+        self._canonical: Dict[str, str] = {}  # onlineMeetingId -> meeting_id written in this run
+
+    # ---- DynamoDB (one boto3 session per thread; resources are not thread-safe) ----
+
+    def _resource(self):
+        if not hasattr(self._local, "resource"):
+            self._local.resource = boto3.session.Session().resource("dynamodb")
+        return self._local.resource
+
+    def _table(self):
+        return self._resource().Table(self.table_name)
+
+    def _load(self, meeting_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Full records via BatchGetItem (100 keys per call, unprocessed keys re-requested)."""
+        items: Dict[str, Dict[str, Any]] = {}
+        for ids in chunks(meeting_ids, BATCH_GET_LIMIT):
+            request = {self.table_name: {"Keys": [{"meeting_id": mid, "created_at": self.keys[mid]} for mid in ids]}}
+            while request:
+                response = self._resource().batch_get_item(RequestItems=request)
+                for item in response.get("Responses", {}).get(self.table_name, []):
+                    items[item["meeting_id"]] = item
+                request = response.get("UnprocessedKeys") or None
+        return items
+
+    def _existing_canonical(self, online_meeting_id: str, meeting_id: str) -> Optional[str]:
+        """meeting_id of another record with this onlineMeetingId, if any (findByOnlineMeetingId)."""
+        with self._lock:
+            canonical = self._canonical.get(online_meeting_id)
+            if canonical is None:
+                # Claim it now so a duplicate in a concurrent batch merges into this one
+                self._canonical[online_meeting_id] = meeting_id
+            elif canonical != meeting_id:
+                return canonical
+        response = self._table().query(
+            IndexName=ONLINE_MEETING_INDEX,
+            KeyConditionExpression="onlineMeetingId = :omid",
+            ExpressionAttributeValues={":omid": online_meeting_id},
+            Limit=2,
+        )
+        for item in response.get("Items", []):
+            if item["meeting_id"] != meeting_id:
+                with self._lock:
+                    self._canonical[online_meeting_id] = item["meeting_id"]
+                return item["meeting_id"]
+        return None
+
+    # ---- Graph ---------------------------------------------------------------
+
+    def _graph_batch(self, urls: List[str]) -> List[Tuple[int, Any]]:
+        results: List[Tuple[int, Any]] = []
+        for part in chunks(urls, GRAPH_BATCH_LIMIT):
+            results.extend(graph_batch(self.graph, part, parse_float=Decimal))
+        return results
+
+    def _resolve_user_ids(self, emails: List[str]) -> None:
+        with self._lock:
+            missing = sorted({e for e in emails if e not in self._user_ids})
+        if not missing:
+            return
+        results = self._graph_batch([f"/users/{quote(email)}?$select=id" for email in missing])
+        with self._lock:
+            for email, (status, body) in zip(missing, results):
+                self._user_ids[email] = body.get("id") if status == 200 and body else None
+
+    def _resolve_online_meetings(self, lookups: Dict[str, Tuple[str, str]]) -> Dict[str, str]:
+        """meeting_id -> onlineMeetingId, by JoinWebUrl filter: decoded URL first, then as stored."""
+        found: Dict[str, str] = {}
+        decoded = [(mid, user_id, unquote(url)) for mid, (user_id, url) in lookups.items()]
+        stored = [(mid, user_id, url) for mid, (user_id, url) in lookups.items() if url != unquote(url)]
+        for attempt in (decoded, stored):
+            todo = [lookup for lookup in attempt if lookup[0] not in found]
+            if not todo:
+                continue
+            urls = []
+            for _, user_id, url in todo:
+                escaped = url.replace("'", "''")  # OData string literal
+                urls.append(f"/users/{user_id}/onlineMeetings?$filter=" + quote(f"JoinWebUrl eq '{escaped}'"))
+            for (mid, _, _), (status, body) in zip(todo, self._graph_batch(urls)):
+                if status == 200 and body and body.get("value"):
+                    found[mid] = body["value"][0]["id"]
+        return found
+
+    # ---- batch ---------------------------------------------------------------
+
+    def enrich(self, meeting_ids: List[str]) -> Tuple[int, List[Dict[str, Any]]]:
+        """Enrich meeting_ids; returns (success count, failures) like the admin app endpoint."""
+        failures: List[Dict[str, Any]] = []
+        meetings = self._load([mid for mid in meeting_ids if mid in self.keys])
+        for mid in meeting_ids:
+            if mid not in meetings:
+                failures.append({"id": mid, "error": "Meeting not found"})
+        todo = []
+        for mid, meeting in meetings.items():
+            if meeting.get("resource"):
+                todo.append(meeting)
+            else:
+                failures.append({"id": mid, "error": "Meeting has no resource path"})
+
+        events: Dict[str, Dict[str, Any]] = {}
+        results = self._graph_batch([f"/{m['resource']}?$select={EVENT_SELECT}" for m in todo])
+        for meeting, (status, body) in zip(todo, results):
+            if status == 200 and body:
+                events[meeting["meeting_id"]] = body
+            else:
+                error = (body or {}).get("error", {}).get("message") if isinstance(body, dict) else None
+                failures.append({"id": meeting["meeting_id"], "error": f"Graph {status}: {error or 'event fetch failed'}",
+                                 "retry": status in (0, 429, 500, 502, 503, 504)})
+        todo = [m for m in todo if m["meeting_id"] in events]
+
+        # Organizer user IDs (GUIDs are required for app-only onlineMeetings access)
+        organizer_email = {m["meeting_id"]: organizer_address(events[m["meeting_id"]]) for m in todo}
+        self._resolve_user_ids([organizer_email[m["meeting_id"]] for m in todo
+                                if organizer_email[m["meeting_id"]] and not m.get("organizerUserId")])
+        user_ids, join_urls, lookups = {}, {}, {}
+        for meeting in todo:
+            mid = meeting["meeting_id"]
+            event = events[mid]
+            with self._lock:
+                user_ids[mid] = meeting.get("organizerUserId") or self._user_ids.get(organizer_email[mid]) or ""
+            join_urls[mid] = (event.get("onlineMeeting") or {}).get("joinUrl") or meeting.get("joinWebUrl") or ""
+            if not meeting.get("onlineMeetingId") and join_urls[mid] and user_ids[mid]:
+                lookups[mid] = (user_ids[mid], join_urls[mid])
+        online_ids = self._resolve_online_meetings(lookups) if lookups else {}
+
+        writes = []
+        for meeting in todo:
+            mid = meeting["meeting_id"]
+            online_meeting_id = online_ids.get(mid) or meeting.get("onlineMeetingId") or ""
+            canonical = self._existing_canonical(online_meeting_id, mid) if online_meeting_id else None
+            if canonical:
+                # mergeDuplicate: only status, mergedInto and updatedAt change
+                writes.append({**meeting, "status": "merged", "mergedInto": canonical, "updatedAt": now_iso()})
+            else:
+                writes.append(enriched_item(meeting, events[mid], user_ids[mid], online_meeting_id, join_urls[mid]))
+
+        with self._table().batch_writer(overwrite_by_pkeys=["meeting_id", "created_at"]) as writer:
+            for item in writes:
+                writer.put_item(Item=item)
+        return len(writes), failures
@@ -0,0 +1,127 @@
+"""
+Notification Coalescer
+Collapses bursts of Graph change notifications for the same resource
+
+Graph frequently emits several "updated" notifications for one event within
+a few seconds (e.g. a rename followed by a reschedule). Each of those triggers
+the same enrichment work downstream, so forwarders pass notifications through
+this stage and only the latest one per (resource, changeType class) inside the
+window is emitted.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# changeType -> class used for coalescing. "created" and "updated" are kept
+# apart so a replayed "created" is never swallowed by a later "updated".
+CHANGE_TYPE_CLASSES = {
+    "created": "create",
+    "updated": "update",
+    "deleted": "delete",
+}
+
+
+def change_type_class(change_type: str) -> str:
+    """Map a Graph changeType to its coalescing class."""
+    return CHANGE_TYPE_CLASSES.get((change_type or "").strip().lower(), change_type or "unknown")
+
+
+def coalesce_key(notification: Dict[str, Any]) -> Tuple[str, str]:
+    """Key a notification by (resource, changeType class)."""
+    resource = notification.get("resource") or notification.get("resourceData", {}).get("id", "")
+    return resource, change_type_class(notification.get("changeType", ""))
+
+
+class NotificationCoalescer:
+    """
+    Windowed coalescing stage.
+
+    The first notification for a key opens a window of ``window_seconds``.
+    Notifications for the same key arriving inside that window replace the
+    pending one and are counted as suppressed. Pending notifications are
+    released once the window has elapsed (relative to the timestamps passed
+    to ``add``) or when ``flush`` is called.
+    """
+
+    def __init__(self, window_seconds: float = 5.0):
+        if window_seconds < 0:
+            raise ValueError("window_seconds must be >= 0")
+        self.window_seconds = window_seconds
+        # key -> [window_end, notification]; insertion order == expiry order
+        self._pending: "OrderedDict[Tuple[str, str], List[Any]]" = OrderedDict()
+        self.received = 0
+        self.emitted = 0
+        self.suppressed = 0
+
+    def add(self, notification: Dict[str, Any], timestamp: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Offer a notification to the stage.
+
+        Returns the notifications whose window closed at ``timestamp``
+        (defaults to the monotonic clock), in the order their windows opened.
+        """
+        now = time.monotonic() if timestamp is None else timestamp
+        self.received += 1
+
+        ready = self._expire(now)
+
+        key = coalesce_key(notification)
+        pending = self._pending.get(key)
+        if pending is not None and now <= pending[0]:
+            pending[1] = notification
+            self.suppressed += 1
+        else:
+            self._pending[key] = [now + self.window_seconds, notification]
+
+        if self.window_seconds == 0:
+            ready.extend(self.flush())
+        return ready
+
+    def _expire(self, now: float) -> List[Dict[str, Any]]:
+        ready = []
+        while self._pending:
+            key, (window_end, notification) = next(iter(self._pending.items()))
+            if window_end >= now:
+                break
+            del self._pending[key]
+            ready.append(notification)
+        self.emitted += len(ready)
+        return ready
+
+    def flush(self) -> List[Dict[str, Any]]:
+        """Release every pending notification regardless of its window."""
+        ready = [notification for _, notification in self._pending.values()]
+        self._pending.clear()
+        self.emitted += len(ready)
+        return ready
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for reporting: received, emitted, suppressed, pending."""
+        return {
+            "received": self.received,
+            "emitted": self.emitted,
+            "suppressed": self.suppressed,
+            "pending": len(self._pending),
+        }
+
+
+def coalesce(
+    notifications: Iterable[Tuple[float, Dict[str, Any]]],
+    window_seconds: float,
+    coalescer: Optional[NotificationCoalescer] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Coalesce a stream of (timestamp, notification) pairs.
+
+    Timestamps should be non-decreasing. One that goes backwards (e.g. event
+    enqueue times across archive objects ordered by LastModified) is clamped
+    to the latest timestamp seen, so windows never reopen in the past. Pass
+    an explicit ``coalescer`` to read its ``stats()`` once the stream is
+    exhausted.
+    """
+    stage = coalescer or NotificationCoalescer(window_seconds)
+    latest = float("-inf")
+    for timestamp, notification in notifications:
+        latest = max(latest, timestamp)
+        yield from stage.add(notification, latest)
+    yield from stage.flush()
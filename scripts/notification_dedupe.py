@@ -0,0 +1,194 @@
+"""
+Notification Dedupe
+Memory-bounded exact duplicate detection for archived Graph notifications
+
+Replays and backfills over weeks of eventhub/ archives can reach millions of
+notifications, too many to remember in a Python set. Each notification is
+keyed on (subscriptionId, resource, changeType, payload hash). A scalable
+Bloom filter answers "definitely new" in memory; only possible hits are
+confirmed against an on-disk SQLite table, so answers stay exact while memory
+grows by roughly 1-2 MB per million notifications.
+"""
+import hashlib
+import json
+import math
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+
+def notification_key(notification: Dict[str, Any]) -> bytes:
+    """Return a 16-byte digest of (subscriptionId, resource, changeType, payload)."""
+    payload = json.dumps(notification, sort_keys=True, separators=(",", ":"), default=str)
+    payload_hash = hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+    identity = "\x1f".join([
+        str(notification.get("subscriptionId", "")),
+        str(notification.get("resource", "")),
+        str(notification.get("changeType", "")),
+        payload_hash,
+    ])
+    return hashlib.blake2b(identity.encode("utf-8"), digest_size=16).digest()
+
+
+class BloomFilter:
+    """Fixed-capacity Bloom filter over pre-hashed byte keys."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        bits = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.num_bits = max(8, bits)
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: bytes) -> Iterator[int]:
+        # Kirsch-Mitzenmacher double hashing from the two halves of a digest
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def __contains__(self, key: bytes) -> bool:
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+    def add(self, key: bytes) -> None:
+        for p in self._positions(key):
+            self.bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+
+class ScalableBloomFilter:
+    """
+    Bloom filter that grows by adding filters of increasing capacity.
+
+    Each new stage doubles the capacity and tightens the error rate so the
+    compound false-positive rate stays below ``error_rate``.
+    """
+
+    GROWTH = 2
+    TIGHTENING = 0.9
+
+    def __init__(self, initial_capacity: int = 100_000, error_rate: float = 0.001):
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.filters = [BloomFilter(initial_capacity, error_rate * (1 - self.TIGHTENING))]
+
+    def __contains__(self, key: bytes) -> bool:
+        return any(key in f for f in reversed(self.filters))
+
+    def add(self, key: bytes) -> None:
+        current = self.filters[-1]
+        if current.count >= current.capacity:
+            current = BloomFilter(
+                current.capacity * self.GROWTH,
+                current.error_rate * self.TIGHTENING,
+            )
+            self.filters.append(current)
+        current.add(key)
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(len(f.bits) for f in self.filters)
+
+
+class NotificationDeduper:
+    """
+    Exact "have we seen this notification" check with bounded memory.
+
+    ``path`` is the SQLite file holding confirmed keys; reuse it across runs
+    to resume a backfill without re-sending. The default in-memory database
+    is only suitable for small runs.
+    """
+
+    def __init__(self, path: str = ":memory:", initial_capacity: int = 100_000,
+                 error_rate: float = 0.001, commit_every: int = 10_000):
+        self.path = path
+        self.bloom = ScalableBloomFilter(initial_capacity, error_rate)
+        self.commit_every = commit_every
+        self.seen = 0
+        self.duplicates = 0
+        self.disk_checks = 0
+        self._uncommitted = 0
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=OFF")
+        self.db.execute("CREATE TABLE IF NOT EXISTS seen (key BLOB PRIMARY KEY) WITHOUT ROWID")
+        self._warm_bloom()
+
+    def _warm_bloom(self) -> None:
+        """Reload keys persisted by earlier runs into the Bloom filter."""
+        for (key,) in self.db.execute("SELECT key FROM seen"):
+            self.bloom.add(key)
+
+    def contains(self, notification: Dict[str, Any]) -> bool:
+        """Return True if the notification was recorded before, without recording it."""
+        key = notification_key(notification)
+        self.seen += 1
+        if self._known(key):
+            self.duplicates += 1
+            return True
+        return False
+
+    def mark(self, notification: Dict[str, Any]) -> None:
+        """Record the notification as seen (e.g. once it has been delivered)."""
+        key = notification_key(notification)
+        if not self._known(key):
+            self._record(key)
+
+    def is_duplicate(self, notification: Dict[str, Any]) -> bool:
+        """Record the notification and return True if it was seen before."""
+        key = notification_key(notification)
+        self.seen += 1
+        if self._known(key):
+            self.duplicates += 1
+            return True
+        self._record(key)
+        return False
+
+    def _known(self, key: bytes) -> bool:
+        if key not in self.bloom:
+            return False
+        self.disk_checks += 1
+        return self.db.execute("SELECT 1 FROM seen WHERE key = ?", (key,)).fetchone() is not None
+
+    def _record(self, key: bytes) -> None:
+        self.bloom.add(key)
+        self.db.execute("INSERT OR IGNORE INTO seen (key) VALUES (?)", (key,))
+        self._uncommitted += 1
+        if self._uncommitted >= self.commit_every:
+            self.db.commit()
+            self._uncommitted = 0
+
+    def filter(self, notifications: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Yield only notifications that have not been seen before."""
+        for notification in notifications:
+            if not self.is_duplicate(notification):
+                yield notification
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "seen": self.seen,
+            "duplicates": self.duplicates,
+            "disk_checks": self.disk_checks,
+            "bloom_bytes": self.bloom.size_bytes,
+        }
+
+    def close(self) -> None:
+        self.db.commit()
+        self.db.close()
+
+    def __enter__(self) -> "NotificationDeduper":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def open_deduper(path: Optional[str]) -> Optional[NotificationDeduper]:
+    """Convenience for CLIs: ``None`` disables dedupe, otherwise open ``path``."""
+    return NotificationDeduper(path) if path else None
@@ -8,79 +8,38 @@ S3 has the archived events, DynamoDB missing the "created" records.
 
 This script:
 1. Lists S3 objects from the blitz time window
-2. Reads each S3 file containing EventHub payloads
+2. Streams each S3 file containing EventHub payloads (one event in memory at a time)
 3. Extracts Graph notifications from events[].body.value[]
-4. Filters for changeType="created"
-5. POSTs each to admin app webhook
-6. Reports results
+4. Filters for changeType="created" as notifications arrive
+5. Optionally coalesces bursts per (resource, changeType class)
+6. POSTs each to admin app webhook, skipping ones a previous run delivered
+7. Reports results
 """
 
-import json
 import subprocess
 import sys
+import tempfile
 import time
 from datetime import datetime, timezone
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple
+
+from notification_coalescer import NotificationCoalescer, coalesce
+from notification_dedupe import open_deduper
+from s3_archive import COMPACT_PREFIX, PARSE_ERRORS, iter_compacted_notifications, iter_stream_notifications
+from webhook_helper import get_lambda_env, post_webhook, run_aws
 
 # AWS/S3 config
 BUCKET = "tmf-webhooks-eus-dev"
 PREFIX = "eventhub/"
 TIME_START = "2026-02-26T18:25:00"
 TIME_END = "2026-02-26T19:00:00"
-LAMBDA_FUNCTION = "tmf-eventhub-processor-dev"
 
 # Replay config
 PACE_MS = 200  # milliseconds between requests
 
 
-def run_aws(args: List[str], check: bool = True) -> Dict[str, Any]:
-    """Run AWS CLI command and return parsed JSON output."""
-    result = subprocess.run(
-        ["aws"] + args,
-        capture_output=True,
-        text=True,
-        check=check
-    )
-    if result.returncode != 0:
-        print(f"AWS CLI error: {result.stderr}", file=sys.stderr)
-        if check:
-            sys.exit(1)
-        return {}
-    return json.loads(result.stdout) if result.stdout else {}
-
-
-def get_lambda_env() -> tuple[str, str]:
-    """Fetch ADMIN_APP_WEBHOOK_URL and WEBHOOK_AUTH_SECRET from Lambda config."""
-    print("Fetching Lambda configuration...")
-    config = run_aws([
-        "lambda", "get-function-configuration",
-        "--function-name", LAMBDA_FUNCTION
-    ])
-    env_vars = config.get("Environment", {}).get("Variables", {})
-    webhook_url = env_vars.get("ADMIN_APP_WEBHOOK_URL", "")
-    auth_secret = env_vars.get("WEBHOOK_AUTH_SECRET", "")
-    
-    if not webhook_url:
-        print("ERROR: ADMIN_APP_WEBHOOK_URL not set in Lambda config", file=sys.stderr)
-        sys.exit(1)
-    if not auth_secret:
-        print("ERROR: WEBHOOK_AUTH_SECRET not set in Lambda config", file=sys.stderr)
-        sys.exit(1)
-    
-    # Ensure webhook URL points to the graph webhook endpoint
-    if not webhook_url.endswith("/api/webhooks/graph"):
-        if webhook_url.endswith("/"):
-            webhook_url = webhook_url + "api/webhooks/graph"
-        else:
-            webhook_url = webhook_url + "/api/webhooks/graph"
-    
-    print(f"Admin app webhook: {webhook_url}")
-    print(f"Auth secret: {auth_secret[:8]}... (first 8 chars)")
-    return webhook_url, auth_secret
-
-
-def list_s3_objects() -> List[str]:
-    """List S3 objects in the time window."""
+def list_s3_objects() -> List[Tuple[str, float]]:
+    """List S3 objects in the time window as (key, LastModified epoch) pairs."""
     print(f"\nListing S3 objects in {BUCKET}/{PREFIX} from {TIME_START} to {TIME_END}...")
     
     # List all objects with the prefix
@@ -101,77 +60,85 @@ def list_s3_objects() -> List[str]:
     for obj in objects:
         last_modified = datetime.fromisoformat(obj["LastModified"].replace("Z", "+00:00"))
         if start_dt <= last_modified <= end_dt:
-            filtered.append(obj["Key"])
+            filtered.append((obj["Key"], last_modified.timestamp()))
     
+    filtered.sort(key=lambda entry: entry[1])
     print(f"Filtered to {len(filtered)} objects in time window")
     return filtered
 
 
-def read_s3_object(key: str) -> Optional[Dict[str, Any]]:
-    """Read and parse S3 object as JSON."""
-    result = subprocess.run(
-        ["aws", "s3", "cp", f"s3://{BUCKET}/{key}", "-"],
-        capture_output=True,
-        text=True,
-        check=False
-    )
-    if result.returncode != 0:
-        print(f"Failed to read s3://{BUCKET}/{key}: {result.stderr}", file=sys.stderr)
-        return None
+def stream_s3_object(key: str, last_modified: float) -> Iterator[Tuple[float, Dict[str, Any]]]:
+    """
+    Stream (timestamp, notification) pairs out of one archive object.
+    
+    The object is piped from the AWS CLI straight into the streaming parser,
+    so only the current event is held in memory. Timestamps are the event's
+    enqueuedTimeUtc, falling back to the object's LastModified; objects are
+    ordered by LastModified, so they are not guaranteed to be non-decreasing
+    across objects (coalesce() clamps them).
+    """
+    fallback = datetime.fromtimestamp(last_modified, tz=timezone.utc)
+    # stderr goes to a file: a pipe nobody reads until stdout is drained can fill and deadlock
+    with tempfile.TemporaryFile() as stderr:
+        proc = subprocess.Popen(
+            ["aws", "s3", "cp", f"s3://{BUCKET}/{key}", "-"],
+            stdout=subprocess.PIPE,
+            stderr=stderr,
+        )
+        try:
+            for enqueued, notification in iter_stream_notifications(proc.stdout, fallback):
+                yield enqueued.timestamp(), notification
+        finally:
+            proc.stdout.close()
+            if proc.wait() != 0:
+                stderr.seek(0)
+                message = stderr.read().decode("utf-8", "replace").strip()
+                raise RuntimeError(f"aws s3 cp failed: {message}")
+
+
+def extract_notifications(
+    s3_keys: Iterable[Tuple[str, float]],
+    stats: Dict[str, int],
+) -> Iterator[Tuple[float, Dict[str, Any]]]:
+    """
+    Extract Graph notifications from S3 EventHub archive objects as a stream.
+    
+    S3 file format: { events: [ { body: { value: [...] } } ] }. Per-file
+    counters are written to ``stats``.
+    """
+    for key, last_modified in s3_keys:
+        try:
+            for timestamp, notification in stream_s3_object(key, last_modified):
+                yield timestamp, notification
+            stats["files_read"] += 1
+        except (RuntimeError,) + PARSE_ERRORS as e:
+            print(f"Failed to read s3://{BUCKET}/{key}: {e}", file=sys.stderr)
+            stats["files_failed"] += 1
+
+
+def read_compacted_notifications() -> Iterator[Tuple[float, Dict[str, Any]]]:
+    """Stream notifications for the time window from the compacted hourly archive."""
+    import boto3
     
-    try:
-        return json.loads(result.stdout)
-    except json.JSONDecodeError as e:
-        print(f"Failed to parse JSON from {key}: {e}", file=sys.stderr)
-        return None
-
-
-def extract_notifications(s3_data: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """Extract Graph notifications from S3 EventHub archive format."""
-    notifications = []
-    
-    # S3 file format: { events: [ { body: { value: [...] } } ] }
-    events = s3_data.get("events", [])
-    for event in events:
-        body = event.get("body", {})
-        value_array = body.get("value", [])
-        for notification in value_array:
-            notifications.append(notification)
+    start_dt = datetime.fromisoformat(TIME_START).replace(tzinfo=timezone.utc)
+    end_dt = datetime.fromisoformat(TIME_END).replace(tzinfo=timezone.utc)
+    print(f"\nReading compacted archive s3://{BUCKET}/{COMPACT_PREFIX} from {TIME_START} to {TIME_END}...")
     
-    return notifications
+    for enqueued, notification in iter_compacted_notifications(boto3.client("s3"), BUCKET, start_dt, end_dt):
+        yield enqueued.timestamp(), notification
 
 
-def post_webhook(url: str, auth_secret: str, notification: Dict[str, Any]) -> bool:
-    """POST notification to admin app webhook. Returns True on success."""
-    import urllib.request
-    import ssl
-    
-    # Prepare request
-    payload = {"value": [notification]}
-    body = json.dumps(payload).encode("utf-8")
-    
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {auth_secret}"
-    }
-    
-    request = urllib.request.Request(url, data=body, headers=headers)
-    
-    # Disable SSL verification for self-signed certs
-    ctx = ssl.create_default_context()
-    ctx.check_hostname = False
-    ctx.verify_mode = ssl.CERT_NONE
-    
-    try:
-        with urllib.request.urlopen(request, context=ctx, timeout=10) as response:
-            if response.status == 200:
-                return True
-            else:
-                print(f"Webhook returned {response.status}", file=sys.stderr)
-                return False
-    except Exception as e:
-        print(f"Webhook request failed: {e}", file=sys.stderr)
-        return False
+def filter_change_types(
+    notifications: Iterable[Tuple[float, Dict[str, Any]]],
+    target_types: Optional[set],
+    by_type: Dict[str, int],
+) -> Iterator[Tuple[float, Dict[str, Any]]]:
+    """Count every notification by changeType and pass through the targeted ones."""
+    for timestamp, notification in notifications:
+        ct = notification.get("changeType", "unknown")
+        by_type[ct] = by_type.get(ct, 0) + 1
+        if target_types is None or ct in target_types:
+            yield timestamp, notification
 
 
 def main():
@@ -179,6 +146,15 @@ def main():
     parser = argparse.ArgumentParser(description="Replay S3-archived Graph notifications")
     parser.add_argument("--change-types", default="created",
                         help="Comma-separated changeTypes to replay (e.g., 'created', 'updated,deleted', 'all')")
+    parser.add_argument("--coalesce-window", type=float, default=0,
+                        help="Seconds within which only the latest notification per "
+                             "(resource, changeType class) is replayed (0 = off)")
+    parser.add_argument("--compacted", action="store_true",
+                        help=f"Read from the hourly compacted archive ({COMPACT_PREFIX}) "
+                             "produced by compact-s3-archive.py")
+    parser.add_argument("--dedupe-db", default=None,
+                        help="SQLite file of delivered notifications; reuse it across runs "
+                             "so backfills never re-send one that was already posted")
     args = parser.parse_args()
     
     if args.change_types == "all":
@@ -192,78 +168,84 @@ def main():
     # Step 1: Get Lambda webhook config
     webhook_url, auth_secret = get_lambda_env()
     
-    # Step 2: List S3 objects in time window
-    s3_keys = list_s3_objects()
-    if not s3_keys:
-        print("\nNo S3 objects found in time window. Exiting.")
-        return
-    
-    # Step 3: Read S3 files and extract notifications
-    print(f"\nReading {len(s3_keys)} S3 files...")
-    all_notifications = []
-    files_read = 0
-    files_failed = 0
-    
-    for key in s3_keys:
-        s3_data = read_s3_object(key)
-        if s3_data:
-            notifications = extract_notifications(s3_data)
-            all_notifications.extend(notifications)
-            files_read += 1
-        else:
-            files_failed += 1
-    
-    print(f"Successfully read {files_read} files, {files_failed} failed")
-    print(f"Extracted {len(all_notifications)} total notifications")
+    deduper = open_deduper(args.dedupe_db)
+    stats = {"files_read": 0, "files_failed": 0}
     
-    # Step 4: Analyze and filter notification types
+    # Steps 2-3: Stream notifications out of the archive
+    if args.compacted:
+        # A few ranged GETs against the hourly compacted objects
+        source = read_compacted_notifications()
+    else:
+        s3_keys = list_s3_objects()
+        if not s3_keys:
+            print("\nNo S3 objects found in time window. Exiting.")
+            return
+        print(f"\nStreaming {len(s3_keys)} S3 files...")
+        source = extract_notifications(s3_keys, stats)
+    
+    # Step 4: Filter by changeType as notifications arrive
     by_type = {}
-    target_notifications = []
-    
-    for notif in all_notifications:
-        ct = notif.get("changeType", "unknown")
-        by_type[ct] = by_type.get(ct, 0) + 1
-        if target_types is None or ct in target_types:
-            target_notifications.append(notif)
-    
-    print(f"\nNotification breakdown:")
-    for ct, count in sorted(by_type.items()):
-        marker = " ← replaying" if (target_types is None or ct in target_types) else ""
-        print(f"  - {ct}: {count}{marker}")
-    
-    if not target_notifications:
-        print(f"\nNo matching notifications found to replay. Exiting.")
-        return
+    stream = filter_change_types(source, target_types, by_type)
+    
+    # Step 4b: Collapse bursts so each resource is enriched once per window
+    coalescer = None
+    if args.coalesce_window > 0:
+        coalescer = NotificationCoalescer(args.coalesce_window)
+        stream = coalesce(stream, args.coalesce_window, coalescer)
+        print(f"Coalescing within {args.coalesce_window:g}s window")
+    else:
+        stream = (notif for _, notif in stream)
     
     # Step 5: Replay filtered notifications
-    print(f"\nReplaying {len(target_notifications)} notifications to webhook...")
+    print(f"\nReplaying matching notifications to webhook...")
     print(f"Pacing: {PACE_MS}ms between requests\n")
     
     success_count = 0
     fail_count = 0
     
-    for i, notif in enumerate(target_notifications, 1):
+    for notif in stream:
+        # Checked here, after filtering and coalescing, and recorded only once
+        # delivered: failed sends and other changeTypes stay replayable
+        if deduper and deduper.contains(notif):
+            continue
+        i = success_count + fail_count + 1
+        if i > 1:
+            time.sleep(PACE_MS / 1000.0)
+        
         resource = notif.get("resource", "unknown")
         ct = notif.get("changeType", "?")
-        print(f"[{i}/{len(target_notifications)}] [{ct}] {resource[-40:]}...", end=" ")
+        print(f"[{i}] [{ct}] {resource[-40:]}...", end=" ")
         
         if post_webhook(webhook_url, auth_secret, notif):
             print("OK")
             success_count += 1
+            if deduper:
+                deduper.mark(notif)
         else:
             print("FAIL")
             fail_count += 1
-        
-        if i < len(target_notifications):
-            time.sleep(PACE_MS / 1000.0)
+    
+    replayed = success_count + fail_count
+    total = sum(by_type.values())
+    if deduper:
+        dedupe_stats = deduper.stats()
+        deduper.close()
     
     # Step 6: Report results
     print(f"\n=== Replay Complete ===")
-    print(f"S3 files read: {files_read}")
-    print(f"Total notifications in S3: {len(all_notifications)}")
+    if not args.compacted:
+        print(f"S3 files read: {stats['files_read']} ({stats['files_failed']} failed)")
+    print(f"Total notifications in S3: {total}")
     for ct, count in sorted(by_type.items()):
         print(f"  - {ct}: {count}")
-    print(f"Replayed ({label}): {len(target_notifications)}")
+    if deduper:
+        print(f"Already delivered, skipped: {dedupe_stats['duplicates']} "
+              f"(bloom {dedupe_stats['bloom_bytes'] // 1024} KiB, {dedupe_stats['disk_checks']} disk checks)")
+    if coalescer:
+        print(f"Coalesced away: {coalescer.suppressed}")
+    if replayed == 0:
+        print(f"No matching notifications found to replay.")
+    print(f"Replayed ({label}): {replayed}")
     print(f"  - success: {success_count}")
     print(f"  - failed: {fail_count}")
 
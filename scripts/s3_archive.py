@@ -0,0 +1,384 @@
+"""
+S3 Archive Helper
+Shared logic for the EventHub notification archive in S3
+
+The EventHub Lambda writes one JSON object per poll under eventhub/, shaped
+like {events: [{enqueuedTimeUtc, body: {value: [...]}}]}. The compaction job
+rewrites those into hourly compressed NDJSON objects plus a manifest, and
+readers use the manifest to fetch only the blocks that overlap the time range
+they need. Each line is {"t": enqueuedTimeUtc, "n": notification}, so readers
+can filter on the time of every notification, not just its block.
+
+Compacted layout under COMPACT_PREFIX:
+    2026/02/26/18.ndjson.zst      concatenated compressed blocks
+    2026/02/26/18.manifest.json   time bounds, changeType counts, block offsets
+    _index.json                   one summary entry per compacted hour
+"""
+import gzip
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import ijson
+except ImportError:  # optional: fall back to whole-document json.load
+    ijson = None
+
+try:
+    import zstandard
+except ImportError:  # optional: fall back to gzip
+    zstandard = None
+
+BUCKET = "tmf-webhooks-eus-dev"
+PREFIX = "eventhub/"
+COMPACT_PREFIX = "eventhub-compacted/"
+INDEX_NAME = "_index.json"
+
+# Raised by the streaming parser on a truncated or corrupt archive object
+# (ijson's errors do not derive from ValueError)
+PARSE_ERRORS = (ValueError, ijson.JSONError) if ijson else (ValueError,)
+
+# 1: one bare notification per line; 2: {"t": enqueued time, "n": notification}
+MANIFEST_VERSION = 2
+
+
+# ---------------------------------------------------------------------------
+# Archive format
+# ---------------------------------------------------------------------------
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    """Parse an ISO-8601 timestamp (or datetime) into an aware UTC datetime."""
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def event_notifications(event: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Normalize one archived EventHub event into its Graph notifications.
+
+    Mirrors the Lambda: bodies are either {value: [...]} batches or a single
+    notification.
+    """
+    body = event.get("body")
+    if isinstance(body, str):
+        try:
+            body = json.loads(body)
+        except json.JSONDecodeError:
+            return []
+    if not isinstance(body, dict):
+        return []
+    if "value" in body:
+        return [n for n in body.get("value") or [] if isinstance(n, dict)]
+    return [body]
+
+
+def iter_archive_notifications(
+    s3_data: Dict[str, Any],
+    fallback_time: Optional[datetime] = None,
+) -> Iterator[Tuple[Optional[datetime], Dict[str, Any]]]:
+    """Yield (enqueuedTimeUtc, notification) pairs from one archive object."""
+    for event in s3_data.get("events", []):
+        enqueued = parse_timestamp(event.get("enqueuedTimeUtc")) or fallback_time
+        for notification in event_notifications(event):
+            yield enqueued, notification
+
+
+def iter_archive_events(stream: IO[bytes]) -> Iterator[Dict[str, Any]]:
+    """
+    Stream events[] out of an archive body one event at a time.
+
+    With ijson installed only the current event is held in memory, however
+    large the archive object is. Without it the document is parsed whole.
+    """
+    if ijson:
+        yield from ijson.items(stream, "events.item", use_float=True)
+    else:
+        yield from json.load(stream).get("events", [])
+
+
+def iter_stream_notifications(
+    stream: IO[bytes],
+    fallback_time: Optional[datetime] = None,
+) -> Iterator[Tuple[Optional[datetime], Dict[str, Any]]]:
+    """Streaming counterpart of iter_archive_notifications for a file-like body."""
+    for event in iter_archive_events(stream):
+        enqueued = parse_timestamp(event.get("enqueuedTimeUtc")) or fallback_time
+        for notification in event_notifications(event):
+            yield enqueued, notification
+
+
+# ---------------------------------------------------------------------------
+# Compression
+# ---------------------------------------------------------------------------
+
+def resolve_codec(name: str = "auto") -> str:
+    """Pick "zstd" when available (or requested), otherwise "gzip"."""
+    if name == "auto":
+        return "zstd" if zstandard else "gzip"
+    if name == "zstd" and not zstandard:
+        raise RuntimeError("zstd requested but the 'zstandard' package is not installed")
+    if name not in ("zstd", "gzip"):
+        raise ValueError(f"Unknown codec: {name}")
+    return name
+
+
+def codec_extension(codec: str) -> str:
+    return ".zst" if codec == "zstd" else ".gz"
+
+
+def compress_block(data: bytes, codec: str, level: int = 6) -> bytes:
+    """Compress one self-contained block (a zstd frame or gzip member)."""
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    return gzip.compress(data, compresslevel=level)
+
+
+def decompress_block(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if not zstandard:
+            raise RuntimeError("Archive is zstd-compressed; install 'zstandard' to read it")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+# ---------------------------------------------------------------------------
+# Compacted layout
+# ---------------------------------------------------------------------------
+
+def hour_of(dt: datetime) -> datetime:
+    return dt.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def hour_path(hour: datetime) -> str:
+    return hour.strftime("%Y/%m/%d/%H")
+
+
+def compacted_keys(hour: datetime, codec: str, prefix: str = COMPACT_PREFIX) -> Tuple[str, str]:
+    """Return (data_key, manifest_key) for a compacted hour."""
+    base = f"{prefix}{hour_path(hour)}"
+    return f"{base}.ndjson{codec_extension(codec)}", f"{base}.manifest.json"
+
+
+class BlockWriter:
+    """
+    Accumulates NDJSON lines and emits independently compressed blocks.
+
+    Each block is a complete zstd frame / gzip member, so concatenating them
+    gives a valid stream while the manifest's byte offsets allow ranged GETs
+    of a single block.
+    """
+
+    def __init__(self, codec: str, block_lines: int = 5000, level: int = 6):
+        self.codec = codec
+        self.block_lines = block_lines
+        self.level = level
+        self.chunks: List[bytes] = []
+        self.blocks: List[Dict[str, Any]] = []
+        self.offset = 0
+        self.raw_bytes = 0
+        self._lines: List[bytes] = []
+        self._start: Optional[datetime] = None
+        self._end: Optional[datetime] = None
+
+    def add(self, timestamp: Optional[datetime], notification: Dict[str, Any]) -> None:
+        record = {"t": timestamp.isoformat() if timestamp else None, "n": notification}
+        line = json.dumps(record, separators=(",", ":"), ensure_ascii=False).encode("utf-8") + b"\n"
+        self._lines.append(line)
+        if timestamp:
+            self._start = timestamp if self._start is None else min(self._start, timestamp)
+            self._end = timestamp if self._end is None else max(self._end, timestamp)
+        if len(self._lines) >= self.block_lines:
+            self.close_block()
+
+    def close_block(self) -> None:
+        if not self._lines:
+            return
+        raw = b"".join(self._lines)
+        compressed = compress_block(raw, self.codec, self.level)
+        self.blocks.append({
+            "offset": self.offset,
+            "length": len(compressed),
+            "lines": len(self._lines),
+            "start": self._start.isoformat() if self._start else None,
+            "end": self._end.isoformat() if self._end else None,
+        })
+        self.chunks.append(compressed)
+        self.offset += len(compressed)
+        self.raw_bytes += len(raw)
+        self._lines = []
+        self._start = self._end = None
+
+    def getvalue(self) -> bytes:
+        self.close_block()
+        return b"".join(self.chunks)
+
+
+def build_manifest(
+    hour: datetime,
+    codec: str,
+    data_key: str,
+    writer: BlockWriter,
+    counts: Dict[str, int],
+    source_keys: List[str],
+) -> Dict[str, Any]:
+    starts = [b["start"] for b in writer.blocks if b["start"]]
+    ends = [b["end"] for b in writer.blocks if b["end"]]
+    return {
+        "version": MANIFEST_VERSION,
+        "hour": hour.isoformat(),
+        "codec": codec,
+        "data_key": data_key,
+        "start": min(starts) if starts else None,
+        "end": max(ends) if ends else None,
+        "notification_count": sum(b["lines"] for b in writer.blocks),
+        "counts_by_change_type": dict(sorted(counts.items())),
+        "compressed_bytes": writer.offset,
+        "raw_bytes": writer.raw_bytes,
+        "source_object_count": len(source_keys),
+        "source_keys": sorted(source_keys),
+        "blocks": writer.blocks,
+        "compacted_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Reading raw archive objects (boto3)
+# ---------------------------------------------------------------------------
+
+def list_archive_objects(s3, bucket: str, start: datetime, end: datetime,
+                         prefix: str = PREFIX) -> List[Tuple[str, datetime]]:
+    """List (key, LastModified) for archive objects in [start, end], oldest first."""
+    objects = []
+    for page in s3.get_paginator("list_objects_v2").paginate(Bucket=bucket, Prefix=prefix):
+        for obj in page.get("Contents", []):
+            if start <= obj["LastModified"] <= end:
+                objects.append((obj["Key"], obj["LastModified"]))
+    objects.sort(key=lambda entry: (entry[1], entry[0]))
+    return objects
+
+
+def _read_object_notifications(s3, bucket: str, key: str, last_modified: datetime):
+    body = s3.get_object(Bucket=bucket, Key=key)["Body"]
+    try:
+        return list(iter_stream_notifications(body, last_modified))
+    finally:
+        body.close()
+
+
+def iter_s3_notifications(
+    s3,
+    bucket: str,
+    objects: List[Tuple[str, datetime]],
+    workers: int = 16,
+    errors: Optional[List[Tuple[str, Exception]]] = None,
+) -> Iterator[Tuple[Optional[datetime], Dict[str, Any]]]:
+    """
+    Yield (enqueuedTimeUtc, notification) from raw archive objects, in order.
+
+    Objects are fetched concurrently, at most ``workers * 2`` in flight, so
+    memory stays bounded by a small window of objects. Read failures are
+    appended to ``errors`` (if given) instead of aborting the stream.
+    """
+    window = max(1, workers * 2)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for i in range(0, len(objects), window):
+            chunk = objects[i:i + window]
+            futures = [pool.submit(_read_object_notifications, s3, bucket, key, lm) for key, lm in chunk]
+            for (key, _), future in zip(chunk, futures):
+                try:
+                    yield from future.result()
+                except Exception as e:
+                    if errors is None:
+                        raise
+                    errors.append((key, e))
+
+
+# ---------------------------------------------------------------------------
+# Reading compacted data (boto3)
+# ---------------------------------------------------------------------------
+
+def get_json(s3, bucket: str, key: str) -> Optional[Dict[str, Any]]:
+    try:
+        body = s3.get_object(Bucket=bucket, Key=key)["Body"].read()
+    except s3.exceptions.NoSuchKey:
+        return None
+    return json.loads(body)
+
+
+def list_manifests(s3, bucket: str, start: datetime, end: datetime,
+                   prefix: str = COMPACT_PREFIX) -> List[Dict[str, Any]]:
+    """Load manifests for every compacted hour overlapping [start, end]."""
+    index = get_json(s3, bucket, prefix + INDEX_NAME) or {"hours": {}}
+    manifests = []
+    for hour_iso, summary in sorted(index.get("hours", {}).items()):
+        hour = parse_timestamp(hour_iso)
+        if hour is None or hour > end or hour.replace(minute=59, second=59) < start:
+            continue
+        manifest = get_json(s3, bucket, summary["manifest_key"])
+        if manifest:
+            manifests.append(manifest)
+    return manifests
+
+
+def _block_notifications(data: bytes, manifest: Dict[str, Any],
+                         block_end: Optional[datetime]) -> Iterator[Tuple[Optional[datetime], Dict[str, Any]]]:
+    """Yield (enqueued time, notification) from one decompressed block."""
+    timestamped = manifest.get("version", 1) >= 2
+    for line in decompress_block(data, manifest["codec"]).splitlines():
+        if not line:
+            continue
+        record = json.loads(line)
+        if timestamped:
+            yield parse_timestamp(record["t"]) or block_end, record["n"]
+        else:
+            # Version 1 lines carry no timestamp; use the block's upper bound
+            yield block_end, record
+
+
+def iter_manifest_notifications(
+    s3,
+    bucket: str,
+    manifest: Dict[str, Any],
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> Iterator[Tuple[Optional[datetime], Dict[str, Any]]]:
+    """
+    Yield (enqueued time, notification) from one compacted hour, limited to
+    [start, end] when given.
+
+    Only overlapping blocks are fetched, each with a single ranged GET.
+    Lines are then filtered on their own timestamp. Version 1 objects have
+    none, so every line of an overlapping block is returned for those.
+    """
+    timestamped = manifest.get("version", 1) >= 2
+    for block in manifest["blocks"]:
+        block_start = parse_timestamp(block["start"])
+        block_end = parse_timestamp(block["end"])
+        if (start and block_end and block_end < start) or (end and block_start and block_start > end):
+            continue
+        byte_range = f"bytes={block['offset']}-{block['offset'] + block['length'] - 1}"
+        data = s3.get_object(Bucket=bucket, Key=manifest["data_key"], Range=byte_range)["Body"].read()
+        for timestamp, notification in _block_notifications(data, manifest, block_end):
+            if timestamped and timestamp and ((start and timestamp < start) or (end and timestamp > end)):
+                continue
+            yield timestamp, notification
+
+
+def iter_compacted_notifications(
+    s3,
+    bucket: str,
+    start: datetime,
+    end: datetime,
+    prefix: str = COMPACT_PREFIX,
+) -> Iterator[Tuple[Optional[datetime], Dict[str, Any]]]:
+    """Yield (enqueued time, notification) for every compacted notification in [start, end]."""
+    for manifest in list_manifests(s3, bucket, start, end, prefix):
+        yield from iter_manifest_notifications(s3, bucket, manifest, start, end)
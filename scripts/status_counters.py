@@ -0,0 +1,579 @@
+"""
+Status Counters
+Materialized meeting counts maintained from the meetings table change stream
+
+Instead of scanning the whole meetings table for every status breakdown,
+a consumer of the table's stream (NEW_AND_OLD_IMAGES) keeps a small
+aggregates table current:
+
+    kind        name                      attributes
+    status      scheduled                 count
+    changeType  created                   count
+    organizer   rep@contoso.com           count
+    bounds      createdAt / updatedAt     min, max
+    record      <stream eventID>          expires_at (idempotency marker)
+    checkpoint  <shard id>                sequence (stream polling only)
+
+Each stream record contributes -1 for the counted fields of its old image
+and +1 for its new image, so a MODIFY that leaves status alone nets to zero
+and writes nothing. Records that do move a counter are applied with ADD in
+TransactWriteItems together with one conditional marker put per record, so
+a record is counted exactly once however it is redelivered: a Lambda retry
+or bisected batch, or a polling restart whose next page has different
+boundaries. Markers that already exist cancel the transaction; it is
+retried without those records. Bounds are min/max watermarks, idempotent by
+nature; they never move back on REMOVE.
+
+A breakdown is then one Query on a single partition (kind = "status"),
+independent of the meetings table size.
+
+rebuild_counters() seeds the table from a scan. It first reads the stream
+to its end, marks every record seen as applied and sets each shard's
+checkpoint there, so neither the polling consumer nor a Lambda trigger
+re-applies history the scan already includes. Writes that land while the
+scan runs may be counted twice or missed, so rebuild in a quiet window with
+the consumer stopped (for a Lambda trigger, disable its event source
+mapping and re-enable it afterwards).
+
+The same consumer runs against in-memory stand-ins for local testing:
+
+    meetings = MemoryMeetingsTable()
+    counters = MemoryCounterTable()
+    consumer = StatusCounterConsumer(counters)
+    meetings.put({"meeting_id": "m1", "created_at": "...", "status": "notification_received"})
+    for records in meetings.stream.batches(100):
+        consumer.process(records)
+    counters.breakdown("status")   # {'notification_received': 1}
+"""
+import os
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from dynamo_scan import attr
+
+# kind -> meetings table attribute
+COUNTED = {"status": "status", "changeType": "changeType", "organizer": "organizerEmail"}
+BOUND_ATTRIBUTES = ("createdAt", "updatedAt")
+NONE = "(none)"
+TRANSACT_LIMIT = 100
+MARKER_TTL_SECONDS = 2 * 24 * 3600  # longer than the 24h stream retention
+TRANSACT_RETRIES = 5
+
+Deltas = Dict[Tuple[str, str], int]
+Bounds = Dict[str, Tuple[str, str]]
+
+
+# ---- stream records -----------------------------------------------------------
+
+def image_counters(image: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """(kind, name) counters an item image belongs to."""
+    return [(kind, attr(image, attribute) or NONE) for kind, attribute in COUNTED.items()]
+
+
+def record_deltas(record: Dict[str, Any]) -> Counter:
+    """Counter deltas of one stream record (-1 per counter of the old image, +1 per counter of the new)."""
+    change = record.get("dynamodb", {})
+    old, new = change.get("OldImage"), change.get("NewImage")
+    event = record.get("eventName")
+    if (event in ("INSERT", "MODIFY") and new is None) or (event in ("MODIFY", "REMOVE") and old is None):
+        raise ValueError(f"{event} record without images; the stream must use NEW_AND_OLD_IMAGES")
+    deltas: Counter = Counter()
+    if old is not None:
+        deltas.subtract(image_counters(old))
+    if new is not None:
+        deltas.update(image_counters(new))
+    return deltas
+
+
+def record_bounds(records: List[Dict[str, Any]]) -> Bounds:
+    """createdAt/updatedAt (min, max) over the new images of records."""
+    bounds: Dict[str, List[str]] = {}
+    for record in records:
+        new = record.get("dynamodb", {}).get("NewImage")
+        if new is None:
+            continue
+        for attribute in BOUND_ATTRIBUTES:
+            value = attr(new, attribute)
+            if value:
+                lo_hi = bounds.setdefault(attribute, [value, value])
+                lo_hi[0], lo_hi[1] = min(lo_hi[0], value), max(lo_hi[1], value)
+    return {k: (v[0], v[1]) for k, v in bounds.items()}
+
+
+def stream_changes(records: List[Dict[str, Any]]) -> Tuple[List[Tuple[str, Deltas]], Bounds]:
+    """
+    Per-record counter changes, keyed by eventID, for the records that move a
+    counter (zeros dropped), and the bounds of the whole batch.
+    """
+    changes = []
+    for record in records:
+        deltas = {key: delta for key, delta in record_deltas(record).items() if delta}
+        if deltas:
+            changes.append((record["eventID"], deltas))
+    return changes, record_bounds(records)
+
+
+def batch_changes(records: List[Dict[str, Any]]) -> Tuple[Deltas, Bounds]:
+    """Net counter deltas (zeros dropped) and createdAt/updatedAt bounds for a batch of stream records."""
+    deltas: Counter = Counter()
+    for record in records:
+        deltas.update(record_deltas(record))
+    return {key: delta for key, delta in deltas.items() if delta}, record_bounds(records)
+
+
+def net_deltas(changes: List[Tuple[str, Deltas]]) -> Deltas:
+    total: Counter = Counter()
+    for _, deltas in changes:
+        total.update(deltas)
+    return {key: delta for key, delta in total.items() if delta}
+
+
+def transaction_groups(changes: List[Tuple[str, Deltas]], limit: int = TRANSACT_LIMIT) -> Iterator[List[Tuple[str, Deltas]]]:
+    """Split changes so each group's markers plus distinct counters fit one transaction."""
+    group, keys = [], set()
+    for change in changes:
+        merged = keys | change[1].keys()
+        if group and len(group) + 1 + len(merged) > limit:
+            yield group
+            group, merged = [], set(change[1])
+        group.append(change)
+        keys = merged
+    if group:
+        yield group
+
+
+def chunks(items: List[Any], size: int) -> Iterator[List[Any]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+# ---- counter tables ---------------------------------------------------------
+
+class MemoryCounterTable:
+    """In-memory stand-in for the counters table."""
+
+    def __init__(self):
+        self.counts: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.bounds: Dict[str, Dict[str, str]] = {}
+        self.markers = set()
+        self.checkpoints: Dict[str, str] = {}
+
+    def apply(self, changes: List[Tuple[str, Deltas]], bounds: Bounds) -> int:
+        applied = 0
+        for event_id, deltas in changes:
+            if event_id in self.markers:
+                continue
+            self.markers.add(event_id)
+            for key, delta in deltas.items():
+                self.counts[key] += delta
+            applied += 1
+        for attribute, (lo, hi) in bounds.items():
+            current = self.bounds.setdefault(attribute, {"min": lo, "max": hi})
+            current["min"], current["max"] = min(current["min"], lo), max(current["max"], hi)
+        return applied
+
+    def mark(self, event_ids: List[str]) -> None:
+        self.markers.update(event_ids)
+
+    def breakdown(self, kind: str) -> Dict[str, int]:
+        return {name: count for (k, name), count in sorted(self.counts.items()) if k == kind and count}
+
+    def read_bounds(self) -> Dict[str, Dict[str, str]]:
+        return {attribute: dict(values) for attribute, values in self.bounds.items()}
+
+    def replace(self, counts: Deltas, bounds: Bounds) -> None:
+        self.counts = defaultdict(int, counts)
+        self.bounds = {attribute: {"min": lo, "max": hi} for attribute, (lo, hi) in bounds.items()}
+
+    def get_checkpoint(self, shard_id: str) -> Optional[str]:
+        return self.checkpoints.get(shard_id)
+
+    def set_checkpoint(self, shard_id: str, sequence: Optional[str]) -> None:
+        if sequence is None:
+            self.checkpoints.pop(shard_id, None)
+        else:
+            self.checkpoints[shard_id] = sequence
+
+
+class DynamoCounterTable:
+    """The counters table (hash key kind, range key name) via the low-level boto3 client."""
+
+    def __init__(self, client, table: str):
+        self.client = client
+        self.table = table
+
+    def _marker(self, event_id: str, expires_at: str) -> Dict[str, Any]:
+        return {"kind": {"S": "record"}, "name": {"S": event_id}, "expires_at": {"N": expires_at}}
+
+    def _transact(self, items: List[Dict[str, Any]]) -> List[int]:
+        """Run one transaction; indexes of the items whose condition failed ([] when it committed)."""
+        from botocore.exceptions import ClientError
+
+        for attempt in range(TRANSACT_RETRIES):
+            try:
+                self.client.transact_write_items(TransactItems=items)
+                return []
+            except ClientError as e:
+                if e.response["Error"]["Code"] != "TransactionCanceledException":
+                    raise
+                reasons = [r.get("Code") for r in e.response.get("CancellationReasons", [])]
+                failed = [i for i, code in enumerate(reasons) if code == "ConditionalCheckFailed"]
+                if failed:
+                    return failed
+                if "TransactionConflict" not in reasons or attempt == TRANSACT_RETRIES - 1:
+                    raise
+                # Another shard's batch touched the same counters; back off and retry
+                time.sleep(0.05 * 2 ** attempt)
+        raise RuntimeError("transaction retries exhausted")
+
+    def apply(self, changes: List[Tuple[str, Deltas]], bounds: Bounds) -> int:
+        """Apply records not applied before; returns how many were."""
+        applied = 0
+        expires_at = str(int(time.time()) + MARKER_TTL_SECONDS)
+        for group in transaction_groups(changes):
+            while group:
+                items = [{"Put": {
+                    "TableName": self.table,
+                    "Item": self._marker(event_id, expires_at),
+                    "ConditionExpression": "attribute_not_exists(#n)",
+                    "ExpressionAttributeNames": {"#n": "name"},
+                }} for event_id, _ in group]
+                for (kind, name), delta in sorted(net_deltas(group).items()):
+                    items.append({"Update": {
+                        "TableName": self.table,
+                        "Key": {"kind": {"S": kind}, "name": {"S": name}},
+                        "UpdateExpression": "ADD #c :d",
+                        "ExpressionAttributeNames": {"#c": "count"},
+                        "ExpressionAttributeValues": {":d": {"N": str(delta)}},
+                    }})
+                failed = set(self._transact(items))
+                if not failed:
+                    applied += len(group)
+                    break
+                # Markers exist for these records: applied before, drop them and retry the rest
+                group = [change for i, change in enumerate(group) if i not in failed]
+        for attribute, (lo, hi) in bounds.items():
+            self._bound(attribute, "min", lo, ">")
+            self._bound(attribute, "max", hi, "<")
+        return applied
+
+    def mark(self, event_ids: List[str]) -> None:
+        """Record event IDs as applied without touching counters (rebuild)."""
+        expires_at = str(int(time.time()) + MARKER_TTL_SECONDS)
+        self._batch_write([{"PutRequest": {"Item": self._marker(event_id, expires_at)}} for event_id in event_ids])
+
+    def _batch_write(self, requests: List[Dict[str, Any]]) -> None:
+        for part in chunks(requests, 25):
+            request = {self.table: part}
+            while request:
+                response = self.client.batch_write_item(RequestItems=request)
+                request = response.get("UnprocessedItems") or None
+
+    def _bound(self, attribute: str, field: str, value: str, replaces_if: str) -> None:
+        """Set bounds.<attribute>.<field> to value if unset or value is beyond it."""
+        from botocore.exceptions import ClientError
+
+        try:
+            self.client.update_item(
+                TableName=self.table,
+                Key={"kind": {"S": "bounds"}, "name": {"S": attribute}},
+                UpdateExpression="SET #f = :v",
+                ConditionExpression=f"attribute_not_exists(#f) OR #f {replaces_if} :v",
+                ExpressionAttributeNames={"#f": field},
+                ExpressionAttributeValues={":v": {"S": value}},
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+
+    def _query_kind(self, kind: str) -> Iterator[Dict[str, Any]]:
+        pages = self.client.get_paginator("query").paginate(
+            TableName=self.table,
+            KeyConditionExpression="#k = :k",
+            ExpressionAttributeNames={"#k": "kind"},
+            ExpressionAttributeValues={":k": {"S": kind}},
+        )
+        for page in pages:
+            yield from page.get("Items", [])
+
+    def breakdown(self, kind: str) -> Dict[str, int]:
+        """Counts for one kind: a single-partition Query, independent of the meetings table size."""
+        counts = {}
+        for item in self._query_kind(kind):
+            count = int(attr(item, "count", "0"))
+            if count:
+                counts[attr(item, "name")] = count
+        return counts
+
+    def read_bounds(self) -> Dict[str, Dict[str, str]]:
+        return {attr(item, "name"): {field: attr(item, field) for field in ("min", "max") if field in item}
+                for item in self._query_kind("bounds")}
+
+    def replace(self, counts: Deltas, bounds: Bounds) -> None:
+        """Overwrite every counter and bound with absolute values (rebuild)."""
+        stale = [(kind, attr(item, "name")) for kind in COUNTED for item in self._query_kind(kind)]
+        requests = [{"PutRequest": {"Item": {"kind": {"S": kind}, "name": {"S": name}, "count": {"N": "0"}}}}
+                    for kind, name in stale if (kind, name) not in counts]
+        requests += [{"PutRequest": {"Item": {"kind": {"S": kind}, "name": {"S": name}, "count": {"N": str(count)}}}}
+                     for (kind, name), count in counts.items()]
+        requests += [{"PutRequest": {"Item": {"kind": {"S": "bounds"}, "name": {"S": attribute},
+                                              "min": {"S": lo}, "max": {"S": hi}}}}
+                     for attribute, (lo, hi) in bounds.items()]
+        self._batch_write(requests)
+
+    def get_checkpoint(self, shard_id: str) -> Optional[str]:
+        item = self.client.get_item(TableName=self.table,
+                                    Key={"kind": {"S": "checkpoint"}, "name": {"S": shard_id}}).get("Item")
+        return attr(item, "sequence") if item else None
+
+    def set_checkpoint(self, shard_id: str, sequence: Optional[str]) -> None:
+        key = {"kind": {"S": "checkpoint"}, "name": {"S": shard_id}}
+        if sequence is None:
+            self.client.delete_item(TableName=self.table, Key=key)
+        else:
+            self.client.put_item(TableName=self.table, Item={**key, "sequence": {"S": sequence}})
+
+
+# ---- consumer ---------------------------------------------------------------
+
+class StatusCounterConsumer:
+    """Applies batches of meetings stream records to a counter table."""
+
+    def __init__(self, counters):
+        self.counters = counters
+        self.stats = {"batches": 0, "records": 0, "counted": 0, "duplicates": 0}
+
+    def process(self, records: List[Dict[str, Any]]) -> int:
+        """Apply one batch; returns how many of its records were skipped as applied before (redelivery)."""
+        if not records:
+            return 0
+        changes, bounds = stream_changes(records)
+        # Bounds are merged either way (idempotent); only counts need the markers
+        applied = self.counters.apply(changes, bounds)
+        self.stats["batches"] += 1
+        self.stats["records"] += len(records)
+        self.stats["counted"] += applied
+        self.stats["duplicates"] += len(changes) - applied
+        return len(changes) - applied
+
+
+def recount(items) -> Tuple[Deltas, Bounds]:
+    """Absolute counters and bounds from meeting items (low-level format), e.g. for a rebuild."""
+    return batch_changes([{"eventName": "INSERT", "dynamodb": {"NewImage": item}} for item in items])
+
+
+def lambda_handler(event, context):
+    """DynamoDB Streams trigger: COUNTERS_TABLE names the counters table."""
+    import boto3
+
+    consumer = StatusCounterConsumer(DynamoCounterTable(boto3.client("dynamodb"), os.environ["COUNTERS_TABLE"]))
+    skipped = consumer.process(event.get("Records", []))
+    return {"records": len(event.get("Records", [])), "skipped": skipped}
+
+
+# ---- polling a stream (local consumer) --------------------------------------
+
+def _stream_shards(streams, stream_arn: str) -> List[Dict[str, Any]]:
+    """All shards of a stream, parents before children."""
+    shards, start = [], None
+    while True:
+        params = {"StreamArn": stream_arn}
+        if start:
+            params["ExclusiveStartShardId"] = start
+        description = streams.describe_stream(**params)["StreamDescription"]
+        shards.extend(description.get("Shards", []))
+        start = description.get("LastEvaluatedShardId")
+        if not start:
+            break
+    by_id = {shard["ShardId"]: shard for shard in shards}
+    ordered, seen = [], set()
+
+    def visit(shard):
+        if shard["ShardId"] in seen:
+            return
+        seen.add(shard["ShardId"])
+        parent = by_id.get(shard.get("ParentShardId"))
+        if parent:
+            visit(parent)
+        ordered.append(shard)
+
+    for shard in shards:
+        visit(shard)
+    return ordered
+
+
+def _read_shard(streams, stream_arn: str, shard_id: str, checkpoint: Optional[str],
+                limit: int) -> Iterator[Tuple[List[Dict[str, Any]], Optional[str]]]:
+    """(records, next iterator) pages of one shard after checkpoint, until an empty page or the shard end."""
+    params = {"StreamArn": stream_arn, "ShardId": shard_id}
+    if checkpoint:
+        params.update(ShardIteratorType="AFTER_SEQUENCE_NUMBER", SequenceNumber=checkpoint)
+    else:
+        params["ShardIteratorType"] = "TRIM_HORIZON"
+    iterator = streams.get_shard_iterator(**params)["ShardIterator"]
+    while iterator:
+        response = streams.get_records(ShardIterator=iterator, Limit=limit)
+        records = response.get("Records", [])
+        iterator = response.get("NextShardIterator")
+        yield records, iterator
+        if not records:
+            break  # open shard with nothing new
+
+
+def rebuild_counters(counters, streams, stream_arn: str, scan, limit: int = 1000) -> Dict[str, int]:
+    """
+    Replace the counters with a recount of scan() (meeting items, low-level format).
+
+    Before scanning, reads every shard to its current end, marks the records
+    that move a counter as applied and moves each shard checkpoint there, so
+    consumers resume after the history the scan already reflects.
+    """
+    positions: Dict[str, Optional[str]] = {}
+    marked = 0
+    for shard in _stream_shards(streams, stream_arn):
+        shard_id = shard["ShardId"]
+        positions[shard_id] = None
+        for records, _ in _read_shard(streams, stream_arn, shard_id, None, limit):
+            if records:
+                changes, _ = stream_changes(records)
+                counters.mark([event_id for event_id, _ in changes])
+                marked += len(changes)
+                positions[shard_id] = records[-1]["dynamodb"]["SequenceNumber"]
+    counts, bounds = recount(scan())
+    counters.replace(counts, bounds)
+    for shard_id, sequence in positions.items():
+        counters.set_checkpoint(shard_id, sequence)
+    return {"shards": len(positions), "marked": marked, "counters": len(counts)}
+
+
+def consume_stream(streams, stream_arn: str, consumer: StatusCounterConsumer, limit: int = 1000,
+                   follow: bool = False, poll_seconds: float = 1.0) -> Dict[str, int]:
+    """
+    Read a DynamoDB stream shard by shard from each shard's checkpoint,
+    applying every GetRecords page as one batch and checkpointing after it.
+    Stops when every shard is caught up unless follow is set.
+    """
+    counters = consumer.counters
+    finished = set()
+    while True:
+        caught_up = True
+        for shard in _stream_shards(streams, stream_arn):
+            shard_id = shard["ShardId"]
+            if shard_id in finished:
+                continue
+            iterator = None
+            for records, iterator in _read_shard(streams, stream_arn, shard_id,
+                                                 counters.get_checkpoint(shard_id), limit):
+                if records:
+                    # A crash before the checkpoint re-reads these; their markers make that a no-op
+                    consumer.process(records)
+                    counters.set_checkpoint(shard_id, records[-1]["dynamodb"]["SequenceNumber"])
+                    caught_up = False
+            if iterator is None:
+                finished.add(shard_id)  # closed shard fully read
+        if caught_up and not follow:
+            return consumer.stats
+        if caught_up:
+            time.sleep(poll_seconds)
+
+
+# ---- in-memory stand-ins ----------------------------------------------------
+
+def to_attribute(value: Any) -> Dict[str, Any]:
+    """Python value -> low-level DynamoDB attribute value (enough for meeting items)."""
+    if value is None:
+        return {"NULL": True}
+    if isinstance(value, bool):
+        return {"BOOL": value}
+    if isinstance(value, (int, float)):
+        return {"N": str(value)}
+    if isinstance(value, dict):
+        return {"M": {k: to_attribute(v) for k, v in value.items()}}
+    if isinstance(value, (list, tuple)):
+        return {"L": [to_attribute(v) for v in value]}
+    return {"S": str(value)}
+
+
+class MemoryStream:
+    """
+    Streams-shaped change feed: records with eventID, eventName and
+    NEW_AND_OLD_IMAGES. Also answers the dynamodbstreams calls consume_stream
+    and rebuild_counters make, as a single open shard.
+    """
+
+    SHARD_ID = "shardId-00000000000000000000-memory"
+
+    def __init__(self):
+        self.records: List[Dict[str, Any]] = []
+        self.position = 0
+        self._sequence = 0
+
+    def append(self, event: str, keys: Dict[str, Any], old: Optional[Dict[str, Any]],
+               new: Optional[Dict[str, Any]]) -> None:
+        self._sequence += 1
+        change = {"Keys": keys, "SequenceNumber": f"{self._sequence:021d}", "StreamViewType": "NEW_AND_OLD_IMAGES",
+                  "ApproximateCreationDateTime": time.time()}
+        if old is not None:
+            change["OldImage"] = old
+        if new is not None:
+            change["NewImage"] = new
+        self.records.append({"eventID": f"ev-{self._sequence}", "eventName": event,
+                             "eventSource": "aws:dynamodb", "dynamodb": change})
+
+    def batches(self, size: int = 100) -> Iterator[List[Dict[str, Any]]]:
+        """Unread records in batches, like successive Lambda invocations."""
+        while self.position < len(self.records):
+            batch = self.records[self.position:self.position + size]
+            self.position += len(batch)
+            yield batch
+
+    def describe_stream(self, StreamArn: str, **_) -> Dict[str, Any]:
+        return {"StreamDescription": {"StreamArn": StreamArn, "Shards": [{
+            "ShardId": self.SHARD_ID, "SequenceNumberRange": {"StartingSequenceNumber": f"{1:021d}"}}]}}
+
+    def get_shard_iterator(self, StreamArn: str, ShardId: str, ShardIteratorType: str,
+                           SequenceNumber: Optional[str] = None) -> Dict[str, str]:
+        # Sequence numbers are 1-based record positions, so AFTER n starts at index n
+        start = {"TRIM_HORIZON": 0, "LATEST": len(self.records)}.get(ShardIteratorType)
+        if start is None:
+            start = int(SequenceNumber) - (ShardIteratorType == "AT_SEQUENCE_NUMBER")
+        return {"ShardIterator": str(start)}
+
+    def get_records(self, ShardIterator: str, Limit: int = 1000) -> Dict[str, Any]:
+        start = int(ShardIterator)
+        records = self.records[start:start + Limit]
+        return {"Records": records, "NextShardIterator": str(start + len(records))}
+
+
+class MemoryMeetingsTable:
+    """Stand-in meetings table (meeting_id + created_at keys) that writes to a MemoryStream."""
+
+    def __init__(self, stream: Optional[MemoryStream] = None):
+        self.items: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.stream = stream or MemoryStream()
+
+    def put(self, item: Dict[str, Any]) -> None:
+        key = (item["meeting_id"], item["created_at"])
+        old = self.items.get(key)
+        new = {k: to_attribute(v) for k, v in item.items()}
+        self.items[key] = new
+        keys = {"meeting_id": {"S": key[0]}, "created_at": {"S": key[1]}}
+        self.stream.append("MODIFY" if old is not None else "INSERT", keys, old, new)
+
+    def update(self, meeting_id: str, created_at: str, **changes) -> None:
+        old = self.items[(meeting_id, created_at)]
+        item = {k: v for k, v in old.items()}
+        item.update({k: to_attribute(v) for k, v in changes.items()})
+        self.items[(meeting_id, created_at)] = item
+        keys = {"meeting_id": {"S": meeting_id}, "created_at": {"S": created_at}}
+        self.stream.append("MODIFY", keys, old, item)
+
+    def delete(self, meeting_id: str, created_at: str) -> None:
+        old = self.items.pop((meeting_id, created_at), None)
+        if old is not None:
+            keys = {"meeting_id": {"S": meeting_id}, "created_at": {"S": created_at}}
+            self.stream.append("REMOVE", keys, old, None)
+
+    def scan(self) -> Iterator[Dict[str, Any]]:
+        return iter(list(self.items.values()))
@@ -1,112 +1,110 @@
 """
 DynamoDB Pipeline Verification Script
 Verifies that the EventHub → Lambda → DynamoDB pipeline processed all mutations
+
+The meetings table is read once with a parallel segmented scan (dynamo_scan),
+following every page, and all DynamoDB checks are computed from that single
+pass: count, status/organizer/changeType breakdowns and createdAt span.
+
+Usage:
+    python scripts/verify-dynamo-pipeline.py
+    python scripts/verify-dynamo-pipeline.py --segments 16
 """
+import argparse
 import sys
 import os
-import json
 import subprocess
+import time
 from datetime import datetime, timezone
 from collections import defaultdict
 
+import boto3
+from botocore.exceptions import BotoCoreError, ClientError
+
+from dynamo_scan import DEFAULT_SEGMENTS, attr, parallel_scan
+
 
 DYNAMODB_TABLE = "tmf-meetings-8akfpg"
 S3_BUCKET = "tmf-webhooks-eus-dev"
 S3_PREFIX = "eventhub/"
 LAMBDA_LOG_GROUP = "/aws/lambda/tmf-eventhub-processor-dev"
 
+# Merged projection for every DynamoDB check
+SCAN_ATTRIBUTES = ["status", "organizerEmail", "changeType", "createdAt", "updatedAt"]
+
 REPS = [
     "trustingboar@ibuyspy.net",
     "boldoriole@ibuyspy.net"
 ]
 
 
-def run_aws_command(cmd):
-    """Run AWS CLI command and return parsed JSON output"""
+def scan_meetings(table, segments):
+    """
+    One parallel pass over the whole meetings table, computing every
+    aggregate the checks below report
+    """
+    print(f"Scanning {table} ({segments} parallel segments)...\n")
+
+    client = boto3.client("dynamodb")
+    agg = {
+        "count": 0,
+        "status": defaultdict(int),
+        "organizer": defaultdict(int),
+        "changeType": defaultdict(int),
+        "created_first": None,
+        "created_last": None,
+        "updated_last": None,
+    }
+    stats = {}
+    started = time.perf_counter()
+
     try:
-        result = subprocess.run(
-            cmd,
-            shell=True,
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
-        
-        if result.returncode == 0:
-            if result.stdout.strip():
-                return json.loads(result.stdout)
-            return {}
-        else:
-            print(f"❌ AWS command failed: {result.stderr}")
-            return None
-    except subprocess.TimeoutExpired:
-        print(f"❌ AWS command timed out")
-        return None
-    except json.JSONDecodeError as e:
-        print(f"❌ Failed to parse JSON: {e}")
-        print(f"   Output: {result.stdout[:200]}")
-        return None
-    except Exception as e:
-        print(f"❌ Exception: {str(e)}")
+        for item in parallel_scan(client, table, segments=segments, projection=SCAN_ATTRIBUTES, stats=stats):
+            agg["count"] += 1
+            agg["status"][attr(item, "status", "unknown")] += 1
+            agg["organizer"][attr(item, "organizerEmail") or "unknown"] += 1
+            agg["changeType"][attr(item, "changeType", "none")] += 1
+
+            created = attr(item, "createdAt")
+            if created:
+                if agg["created_first"] is None or created < agg["created_first"]:
+                    agg["created_first"] = created
+                if agg["created_last"] is None or created > agg["created_last"]:
+                    agg["created_last"] = created
+            updated = attr(item, "updatedAt")
+            if updated and (agg["updated_last"] is None or updated > agg["updated_last"]):
+                agg["updated_last"] = updated
+    except (BotoCoreError, ClientError) as e:
+        print(f"❌ DynamoDB scan failed: {e}")
         return None
 
+    elapsed = time.perf_counter() - started
+    rate = agg["count"] / elapsed if elapsed else 0
+    print(f"✅ Scanned {stats['scanned']} items in {stats['pages']} pages, {elapsed:.2f}s ({rate:,.0f} items/s)")
+    return agg
+
 
-def check_dynamo_count():
+def check_dynamo_count(agg):
     """Check total meeting count in DynamoDB"""
-    print("Check 1: Counting meetings in DynamoDB...\n")
-    
-    cmd = f"aws dynamodb scan --table-name {DYNAMODB_TABLE} --select COUNT"
-    result = run_aws_command(cmd)
-    
-    if result is not None:
-        count = result.get('Count', 0)
-        print(f"✅ DynamoDB total meetings: {count}")
-        return count
-    else:
-        print(f"❌ Failed to count DynamoDB meetings")
-        return 0
+    print("\nCheck 1: Counting meetings in DynamoDB...\n")
+    print(f"✅ DynamoDB total meetings: {agg['count']}")
+    return agg["count"]
 
 
-def check_dynamo_status_breakdown():
+def check_dynamo_status_breakdown(agg):
     """Check meeting status breakdown"""
     print("\nCheck 2: Meeting status breakdown...\n")
-    
-    # Scan all meetings and aggregate status locally
-    # (DynamoDB doesn't support aggregation in scan, so we pull and count)
-    
-    cmd = f'aws dynamodb scan --table-name {DYNAMODB_TABLE} --projection-expression "meetingStatus,organizerEmail"'
-    result = run_aws_command(cmd)
-    
-    if result is None:
-        print("❌ Failed to scan DynamoDB for status breakdown")
-        return None, None
-    
-    items = result.get('Items', [])
-    
-    # Parse DynamoDB JSON format
-    status_counts = defaultdict(int)
-    organizer_counts = defaultdict(int)
-    
-    for item in items:
-        # DynamoDB returns items as {'S': 'value'} format
-        status_raw = item.get('meetingStatus', {})
-        status = status_raw.get('S', 'unknown') if isinstance(status_raw, dict) else 'unknown'
-        status_counts[status] += 1
-        
-        organizer_raw = item.get('organizerEmail', {})
-        organizer = organizer_raw.get('S', 'unknown') if isinstance(organizer_raw, dict) else 'unknown'
-        organizer_counts[organizer] += 1
-    
+
     print("Status breakdown:")
-    for status, count in sorted(status_counts.items()):
+    for status, count in sorted(agg["status"].items()):
         print(f"  {status:15s}: {count}")
-    
+
     print("\nOrganizer breakdown:")
-    for organizer, count in sorted(organizer_counts.items()):
+    for organizer, count in sorted(agg["organizer"].items()):
         org_name = organizer.split('@')[0] if '@' in organizer else organizer
         print(f"  {org_name:20s}: {count}")
-    
-    return status_counts, organizer_counts
+
+    return agg["status"], agg["organizer"]
 
 
 def check_s3_archived_events():
@@ -153,91 +151,44 @@ def check_s3_archived_events():
         return 0, None, None
 
 
-def check_dynamo_timing():
+def check_dynamo_timing(agg):
     """Check DynamoDB record timestamps for pipeline timing"""
     print("\nCheck 4: Pipeline timing analysis...\n")
-    
-    # Scan DynamoDB for createdAt and updatedAt timestamps
-    cmd = f'aws dynamodb scan --table-name {DYNAMODB_TABLE} --projection-expression "createdAt,updatedAt"'
-    result = run_aws_command(cmd)
-    
-    if result is None:
-        print("❌ Failed to scan DynamoDB for timing")
-        return
-    
-    items = result.get('Items', [])
-    
-    created_times = []
-    updated_times = []
-    
-    for item in items:
-        created_raw = item.get('createdAt', {})
-        created = created_raw.get('S', None) if isinstance(created_raw, dict) else None
-        if created:
-            created_times.append(created)
-        
-        updated_raw = item.get('updatedAt', {})
-        updated = updated_raw.get('S', None) if isinstance(updated_raw, dict) else None
-        if updated:
-            updated_times.append(updated)
-    
-    if created_times:
-        created_times.sort()
-        first_created = created_times[0]
-        last_created = created_times[-1]
-        
-        print(f"DynamoDB timestamps:")
-        print(f"  First createdAt: {first_created}")
-        print(f"  Last createdAt:  {last_created}")
-        
-        # Calculate time span
-        try:
-            first_dt = datetime.fromisoformat(first_created.replace('Z', '+00:00'))
-            last_dt = datetime.fromisoformat(last_created.replace('Z', '+00:00'))
-            span = last_dt - first_dt
-            span_minutes = int(span.total_seconds() // 60)
-            span_seconds = int(span.total_seconds() % 60)
-            print(f"  Time span:       {span_minutes}m {span_seconds}s")
-        except Exception as e:
-            print(f"  (Could not parse time span: {e})")
-    else:
+
+    first_created = agg["created_first"]
+    last_created = agg["created_last"]
+    if not first_created:
         print("❌ No createdAt timestamps found")
+        return
 
+    print(f"DynamoDB timestamps:")
+    print(f"  First createdAt: {first_created}")
+    print(f"  Last createdAt:  {last_created}")
+    if agg["updated_last"]:
+        print(f"  Last updatedAt:  {agg['updated_last']}")
 
-def check_changeType_tracking():
+    # Calculate time span
+    try:
+        first_dt = datetime.fromisoformat(first_created.replace('Z', '+00:00'))
+        last_dt = datetime.fromisoformat(last_created.replace('Z', '+00:00'))
+        span = last_dt - first_dt
+        span_minutes = int(span.total_seconds() // 60)
+        span_seconds = int(span.total_seconds() % 60)
+        print(f"  Time span:       {span_minutes}m {span_seconds}s")
+    except Exception as e:
+        print(f"  (Could not parse time span: {e})")
+
+
+def check_changeType_tracking(agg):
     """Check if changeType field is tracked in DynamoDB"""
     print("\nCheck 5: changeType tracking...\n")
-    
-    # Scan for changeType field
-    cmd = f'aws dynamodb scan --table-name {DYNAMODB_TABLE} --projection-expression "changeType" --limit 10'
-    result = run_aws_command(cmd)
-    
-    if result is None:
-        print("❌ Failed to check changeType tracking")
-        return
-    
-    items = result.get('Items', [])
-    
-    # Check if any items have changeType
-    has_changetype = any('changeType' in item for item in items)
-    
-    if has_changetype:
+
+    changetype_counts = agg["changeType"]
+    if any(ct != 'none' for ct in changetype_counts):
         print("✅ changeType field is present in DynamoDB records")
-        
-        # Count by changeType (full scan)
-        cmd_full = f'aws dynamodb scan --table-name {DYNAMODB_TABLE} --projection-expression "changeType"'
-        result_full = run_aws_command(cmd_full)
-        
-        if result_full:
-            changetype_counts = defaultdict(int)
-            for item in result_full.get('Items', []):
-                ct_raw = item.get('changeType', {})
-                ct = ct_raw.get('S', 'none') if isinstance(ct_raw, dict) else 'none'
-                changetype_counts[ct] += 1
-            
-            print("\nchangeType breakdown:")
-            for ct, count in sorted(changetype_counts.items()):
-                print(f"  {ct:15s}: {count}")
+        print("\nchangeType breakdown:")
+        for ct, count in sorted(changetype_counts.items()):
+            print(f"  {ct:15s}: {count}")
     else:
         print("⚠️  changeType field not found in DynamoDB records")
         print("   (McManus may not have added this field yet)")
@@ -282,25 +233,43 @@ def print_final_report(dynamo_count, s3_count, s3_first, s3_last, status_counts,
 
 def main():
     """Execute DynamoDB pipeline verification"""
+    parser = argparse.ArgumentParser(
+        description='Verify the EventHub → Lambda → DynamoDB pipeline',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python verify-dynamo-pipeline.py
+  python verify-dynamo-pipeline.py --segments 16 --table tmf-meetings-8akfpg
+        """
+    )
+    parser.add_argument('--table', default=DYNAMODB_TABLE, help=f'Meetings table (default: {DYNAMODB_TABLE})')
+    parser.add_argument('--segments', type=int, default=DEFAULT_SEGMENTS,
+                        help=f'Parallel scan segments (default: {DEFAULT_SEGMENTS}; 1 = sequential scan)')
+    args = parser.parse_args()
+
     print("=" * 70)
     print("DYNAMODB PIPELINE VERIFICATION")
     print("=" * 70)
     print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print()
-    
+
+    agg = scan_meetings(args.table, max(1, args.segments))
+    if agg is None:
+        return 1
+
     # Run checks
-    dynamo_count = check_dynamo_count()
-    status_counts, organizer_counts = check_dynamo_status_breakdown()
+    dynamo_count = check_dynamo_count(agg)
+    status_counts, organizer_counts = check_dynamo_status_breakdown(agg)
     s3_count, s3_first, s3_last = check_s3_archived_events()
-    check_dynamo_timing()
-    check_changeType_tracking()
-    
+    check_dynamo_timing(agg)
+    check_changeType_tracking(agg)
+
     # Final report
     print_final_report(
         dynamo_count, s3_count, s3_first, s3_last,
         status_counts, organizer_counts
     )
-    
+
     return 0
 
 
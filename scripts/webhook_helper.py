@@ -0,0 +1,92 @@
+"""
+Webhook Replay Helper
+Shared logic for scripts that re-send Graph notifications to the admin app
+
+Resolves the admin app webhook URL and auth secret from the EventHub
+Lambda's configuration and POSTs notifications the same way the Lambda does.
+"""
+import json
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+LAMBDA_FUNCTION = "tmf-eventhub-processor-dev"
+
+
+def run_aws(args: List[str], check: bool = True) -> Dict[str, Any]:
+    """Run AWS CLI command and return parsed JSON output."""
+    result = subprocess.run(
+        ["aws"] + args,
+        capture_output=True,
+        text=True,
+        check=check
+    )
+    if result.returncode != 0:
+        print(f"AWS CLI error: {result.stderr}", file=sys.stderr)
+        if check:
+            sys.exit(1)
+        return {}
+    return json.loads(result.stdout) if result.stdout else {}
+
+
+def get_lambda_env(function_name: str = LAMBDA_FUNCTION) -> tuple[str, str]:
+    """Fetch ADMIN_APP_WEBHOOK_URL and WEBHOOK_AUTH_SECRET from Lambda config."""
+    print("Fetching Lambda configuration...")
+    config = run_aws([
+        "lambda", "get-function-configuration",
+        "--function-name", function_name
+    ])
+    env_vars = config.get("Environment", {}).get("Variables", {})
+    webhook_url = env_vars.get("ADMIN_APP_WEBHOOK_URL", "")
+    auth_secret = env_vars.get("WEBHOOK_AUTH_SECRET", "")
+    
+    if not webhook_url:
+        print("ERROR: ADMIN_APP_WEBHOOK_URL not set in Lambda config", file=sys.stderr)
+        sys.exit(1)
+    if not auth_secret:
+        print("ERROR: WEBHOOK_AUTH_SECRET not set in Lambda config", file=sys.stderr)
+        sys.exit(1)
+    
+    # Ensure webhook URL points to the graph webhook endpoint
+    if not webhook_url.endswith("/api/webhooks/graph"):
+        if webhook_url.endswith("/"):
+            webhook_url = webhook_url + "api/webhooks/graph"
+        else:
+            webhook_url = webhook_url + "/api/webhooks/graph"
+    
+    print(f"Admin app webhook: {webhook_url}")
+    print(f"Auth secret: {auth_secret[:8]}... (first 8 chars)")
+    return webhook_url, auth_secret
+
+
+def post_webhook(url: str, auth_secret: str, notification: Dict[str, Any]) -> bool:
+    """POST notification to admin app webhook. Returns True on success."""
+    import urllib.request
+    import ssl
+    
+    # Prepare request
+    payload = {"value": [notification]}
+    body = json.dumps(payload).encode("utf-8")
+    
+    headers = {
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {auth_secret}"
+    }
+    
+    request = urllib.request.Request(url, data=body, headers=headers)
+    
+    # Disable SSL verification for self-signed certs
+    ctx = ssl.create_default_context()
+    ctx.check_hostname = False
+    ctx.verify_mode = ssl.CERT_NONE
+    
+    try:
+        with urllib.request.urlopen(request, context=ctx, timeout=10) as response:
+            if response.status == 200:
+                return True
+            else:
+                print(f"Webhook returned {response.status}", file=sys.stderr)
+                return False
+    except Exception as e:
+        print(f"Webhook request failed: {e}", file=sys.stderr)
+        return False